@@ -3,11 +3,10 @@ API Dependencies for Neural Watch
 Phase 1: Data Ingestion & Quality Setup
 Shared dependencies for API routes
 """
-from typing import Generator
+from fastapi import Request
+from typing import Dict
 from pathlib import Path
-import sys
 
-sys.path.append(str(Path(__file__).resolve().parent.parent.parent.parent))
 from backend.app.utils.file_handler import FileHandler
 from backend.app.utils.versioning import VersioningManager
 from backend.app.utils.logger import NeuralWatchLogger
@@ -17,37 +16,41 @@ logger = NeuralWatchLogger.get_logger("api")
 
 
 # Dependency: FileHandler
-def get_file_handler() -> Generator[FileHandler, None, None]:
+async def get_file_handler(request: Request) -> FileHandler:
     """
-    Dependency to get FileHandler instance
+    Dependency to get the shared FileHandler instance
     
-    Yields:
-        FileHandler instance
+    Returns:
+        FileHandler instance created at application startup
     """
-    file_handler = FileHandler()
-    try:
-        yield file_handler
-    finally:
-        pass  # Cleanup if needed
+    return request.app.state.file_handler
 
 
 # Dependency: VersioningManager
-def get_versioning_manager() -> Generator[VersioningManager, None, None]:
+async def get_versioning_manager(request: Request) -> VersioningManager:
+    """
+    Dependency to get the shared VersioningManager instance
+    
+    Returns:
+        VersioningManager instance created at application startup
     """
-    Dependency to get VersioningManager instance
+    return request.app.state.versioning_manager
+
+
+# Dependency: Uploaded file index
+async def get_file_index(request: Request) -> Dict[str, Path]:
+    """
+    Dependency to get the in-memory index of uploaded files
     
-    Yields:
-        VersioningManager instance
+    Returns:
+        Dictionary mapping file_id to file path, kept in sync by the
+        upload and delete routes
     """
-    versioning_manager = VersioningManager()
-    try:
-        yield versioning_manager
-    finally:
-        pass  # Cleanup if needed
+    return request.app.state.file_index
 
 
 # Dependency: Logger
-def get_logger():
+async def get_logger():
     """
     Dependency to get logger instance
     
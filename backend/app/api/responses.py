@@ -0,0 +1,53 @@
+"""
+API Response Classes for Neural Watch
+Phase 2: Data Quality Checks
+Custom response classes shared by API routes
+"""
+import sys
+from datetime import date, timedelta
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _json_default(obj: Any) -> Any:
+    """
+    Serialize values orjson does not handle natively (pandas scalars)
+    
+    Args:
+        obj: Value orjson could not serialize
+        
+    Returns:
+        JSON-serializable replacement (ISO string, or None for missing values)
+    """
+    # Any pandas scalar reaching this means pandas is already loaded; looking it
+    # up here keeps this module (imported by every route) from importing it
+    pd = sys.modules.get("pandas")
+    
+    # NaT is checked first: it is a datetime subclass whose isoformat() is "NaT"
+    if pd is not None and (obj is pd.NaT or obj is pd.NA):
+        return None
+    if isinstance(obj, (date, timedelta)):
+        # pd.Timestamp / pd.Timedelta (subclasses orjson does not accept)
+        return obj.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson (handles NumPy scalars natively)"""
+    
+    def render(self, content: Any) -> bytes:
+        """
+        Serialize response content to JSON bytes
+        
+        Args:
+            content: Response payload
+            
+        Returns:
+            JSON-encoded bytes
+        """
+        return orjson.dumps(
+            content, default=_json_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
@@ -2,17 +2,17 @@
 Data Upload API Routes for Neural Watch
 Phase 1: Data Ingestion & Quality Setup
 """
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form, BackgroundTasks, Query
 from typing import Optional, Dict, List
 from pathlib import Path
-import shutil
+import os
 import time
 from datetime import datetime
 
-import sys
-sys.path.append(str(Path(__file__).resolve().parent.parent.parent.parent.parent))
-from backend.app.api.dependencies import get_file_handler, get_versioning_manager, get_logger
+from backend.app.api.dependencies import (
+    get_file_handler, get_versioning_manager, get_file_index, get_logger
+)
+from backend.app.api.responses import ORJSONResponse
 from backend.app.utils.file_handler import FileHandler
 from backend.app.utils.versioning import VersioningManager
 from backend.app.utils.logger import log_upload, log_api_request
@@ -20,14 +20,19 @@ from config.settings import DATA_RAW_PATH
 
 router = APIRouter(prefix="/api/v1", tags=["data_upload"])
 
+# Upper bound on rows returned by /get_rows in one request
+MAX_ROWS_PER_REQUEST = 1000
+
 
 @router.post("/upload_data")
 async def upload_data(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     is_baseline: Optional[bool] = Form(False),
     description: Optional[str] = Form(None),
     file_handler: FileHandler = Depends(get_file_handler),
-    versioning_manager: VersioningManager = Depends(get_versioning_manager)
+    versioning_manager: VersioningManager = Depends(get_versioning_manager),
+    file_index: Dict[str, Path] = Depends(get_file_index)
 ):
     """
     Upload a dataset file (CSV/JSON/Parquet)
@@ -49,38 +54,37 @@ async def upload_data(
             log_upload(file.filename, "rejected", {"reason": format_message})
             raise HTTPException(status_code=400, detail=format_message)
         
-        # Step 2: Save uploaded file temporarily
+        # Step 2: Save uploaded file temporarily, hashing it in the same pass
         temp_path = DATA_RAW_PATH / f"temp_{file.filename}"
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        file_hash = await file_handler.save_upload(file, temp_path)
         
         # Step 3: Validate file size
         is_valid_size, size_message = file_handler.validate_file_size(temp_path)
         if not is_valid_size:
-            temp_path.unlink()  # Delete temp file
+            background_tasks.add_task(temp_path.unlink, missing_ok=True)
             log_upload(file.filename, "rejected", {"reason": size_message})
             raise HTTPException(status_code=400, detail=size_message)
         
-        # Step 4: Read file into DataFrame
-        df, read_error = file_handler.read_file(temp_path)
-        if df is None:
-            temp_path.unlink()
-            log_upload(file.filename, "failed", {"reason": read_error})
-            raise HTTPException(status_code=400, detail=f"Error reading file: {read_error}")
-        
-        # Step 5: Check for duplicate files
-        file_hash = file_handler.compute_file_hash(temp_path)
-        is_duplicate, existing_file = file_handler.check_duplicate_file(file_hash)
+        # Step 4: Check for duplicate files (before parsing, so duplicates skip the read)
+        is_duplicate, existing_file = file_handler.check_duplicate_file(
+            file_hash, temp_path.stat().st_size, source_path=temp_path
+        )
         
         # Exclude the temp file itself from duplicate check
         if is_duplicate and existing_file != str(temp_path):
-            temp_path.unlink()
+            background_tasks.add_task(temp_path.unlink, missing_ok=True)
             log_upload(file.filename, "rejected", {"reason": "duplicate", "existing": existing_file})
             raise HTTPException(
                 status_code=409, 
                 detail=f"Duplicate file detected. Existing file: {existing_file}"
             )
         
+        # Step 5: Read file into DataFrame
+        df, read_error = file_handler.read_file(temp_path)
+        if df is None:
+            background_tasks.add_task(temp_path.unlink, missing_ok=True)
+            log_upload(file.filename, "failed", {"reason": read_error})
+            raise HTTPException(status_code=400, detail=f"Error reading file: {read_error}")
         
         # Step 6: Validate DataFrame against baseline (if exists)
         latest_baseline = versioning_manager.get_latest_baseline()
@@ -92,38 +96,40 @@ async def upload_data(
             expected_dtypes = baseline_metadata.get('dtypes')
             
             is_valid, validation_message, validation_report = file_handler.validate_dataframe(
-                df, file.filename, expected_columns, expected_dtypes
+                df, file.filename, expected_columns, expected_dtypes, file_path=temp_path
             )
             
             if not is_valid:
-                temp_path.unlink()
+                background_tasks.add_task(temp_path.unlink, missing_ok=True)
                 log_upload(file.filename, "rejected", {"reason": validation_message})
                 raise HTTPException(status_code=400, detail=f"Validation failed: {validation_message}")
         else:
             # Basic validation without baseline
             is_valid, validation_message, validation_report = file_handler.validate_dataframe(
-                df, file.filename
+                df, file.filename, file_path=temp_path
             )
             if not is_valid:
-                temp_path.unlink()
+                background_tasks.add_task(temp_path.unlink, missing_ok=True)
                 log_upload(file.filename, "rejected", {"reason": validation_message})
                 raise HTTPException(status_code=400, detail=f"Validation failed: {validation_message}")
         
         # Step 7: Compute metadata
-        metadata = file_handler.compute_metadata(df, file.filename, temp_path)
+        metadata = file_handler.compute_metadata(df, file.filename, temp_path, file_hash)
         metadata['description'] = description
         metadata['is_baseline'] = is_baseline
         
-        # Step 8: Save file to raw directory
-        success, save_message, saved_path = file_handler.save_file(
-            df, DATA_RAW_PATH, file.filename
+        # Step 8: Move the uploaded file into the raw directory (no re-serialisation)
+        success, save_message, saved_path = file_handler.store_file(
+            temp_path, DATA_RAW_PATH, file.filename, file_hash
         )
         
         if not success:
-            temp_path.unlink()
+            background_tasks.add_task(temp_path.unlink, missing_ok=True)
             log_upload(file.filename, "failed", {"reason": save_message})
             raise HTTPException(status_code=500, detail=f"Error saving file: {save_message}")
         
+        file_index[saved_path.stem] = saved_path
+        
         # Step 9: Create baseline if requested or if no baseline exists
         baseline_info = None
         if is_baseline or latest_baseline is None:
@@ -136,18 +142,21 @@ async def upload_data(
             else:
                 metadata['baseline_version'] = baseline_info['version_id']
         
-        # Step 10: Compare with baseline
+        # Step 10: Persist metadata so /get_file_metadata can skip re-reading the file
+        file_handler.save_metadata(saved_path, metadata)
+        
+        # Step 11: Compare with baseline
         comparison = None
         if latest_baseline and not is_baseline:
             comparison = versioning_manager.compare_with_baseline(
                 metadata, latest_baseline['version_id']
             )
         
-        # Step 11: Clean up temp file
+        # Step 12: Clean up temp file
         if temp_path.exists():
             temp_path.unlink()
         
-        # Step 12: Prepare response
+        # Step 13: Prepare response
         response_time = time.time() - start_time
         
         response_data = {
@@ -179,17 +188,21 @@ async def upload_data(
         
         log_api_request("/upload_data", "POST", 200, response_time)
         
-        return JSONResponse(content=response_data, status_code=200)
+        return ORJSONResponse(content=response_data, status_code=200)
         
-    except HTTPException:
-        raise
+    except HTTPException as e:
+        # Return rather than re-raise: raised exceptions drop the scheduled temp-file cleanup
+        return ORJSONResponse(
+            content={"detail": e.detail}, status_code=e.status_code, background=background_tasks
+        )
     except Exception as e:
         # Clean up on unexpected error
-        if temp_path.exists():
-            temp_path.unlink()
+        background_tasks.add_task(temp_path.unlink, missing_ok=True)
         
         log_upload(file.filename, "error", {"exception": str(e)})
-        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+        return ORJSONResponse(
+            content={"detail": f"Unexpected error: {str(e)}"}, status_code=500, background=background_tasks
+        )
 
 
 @router.get("/list_uploads")
@@ -207,22 +220,23 @@ async def list_uploads(
     try:
         uploaded_files = []
         
-        # Scan raw data directory
-        for file_path in DATA_RAW_PATH.glob('*'):
-            if file_path.is_file() and not file_path.name.startswith('temp_'):
-                try:
-                    # Read basic metadata
-                    file_stat = file_path.stat()
-                    
-                    uploaded_files.append({
-                        "file_id": file_path.stem,
-                        "filename": file_path.name,
-                        "file_size_mb": round(file_stat.st_size / (1024 * 1024), 2),
-                        "upload_timestamp": datetime.fromtimestamp(file_stat.st_mtime).isoformat(),
-                        "file_path": str(file_path)
-                    })
-                except Exception as e:
-                    continue
+        # Scan raw data directory (DirEntry reuses the stat data from the directory read)
+        with os.scandir(DATA_RAW_PATH) as entries:
+            for entry in entries:
+                if entry.is_file() and not entry.name.startswith('temp_'):
+                    try:
+                        # Read basic metadata
+                        file_stat = entry.stat()
+                        
+                        uploaded_files.append({
+                            "file_id": os.path.splitext(entry.name)[0],
+                            "filename": entry.name,
+                            "file_size_mb": round(file_stat.st_size / (1024 * 1024), 2),
+                            "upload_timestamp": datetime.fromtimestamp(file_stat.st_mtime).isoformat(),
+                            "file_path": entry.path
+                        })
+                    except Exception as e:
+                        continue
         
         # Sort by upload timestamp (newest first)
         uploaded_files.sort(key=lambda x: x['upload_timestamp'], reverse=True)
@@ -230,7 +244,7 @@ async def list_uploads(
         response_time = time.time() - start_time
         log_api_request("/list_uploads", "GET", 200, response_time)
         
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "status": "success",
             "count": len(uploaded_files),
             "files": uploaded_files
@@ -243,7 +257,8 @@ async def list_uploads(
 @router.get("/get_file_metadata/{file_id}")
 async def get_file_metadata(
     file_id: str,
-    file_handler: FileHandler = Depends(get_file_handler)
+    file_handler: FileHandler = Depends(get_file_handler),
+    file_index: Dict[str, Path] = Depends(get_file_index)
 ):
     """
     Get detailed metadata for a specific uploaded file
@@ -258,26 +273,26 @@ async def get_file_metadata(
     
     try:
         # Find file by ID
-        file_path = None
-        for f in DATA_RAW_PATH.glob(f"{file_id}*"):
-            if f.is_file():
-                file_path = f
-                break
+        file_path = file_handler.find_file(file_id, file_index)
         
         if not file_path:
             raise HTTPException(status_code=404, detail=f"File with ID '{file_id}' not found")
         
-        # Read file and compute metadata
-        df, read_error = file_handler.read_file(file_path)
-        if df is None:
-            raise HTTPException(status_code=500, detail=f"Error reading file: {read_error}")
+        # Serve metadata persisted at upload time; recompute only if it is missing
+        metadata = file_handler.load_metadata(file_id)
         
-        metadata = file_handler.compute_metadata(df, file_path.name, file_path)
+        if metadata is None:
+            # Streamed in chunks: only metadata is needed, not the DataFrame
+            metadata = file_handler.compute_metadata_chunked(file_path, file_path.name)
+            if "error" in metadata:
+                raise HTTPException(status_code=500, detail=f"Error reading file: {metadata['error']}")
+            
+            file_handler.save_metadata(file_path, metadata)
         
         response_time = time.time() - start_time
         log_api_request(f"/get_file_metadata/{file_id}", "GET", 200, response_time)
         
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "status": "success",
             "file_id": file_id,
             "metadata": metadata
@@ -289,10 +304,74 @@ async def get_file_metadata(
         raise HTTPException(status_code=500, detail=f"Error retrieving metadata: {str(e)}")
 
 
+@router.get("/get_rows/{file_id}")
+async def get_rows(
+    file_id: str,
+    indices: List[int] = Query(...),
+    file_handler: FileHandler = Depends(get_file_handler),
+    file_index: Dict[str, Path] = Depends(get_file_index)
+):
+    """
+    Get specific rows of an uploaded file by position
+    
+    Quality reports reference sample rows (e.g. duplicate groups) by
+    position only; this fetches them on demand.
+    
+    Args:
+        file_id: File identifier (stem of filename)
+        indices: Zero-based row positions
+        
+    Returns:
+        JSON response with the rows in columnar form ({column: [values]})
+    """
+    start_time = time.time()
+    
+    try:
+        if len(indices) > MAX_ROWS_PER_REQUEST:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {MAX_ROWS_PER_REQUEST} rows can be requested at once"
+            )
+        
+        # Find file by ID
+        file_path = file_handler.find_file(file_id, file_index)
+        
+        if not file_path:
+            raise HTTPException(status_code=404, detail=f"File with ID '{file_id}' not found")
+        
+        # Parquet: row count from the footer, only the needed row groups decoded
+        rows, total_rows, read_error = file_handler.read_rows(file_path, indices)
+        if read_error:
+            raise HTTPException(status_code=500, detail=f"Error reading file: {read_error}")
+        
+        out_of_range = [i for i in indices if not 0 <= i < total_rows]
+        if out_of_range:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Row index out of range (file has {total_rows} rows): {out_of_range[:10]}"
+            )
+        
+        response_time = time.time() - start_time
+        log_api_request(f"/get_rows/{file_id}", "GET", 200, response_time)
+        
+        return ORJSONResponse(content={
+            "status": "success",
+            "file_id": file_id,
+            "indices": indices,
+            "rows": rows.to_dict('list')
+        }, status_code=200)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving rows: {str(e)}")
+
+
 @router.delete("/delete_upload/{file_id}")
 async def delete_upload(
     file_id: str,
-    file_handler: FileHandler = Depends(get_file_handler)
+    file_handler: FileHandler = Depends(get_file_handler),
+    file_index: Dict[str, Path] = Depends(get_file_index)
 ):
     """
     Delete an uploaded file (does NOT delete baselines)
@@ -307,22 +386,20 @@ async def delete_upload(
     
     try:
         # Find file by ID
-        file_path = None
-        for f in DATA_RAW_PATH.glob(f"{file_id}*"):
-            if f.is_file():
-                file_path = f
-                break
+        file_path = file_handler.find_file(file_id, file_index)
         
         if not file_path:
             raise HTTPException(status_code=404, detail=f"File with ID '{file_id}' not found")
         
         # Delete file
         file_path.unlink()
+        file_index.pop(file_id, None)
+        file_handler.delete_metadata(file_id)
         
         response_time = time.time() - start_time
         log_api_request(f"/delete_upload/{file_id}", "DELETE", 200, response_time)
         
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "status": "success",
             "message": f"File '{file_id}' deleted successfully"
         }, status_code=200)
@@ -351,7 +428,7 @@ async def list_baselines(
         response_time = time.time() - start_time
         log_api_request("/list_baselines", "GET", 200, response_time)
         
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "status": "success",
             "count": len(baselines),
             "baselines": baselines
@@ -386,7 +463,7 @@ async def get_baseline(
         response_time = time.time() - start_time
         log_api_request(f"/get_baseline/{version_id}", "GET", 200, response_time)
         
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "status": "success",
             "baseline": baseline_info
         }, status_code=200)
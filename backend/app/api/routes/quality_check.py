@@ -3,24 +3,63 @@ Quality Check API Routes for Neural Watch
 Phase 2: Data Quality Checks
 """
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from fastapi.responses import JSONResponse
-from typing import Optional
+from typing import Optional, Dict, List
 from pathlib import Path
+import asyncio
 import time
 from datetime import datetime
-import json
+import orjson
 
-import sys
-sys.path.append(str(Path(__file__).resolve().parent.parent.parent.parent.parent))
-from backend.app.api.dependencies import get_file_handler, get_logger
+from backend.app.api.dependencies import get_file_handler, get_file_index, get_logger
+from backend.app.api.responses import ORJSONResponse
 from backend.app.utils.file_handler import FileHandler
-from backend.app.core.quality import MissingValueAnalyzer, DuplicateDetector, OutlierDetector
+from backend.app.core import quality  # Checkers load on first use (see the package docstring)
 from backend.app.utils.quality_scorer import QualityScorer
 from backend.app.utils.logger import log_api_request
 from config.settings import DATA_RAW_PATH, DRIFT_REPORTS_PATH
 
 router = APIRouter(prefix="/api/v1", tags=["quality_check"])
 
+REPORT_INDEX_PATH = DRIFT_REPORTS_PATH / "index.jsonl"
+
+
+def _report_index_entry(report: Dict) -> Dict:
+    """
+    Extract the listing fields of a quality report
+    
+    Args:
+        report: Full quality report
+        
+    Returns:
+        Index entry for /list_quality_reports
+    """
+    return {
+        "report_id": report['report_id'],
+        "filename": report['filename'],
+        "timestamp": report['timestamp'],
+        "quality_score": report.get('quality_score', {}).get('overall_score', 0),
+        "grade": report.get('quality_score', {}).get('grade', 'Unknown')
+    }
+
+
+def _append_report_index(entry: Dict):
+    """Append one entry to the quality-report index (one JSON object per line)"""
+    with open(REPORT_INDEX_PATH, 'ab') as f:
+        f.write(orjson.dumps(entry, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n")
+
+
+def _rebuild_report_index():
+    """Rebuild the quality-report index from the reports on disk"""
+    lines = []
+    for report_file in DRIFT_REPORTS_PATH.glob("quality_report_*.json"):
+        try:
+            report = orjson.loads(report_file.read_bytes())
+            lines.append(orjson.dumps(_report_index_entry(report), option=orjson.OPT_SERIALIZE_NUMPY) + b"\n")
+        except Exception:
+            continue
+    
+    REPORT_INDEX_PATH.write_bytes(b"".join(lines))
+
 
 @router.post("/check_quality")
 async def check_quality(
@@ -30,7 +69,9 @@ async def check_quality(
     check_duplicates: bool = Form(True),
     check_outliers: bool = Form(True),
     outlier_method: str = Form('iqr'),
-    file_handler: FileHandler = Depends(get_file_handler)
+    duplicate_subset: Optional[List[str]] = Form(None),
+    file_handler: FileHandler = Depends(get_file_handler),
+    file_index: Dict[str, Path] = Depends(get_file_index)
 ):
     """
     Run comprehensive quality checks on a dataset
@@ -42,6 +83,7 @@ async def check_quality(
         check_duplicates: Run duplicate detection
         check_outliers: Run outlier detection
         outlier_method: Outlier detection method ('iqr', 'z_score', 'both')
+        duplicate_subset: Columns that identify a duplicate row (default: all columns)
         
     Returns:
         JSON response with comprehensive quality report
@@ -52,11 +94,7 @@ async def check_quality(
         # Determine data source
         if file_id:
             # Load existing file
-            file_path = None
-            for f in DATA_RAW_PATH.glob(f"{file_id}*"):
-                if f.is_file():
-                    file_path = f
-                    break
+            file_path = file_handler.find_file(file_id, file_index)
             
             if not file_path:
                 raise HTTPException(status_code=404, detail=f"File with ID '{file_id}' not found")
@@ -69,11 +107,8 @@ async def check_quality(
         
         elif file:
             # Handle uploaded file
-            import shutil
             temp_path = DATA_RAW_PATH / f"temp_quality_{file.filename}"
-            
-            with open(temp_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
+            await file_handler.save_upload(file, temp_path)
             
             df, read_error = file_handler.read_file(temp_path)
             if df is None:
@@ -89,6 +124,14 @@ async def check_quality(
         else:
             raise HTTPException(status_code=400, detail="Either file_id or file must be provided")
         
+        if duplicate_subset:
+            unknown_columns = [col for col in duplicate_subset if col not in df.columns]
+            if unknown_columns:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Unknown duplicate_subset column(s): {', '.join(unknown_columns)}"
+                )
+        
         # Generate report ID
         report_id = f"quality_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
@@ -102,41 +145,39 @@ async def check_quality(
                 "rows": len(df),
                 "columns": len(df.columns),
                 "column_names": df.columns.tolist(),
-                "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()}
+                "dtypes": df.dtypes.astype(str).to_dict()
             }
         }
         
-        # Run quality checks
+        # Run quality checks (independent of each other, so they run concurrently
+        # in worker threads; pandas/NumPy release the GIL for the heavy work)
+        checks = {}
         
         # 1. Missing Values Analysis
         if check_missing:
-            analyzer = MissingValueAnalyzer(warn_threshold=10.0, error_threshold=50.0)
-            missing_analysis = analyzer.analyze(df)
-            missing_patterns = analyzer.get_missing_patterns(df)
-            
-            quality_report['missing_values'] = missing_analysis
-            quality_report['missing_patterns'] = missing_patterns
+            analyzer = quality.MissingValueAnalyzer(warn_threshold=10.0, error_threshold=50.0)
+            checks['missing_values'] = asyncio.to_thread(analyzer.analyze, df)
+            checks['missing_patterns'] = asyncio.to_thread(analyzer.get_missing_patterns, df)
         else:
             quality_report['missing_values'] = {"total_missing": 0, "overall_missing_percentage": 0, "details": []}
         
         # 2. Duplicate Detection
         if check_duplicates:
-            detector = DuplicateDetector(check_full_row=True)
-            duplicate_analysis = detector.analyze(df)
-            
-            quality_report['duplicates'] = duplicate_analysis
+            detector = quality.DuplicateDetector(check_full_row=True, subset=duplicate_subset or None)
+            checks['duplicates'] = asyncio.to_thread(detector.analyze, df)
         else:
             quality_report['duplicates'] = {"total_duplicates": 0, "duplicate_percentage": 0}
         
         # 3. Outlier Detection
         if check_outliers:
-            outlier_detector = OutlierDetector(method=outlier_method, iqr_multiplier=1.5, z_score_threshold=3.0)
-            outlier_analysis = outlier_detector.analyze(df)
-            
-            quality_report['outliers'] = outlier_analysis
+            outlier_detector = quality.OutlierDetector(method=outlier_method, iqr_multiplier=1.5, z_score_threshold=3.0)
+            checks['outliers'] = asyncio.to_thread(outlier_detector.analyze, df)
         else:
             quality_report['outliers'] = {"total_outliers": 0, "outlier_percentage": 0, "details": []}
         
+        check_results = await asyncio.gather(*checks.values())
+        quality_report.update(zip(checks.keys(), check_results))
+        
         # 4. Calculate Overall Quality Score
         scorer = QualityScorer()
         score_result = scorer.calculate_score(
@@ -170,8 +211,14 @@ async def check_quality(
         
         # 7. Save report to file
         report_path = DRIFT_REPORTS_PATH / f"{report_id}.json"
-        with open(report_path, 'w') as f:
-            json.dump(quality_report, f, indent=2)
+        report_path.write_bytes(orjson.dumps(
+            quality_report,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ))
+        if REPORT_INDEX_PATH.exists():
+            _append_report_index(_report_index_entry(quality_report))
+        else:
+            _rebuild_report_index()
         
         # Calculate response time
         response_time = time.time() - start_time
@@ -179,10 +226,18 @@ async def check_quality(
         
         log_api_request("/check_quality", "POST", 200, response_time)
         
-        return JSONResponse(content={
+        # Return summary fields only; full details are served by /quality_report/{report_id}
+        response_report = {
+            k: quality_report[k] for k in (
+                'report_id', 'file_id', 'filename', 'timestamp', 'dataset_info',
+                'quality_score', 'summary', 'recommendations', 'response_time_seconds'
+            )
+        }
+        
+        return ORJSONResponse(content={
             "status": "success",
             "message": "Quality check completed",
-            "report": quality_report
+            "report": response_report
         }, status_code=200)
         
     except HTTPException:
@@ -210,13 +265,12 @@ async def get_quality_report(report_id: str):
         if not report_path.exists():
             raise HTTPException(status_code=404, detail=f"Report '{report_id}' not found")
         
-        with open(report_path, 'r') as f:
-            report = json.load(f)
+        report = orjson.loads(report_path.read_bytes())
         
         response_time = time.time() - start_time
         log_api_request(f"/quality_report/{report_id}", "GET", 200, response_time)
         
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "status": "success",
             "report": report
         }, status_code=200)
@@ -230,7 +284,8 @@ async def get_quality_report(report_id: str):
 @router.get("/quality_summary/{file_id}")
 async def get_quality_summary(
     file_id: str,
-    file_handler: FileHandler = Depends(get_file_handler)
+    file_handler: FileHandler = Depends(get_file_handler),
+    file_index: Dict[str, Path] = Depends(get_file_index)
 ):
     """
     Get quick quality summary for a file (without full analysis)
@@ -245,11 +300,7 @@ async def get_quality_summary(
     
     try:
         # Find file
-        file_path = None
-        for f in DATA_RAW_PATH.glob(f"{file_id}*"):
-            if f.is_file():
-                file_path = f
-                break
+        file_path = file_handler.find_file(file_id, file_index)
         
         if not file_path:
             raise HTTPException(status_code=404, detail=f"File with ID '{file_id}' not found")
@@ -259,11 +310,11 @@ async def get_quality_summary(
         if df is None:
             raise HTTPException(status_code=500, detail=f"Error reading file: {read_error}")
         
-        # Quick analysis
-        missing_count = df.isnull().sum().sum()
+        # Quick analysis (single null mask, reductions run in NumPy)
+        missing_count = int(df.isna().to_numpy().sum())
         missing_pct = round((missing_count / (len(df) * len(df.columns)) * 100), 2)
         
-        duplicate_count = df.duplicated().sum()
+        duplicate_count = int(df.duplicated().to_numpy().sum())
         duplicate_pct = round((duplicate_count / len(df) * 100), 2)
         
         summary = {
@@ -285,7 +336,7 @@ async def get_quality_summary(
         response_time = time.time() - start_time
         log_api_request(f"/quality_summary/{file_id}", "GET", 200, response_time)
         
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "status": "success",
             "summary": summary
         }, status_code=200)
@@ -307,22 +358,19 @@ async def list_quality_reports():
     start_time = time.time()
     
     try:
-        reports = []
+        if not REPORT_INDEX_PATH.exists():
+            _rebuild_report_index()
         
-        for report_file in DRIFT_REPORTS_PATH.glob("quality_report_*.json"):
+        # Later entries win: a report_id rewritten within the same second overwrites its file
+        entries = {}
+        for line in REPORT_INDEX_PATH.read_bytes().splitlines():
             try:
-                with open(report_file, 'r') as f:
-                    report = json.load(f)
-                
-                reports.append({
-                    "report_id": report['report_id'],
-                    "filename": report['filename'],
-                    "timestamp": report['timestamp'],
-                    "quality_score": report.get('quality_score', {}).get('overall_score', 0),
-                    "grade": report.get('quality_score', {}).get('grade', 'Unknown')
-                })
-            except Exception:
+                entry = orjson.loads(line)
+            except orjson.JSONDecodeError:
                 continue
+            entries[entry['report_id']] = entry
+        
+        reports = list(entries.values())
         
         # Sort by timestamp (newest first)
         reports.sort(key=lambda x: x['timestamp'], reverse=True)
@@ -330,7 +378,7 @@ async def list_quality_reports():
         response_time = time.time() - start_time
         log_api_request("/list_quality_reports", "GET", 200, response_time)
         
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "status": "success",
             "count": len(reports),
             "reports": reports
@@ -1,13 +1,41 @@
 """
 Quality Check Package for Neural Watch
 Phase 2: Data Quality Checks
+
+Checkers are imported on first attribute access (PEP 562), so importing the
+package at app startup does not load the outlier kernels (Numba, if
+installed) or pyarrow.compute until a quality check actually runs.
 """
-from .missing_values import MissingValueAnalyzer
-from .duplicates import DuplicateDetector
-from .outliers import OutlierDetector
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .missing_values import MissingValueAnalyzer
+    from .duplicates import DuplicateDetector
+    from .outliers import OutlierDetector
+
+# Public name -> submodule defining it
+_LAZY_IMPORTS = {
+    'MissingValueAnalyzer': 'missing_values',
+    'DuplicateDetector': 'duplicates',
+    'OutlierDetector': 'outliers'
+}
 
 __all__ = [
     'MissingValueAnalyzer',
     'DuplicateDetector',
     'OutlierDetector'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(f".{_LAZY_IMPORTS[name]}", __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
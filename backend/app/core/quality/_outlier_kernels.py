@@ -0,0 +1,52 @@
+"""
+Outlier Kernels for Neural Watch
+Phase 2: Data Quality Checks
+Numba-compiled outlier counting across all numeric columns (optional)
+"""
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    # Plain-Python stand-ins keep the kernel importable (and testable);
+    # callers check NUMBA_AVAILABLE before using it on real data
+    prange = range
+    
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit(parallel=True, cache=True)
+def count_outliers(values, lower, upper, mean, std, z_threshold, use_iqr, use_z, out_count):
+    """
+    Count outliers per column of a float matrix, one column per thread
+    
+    Comparisons follow the NumPy path exactly: NaN never counts (so fastmath,
+    which assumes no NaN, is not enabled) and a zero std disables the z-score
+    test for that column.
+    
+    Args:
+        values: Float matrix (rows, columns), NaN = missing
+        lower: IQR lower bound per column
+        upper: IQR upper bound per column
+        mean: Mean per column
+        std: Sample standard deviation per column
+        z_threshold: Z-score threshold
+        use_iqr: Apply the IQR bounds
+        use_z: Apply the z-score threshold
+        out_count: Output array receiving the outlier count per column
+    """
+    n_rows, n_columns = values.shape
+    for j in prange(n_columns):
+        check_z = use_z and std[j] != 0
+        count = 0
+        for i in range(n_rows):
+            x = values[i, j]
+            if use_iqr and (x < lower[j] or x > upper[j]):
+                count += 1
+            elif check_z and abs((x - mean[j]) / std[j]) > z_threshold:
+                count += 1
+        out_count[j] = count
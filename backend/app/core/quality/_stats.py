@@ -0,0 +1,31 @@
+"""
+Shared Statistics for Neural Watch
+Phase 2: Data Quality Checks
+Moment-based statistics matching pandas, shared by the quality analyzers
+"""
+import numpy as np
+
+
+def skew_from_moments(counts: np.ndarray, m2: np.ndarray, m3: np.ndarray) -> np.ndarray:
+    """
+    Unbiased skewness from central moment sums, as computed by Series.skew
+    
+    Args:
+        counts: Number of values per column
+        m2: Sum of squared deviations from the mean per column
+        m3: Sum of cubed deviations from the mean per column
+        
+    Returns:
+        Skewness per column (0 for constant columns, NaN below 3 values)
+    """
+    counts = np.asarray(counts)
+    
+    # Same round-off clamp as pandas: tiny moment sums count as exact zeros
+    m2 = np.where(np.abs(m2) < 1e-14, 0.0, m2)
+    m3 = np.where(np.abs(m3) < 1e-14, 0.0, m3)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        skew = (counts * (counts - 1) ** 0.5 / (counts - 2)) * (m3 / m2 ** 1.5)
+    skew = np.where(m2 == 0, 0.0, skew)
+    skew = np.where(counts < 3, np.nan, skew)
+    return skew
@@ -4,30 +4,51 @@ Phase 2: Data Quality Checks
 Detects and analyzes duplicate rows in datasets
 """
 import pandas as pd
-from typing import Dict, List, Optional
-from pathlib import Path
-import sys
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Tuple
 
-sys.path.append(str(Path(__file__).resolve().parent.parent.parent.parent))
+from backend.app.core.quality.frame_cache import FrameCache
 from backend.app.utils.logger import NeuralWatchLogger
 
 logger = NeuralWatchLogger.get_logger("duplicates")
 
+# Frames with more identifying columns than this are grouped by row hash
+HASH_GROUPING_COLUMN_THRESHOLD = 8
+
 
 class DuplicateDetector:
     """Detect and analyze duplicate rows in datasets"""
     
-    def __init__(self, check_full_row: bool = True, key_columns: Optional[List[str]] = None):
+    # Percentage thresholds: a value at an edge falls in the next bucket;
+    # the first edge is the smallest positive float, so only 0% maps to bucket 0
+    _SEVERITY_EDGES = np.array([np.nextafter(0, 1), 1, 5])
+    _SEVERITY_LABELS = ["none", "low", "medium", "high"]
+    _RECOMMENDATION_EDGES = np.array([np.nextafter(0, 1), 1, 5, 20])
+    _RECOMMENDATION_LABELS = [
+        "no_action", "keep_first", "review_and_remove", "investigate_cause", "major_issue_investigate"
+    ]
+    
+    def __init__(
+        self,
+        check_full_row: bool = True,
+        key_columns: Optional[List[str]] = None,
+        subset: Optional[List[str]] = None
+    ):
         """
         Initialize Duplicate Detector
         
         Args:
             check_full_row: Check for full row duplicates (default: True)
             key_columns: Specific columns to check for duplicates (optional)
+            subset: Columns that identify a row for the row-level check (default: all columns)
         """
         self.check_full_row = check_full_row
         self.key_columns = key_columns
-        logger.info(f"DuplicateDetector initialized | Full row: {check_full_row} | Keys: {key_columns}")
+        self.subset = subset
+        self._frame_cache = FrameCache()
+        logger.info(
+            f"DuplicateDetector initialized | Full row: {check_full_row} | Keys: {key_columns} | Subset: {subset}"
+        )
     
     def analyze(self, df: pd.DataFrame) -> Dict:
         """
@@ -43,20 +64,47 @@ class DuplicateDetector:
         
         total_rows = len(df)
         
+        # Duplicates need at least two rows; skip the hashing passes entirely
+        if total_rows < 2:
+            key_analysis = None
+            if self.key_columns and all(col in df.columns for col in self.key_columns):
+                key_analysis = {
+                    "columns": self.key_columns,
+                    "duplicate_count": 0,
+                    "duplicate_percentage": 0,
+                    "unique_combinations": total_rows
+                }
+            
+            return {
+                "total_rows": total_rows,
+                "total_duplicates": 0,
+                "duplicate_percentage": 0,
+                "duplicate_groups": 0,
+                "unique_rows": total_rows,
+                "check_full_row": self.check_full_row,
+                "subset": self.subset,
+                "key_columns": self.key_columns,
+                "key_analysis": key_analysis,
+                "sample_duplicates": [],
+                "recommendation": self._generate_recommendation(0),
+                "severity": self._get_severity(0)
+            }
+        
         # Full row duplicate analysis
         if self.check_full_row:
-            duplicates = df.duplicated(keep=False)
-            duplicate_count = duplicates.sum()
+            # One hashing pass yields the mask, group count and samples
+            codes, counts, _, _ = self._duplicate_state(df, self.subset)
+            row_groups = (codes, counts)
+            
+            duplicates = counts[codes] > 1
+            duplicate_count = int(duplicates.sum())
             duplicate_percentage = round((duplicate_count / total_rows * 100), 2) if total_rows > 0 else 0
             
             # Count duplicate groups (unique duplicate combinations)
-            if duplicate_count > 0:
-                duplicate_groups = df[duplicates].drop_duplicates().shape[0]
-            else:
-                duplicate_groups = 0
+            duplicate_groups = int((counts > 1).sum())
             
             # Get sample duplicates
-            sample_duplicates = self._get_sample_duplicates(df, limit=5)
+            sample_duplicates = self._get_sample_duplicates(df, limit=5, row_groups=row_groups)
             
         else:
             duplicate_count = 0
@@ -79,6 +127,7 @@ class DuplicateDetector:
             "duplicate_groups": duplicate_groups,
             "unique_rows": total_rows - int(duplicate_count),
             "check_full_row": self.check_full_row,
+            "subset": self.subset,
             "key_columns": self.key_columns,
             "key_analysis": key_analysis,
             "sample_duplicates": sample_duplicates,
@@ -89,39 +138,332 @@ class DuplicateDetector:
         logger.info(f"Duplicate analysis complete: {duplicate_count} duplicates ({duplicate_percentage}%)")
         return result
     
-    def _get_sample_duplicates(self, df: pd.DataFrame, limit: int = 5) -> List[Dict]:
+    def analyze_chunks(self, chunks: Iterable[pd.DataFrame], sample_limit: int = 5) -> Dict:
+        """
+        Perform duplicate analysis over a stream of row chunks
+        
+        Rows are reduced to 64-bit hashes and only the distinct hashes with
+        their counts are kept, so memory is bounded by one chunk plus 16 bytes
+        per distinct row. Counts are hash based (no exact re-check across
+        chunks), and sample sets list the row positions from the chunk in
+        which each set was first seen to repeat.
+        
+        Args:
+            chunks: Iterable of DataFrames holding consecutive rows
+            sample_limit: Maximum number of duplicate sets to sample
+            
+        Returns:
+            Dictionary with duplicate analysis results (same shape as analyze)
+        """
+        empty = np.empty(0, dtype=np.uint64)
+        row_table = (empty, np.empty(0, dtype=np.int64))
+        key_table = (empty, np.empty(0, dtype=np.int64))
+        check_keys = None
+        samples = {}  # row hash -> sampled row positions
+        total_rows = 0
+        
+        for chunk in chunks:
+            if check_keys is None:
+                check_keys = bool(self.key_columns) and all(col in chunk.columns for col in self.key_columns)
+            total_rows += len(chunk)
+            if len(chunk) == 0:
+                continue
+            
+            if self.check_full_row:
+                row_hashes = self._chunk_row_hashes(chunk, self.subset)
+                row_table = self._merge_hash_counts(row_table, row_hashes)
+                
+                if len(samples) < sample_limit:
+                    table_hashes, table_counts = row_table
+                    repeated = table_counts[np.searchsorted(table_hashes, row_hashes)] > 1
+                    for row_hash in pd.unique(row_hashes[repeated]):
+                        if len(samples) >= sample_limit:
+                            break
+                        if row_hash not in samples:
+                            rows = np.flatnonzero(row_hashes == row_hash)[:3]
+                            samples[row_hash] = (total_rows - len(chunk) + rows).tolist()
+            
+            if check_keys:
+                key_table = self._merge_hash_counts(key_table, self._chunk_row_hashes(chunk, self.key_columns))
+        
+        row_hashes, row_counts = row_table
+        duplicate_count = int(row_counts[row_counts > 1].sum())
+        duplicate_percentage = round((duplicate_count / total_rows * 100), 2) if total_rows > 0 else 0
+        
+        sample_duplicates = [
+            {
+                "count": int(row_counts[np.searchsorted(row_hashes, row_hash)]),
+                "indices": rows
+            }
+            for row_hash, rows in samples.items()
+        ]
+        
+        key_analysis = None
+        if check_keys:
+            key_counts = key_table[1]
+            key_duplicate_count = int(key_counts[key_counts > 1].sum())
+            key_analysis = {
+                "columns": self.key_columns,
+                "duplicate_count": key_duplicate_count,
+                "duplicate_percentage": round((key_duplicate_count / total_rows * 100), 2) if total_rows > 0 else 0,
+                "unique_combinations": int(key_counts.size)
+            }
+        
+        logger.info(f"Chunked duplicate analysis complete: {duplicate_count} duplicates over {total_rows} rows")
+        
+        return {
+            "total_rows": total_rows,
+            "total_duplicates": duplicate_count,
+            "duplicate_percentage": duplicate_percentage,
+            "duplicate_groups": int(np.count_nonzero(row_counts > 1)),
+            "unique_rows": total_rows - duplicate_count,
+            "check_full_row": self.check_full_row,
+            "subset": self.subset,
+            "key_columns": self.key_columns,
+            "key_analysis": key_analysis,
+            "sample_duplicates": sample_duplicates,
+            "recommendation": self._generate_recommendation(duplicate_percentage),
+            "severity": self._get_severity(duplicate_percentage)
+        }
+    
+    @staticmethod
+    def _chunk_row_hashes(chunk: pd.DataFrame, columns: Optional[List[str]]) -> np.ndarray:
+        """
+        Hash each row of a chunk over the identifying columns
+        
+        Integer and boolean columns are hashed as float64 so a column that
+        gains NaNs in a later chunk (and is read as float) hashes alike.
+        
+        Args:
+            chunk: One chunk of rows
+            columns: Identifying columns (default: all columns)
+            
+        Returns:
+            uint64 hash per row
+        """
+        key_frame = chunk[columns] if columns else chunk
+        widen = {col: "float64" for col, dtype in key_frame.dtypes.items() if dtype.kind in "iub"}
+        if widen:
+            key_frame = key_frame.astype(widen)
+        return pd.util.hash_pandas_object(key_frame, index=False).to_numpy()
+    
+    @staticmethod
+    def _merge_hash_counts(
+        table: Tuple[np.ndarray, np.ndarray],
+        hashes: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Add a chunk's row hashes to a sorted (hash, count) table
+        
+        Args:
+            table: Sorted distinct hashes and their counts
+            hashes: Row hashes of the next chunk
+            
+        Returns:
+            Updated table
+        """
+        table_hashes, table_counts = table
+        chunk_hashes, chunk_counts = np.unique(hashes, return_counts=True)
+        
+        positions = np.searchsorted(table_hashes, chunk_hashes)
+        found = positions < len(table_hashes)
+        found[found] = table_hashes[positions[found]] == chunk_hashes[found]
+        
+        table_counts = table_counts.copy()
+        table_counts[positions[found]] += chunk_counts[found]
+        
+        new = ~found
+        return (
+            np.insert(table_hashes, positions[new], chunk_hashes[new]),
+            np.insert(table_counts, positions[new], chunk_counts[new])
+        )
+    
+    def _duplicate_state(
+        self,
+        df: pd.DataFrame,
+        columns: Optional[List[str]] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Group rows once and cache everything the keep variants derive from
+        
+        Args:
+            df: DataFrame
+            columns: Identifying columns (default: all columns)
+            
+        Returns:
+            Tuple of (group code per row, row count per group,
+            first row per group, last row per group)
+        """
+        cache_key = ("duplicate_state", tuple(columns) if columns else None)
+        return self._frame_cache.get(df, cache_key, lambda frame: self._build_duplicate_state(frame, columns))
+    
+    def _build_duplicate_state(
+        self,
+        df: pd.DataFrame,
+        columns: Optional[List[str]]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Compute the uncached result of _duplicate_state
+        
+        Args:
+            df: DataFrame
+            columns: Identifying columns (default: all columns)
+            
+        Returns:
+            Tuple of (codes, counts, first row per group, last row per group)
+        """
+        codes, counts = self._group_rows(df, columns)
+        
+        # Codes follow first appearance, so unique's indices line up with 0..k-1
+        _, first_rows = np.unique(codes, return_index=True)
+        _, last_from_end = np.unique(codes[::-1], return_index=True)
+        last_rows = len(codes) - 1 - last_from_end
+        
+        return codes, counts, first_rows, last_rows
+    
+    def _duplicate_mask(self, df: pd.DataFrame, columns: Optional[List[str]], keep) -> np.ndarray:
+        """
+        Boolean duplicate mask matching DataFrame.duplicated(subset=columns, keep=keep)
+        
+        Args:
+            df: DataFrame
+            columns: Identifying columns (default: all columns)
+            keep: 'first', 'last' or False
+            
+        Returns:
+            Boolean array, one entry per row
+        """
+        codes, counts, first_rows, last_rows = self._duplicate_state(df, columns)
+        
+        if keep == 'first':
+            return first_rows[codes] != np.arange(len(codes))
+        if keep == 'last':
+            return last_rows[codes] != np.arange(len(codes))
+        if keep is False:
+            return counts[codes] > 1
+        raise ValueError("keep must be either 'first', 'last' or False")
+    
+    def _group_rows(
+        self,
+        df: pd.DataFrame,
+        columns: Optional[List[str]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Assign every row an integer group code based on its identifying columns
+        
+        Narrow frames are grouped exactly; wide frames are grouped by a 64-bit
+        row hash, which collapses the per-row work to a single uint64 scan.
+        
+        Args:
+            df: DataFrame
+            columns: Identifying columns (default: all columns)
+            
+        Returns:
+            Tuple of (group code per row, row count per group); codes follow first appearance
+        """
+        key_frame = df[columns] if columns else df
+        
+        if len(key_frame.columns) > HASH_GROUPING_COLUMN_THRESHOLD:
+            codes = self._hash_group_codes(key_frame)
+        else:
+            codes = self._exact_group_codes(key_frame)
+        
+        counts = np.bincount(codes)
+        return codes, counts
+    
+    def _exact_group_codes(self, key_frame: pd.DataFrame) -> np.ndarray:
+        """
+        Group rows by value (NaN equal to NaN, as in DataFrame.duplicated)
+        
+        Args:
+            key_frame: Identifying columns
+            
+        Returns:
+            Group code per row
+        """
+        keys = [key_frame.iloc[:, i] for i in range(key_frame.shape[1])]
+        return key_frame.groupby(keys, sort=False, dropna=False, observed=True).ngroup().to_numpy()
+    
+    def _hash_group_codes(self, key_frame: pd.DataFrame) -> np.ndarray:
+        """
+        Group rows by a 64-bit hash of their values, verifying shared hashes exactly
+        
+        Args:
+            key_frame: Identifying columns
+            
+        Returns:
+            Group code per row
+        """
+        row_hashes = pd.util.hash_pandas_object(key_frame, index=False).to_numpy()
+        codes, _ = pd.factorize(row_hashes, sort=False)
+        counts = np.bincount(codes)
+        
+        # A hash collision (or object values that hash alike, e.g. 1 and '1') would
+        # merge distinct rows; regroup the rows that share a hash by value and fall
+        # back to exact grouping if they split into more groups
+        shared_rows = np.flatnonzero(counts[codes] > 1)
+        if shared_rows.size:
+            exact_codes = self._exact_group_codes(key_frame.iloc[shared_rows])
+            if exact_codes.max() + 1 != np.count_nonzero(counts > 1):
+                logger.warning("Row hash collision detected; using exact duplicate grouping")
+                return self._exact_group_codes(key_frame)
+        
+        return codes
+    
+    def _get_sample_duplicates(
+        self,
+        df: pd.DataFrame,
+        limit: int = 5,
+        row_groups: Optional[Tuple[np.ndarray, np.ndarray]] = None
+    ) -> List[Dict]:
         """
         Get sample duplicate row groups
         
         Args:
             df: DataFrame
             limit: Maximum number of groups to return
+            row_groups: Precomputed result of _group_rows (optional)
             
         Returns:
-            List of sample duplicate groups
+            List of sample duplicate groups ({"count": n, "indices": [row positions]});
+            fetch the rows themselves with get_rows
         """
-        duplicates = df[df.duplicated(keep=False)]
+        codes, counts = row_groups if row_groups is not None else self._duplicate_state(df, self.subset)[:2]
         
-        if duplicates.empty:
+        # First `limit` duplicate sets, in order of first appearance
+        sample_codes = np.flatnonzero(counts > 1)[:limit]
+        if len(sample_codes) == 0:
             return []
         
-        samples = []
-        seen_groups = 0
+        # Gather the member rows of all sampled sets in one pass, grouped by
+        # code (stable sort keeps each set's rows in their original order)
+        member_rows = np.flatnonzero(np.isin(codes, sample_codes))
+        member_rows = member_rows[np.argsort(codes[member_rows], kind='stable')]
+        group_starts = np.searchsorted(codes[member_rows], sample_codes)
         
-        # Group by all columns to find duplicate sets
-        for _, group in duplicates.groupby(list(df.columns)):
-            if seen_groups >= limit:
-                break
-            
-            if len(group) > 1:
-                samples.append({
-                    "count": len(group),
-                    "rows": group.head(3).to_dict('records')  # Show max 3 rows per group
-                })
-                seen_groups += 1
+        samples = []
+        for code, start in zip(sample_codes, group_starts):
+            rows = member_rows[start:start + min(int(counts[code]), 3)]  # Show max 3 rows per group
+            samples.append({
+                "count": int(counts[code]),
+                "indices": rows.tolist()
+            })
         
         return samples
     
+    def get_rows(self, df: pd.DataFrame, indices: List[int]) -> pd.DataFrame:
+        """
+        Get the rows referenced by a sample's indices
+        
+        Args:
+            df: DataFrame the analysis ran on
+            indices: Row positions (e.g. sample_duplicates[i]["indices"])
+            
+        Returns:
+            DataFrame with the selected rows
+        """
+        return df.iloc[indices]
+    
     def _analyze_key_duplicates(self, df: pd.DataFrame) -> Dict:
         """
         Analyze duplicates based on key columns
@@ -132,17 +474,48 @@ class DuplicateDetector:
         Returns:
             Key column duplicate analysis
         """
-        key_duplicates = df.duplicated(subset=self.key_columns, keep=False)
-        key_duplicate_count = key_duplicates.sum()
+        # Integer-encode each key column once, then count combinations of the
+        # codes; no Python objects are hashed per row after the factorize
+        key_counts = np.bincount(self._combine_key_codes(df, self.key_columns))
+        key_duplicate_count = int(key_counts[key_counts > 1].sum())
         key_duplicate_percentage = round((key_duplicate_count / len(df) * 100), 2)
         
         return {
             "columns": self.key_columns,
-            "duplicate_count": int(key_duplicate_count),
+            "duplicate_count": key_duplicate_count,
             "duplicate_percentage": key_duplicate_percentage,
-            "unique_combinations": df[self.key_columns].drop_duplicates().shape[0]
+            "unique_combinations": int(key_counts.size)
         }
     
+    def _combine_key_codes(self, df: pd.DataFrame, columns: List[str]) -> np.ndarray:
+        """
+        Encode each row's combination of key values as one integer code
+        
+        Args:
+            df: DataFrame
+            columns: Key columns
+            
+        Returns:
+            Dense group code per row (NaN keys form their own group, as in duplicated)
+        """
+        column_codes = []
+        cardinalities = []
+        for col in columns:
+            codes, uniques = pd.factorize(df[col], sort=False, use_na_sentinel=False)
+            column_codes.append(codes.astype(np.int64, copy=False))
+            cardinalities.append(max(len(uniques), 1))
+        
+        # Mixed-radix packing into one int64 while the code space fits;
+        # otherwise compare the code rows directly
+        if np.prod(np.array(cardinalities, dtype=float)) < 2 ** 62:
+            combined = column_codes[0]
+            for codes, cardinality in zip(column_codes[1:], cardinalities[1:]):
+                combined = combined * cardinality + codes
+            return pd.factorize(combined, sort=False)[0]
+        
+        _, inverse = np.unique(np.column_stack(column_codes), axis=0, return_inverse=True)
+        return inverse.ravel()
+    
     def _generate_recommendation(self, duplicate_percentage: float) -> str:
         """
         Generate recommendation for handling duplicates
@@ -153,16 +526,9 @@ class DuplicateDetector:
         Returns:
             Recommendation string
         """
-        if duplicate_percentage == 0:
-            return "no_action"
-        elif duplicate_percentage < 1:
-            return "keep_first"
-        elif duplicate_percentage < 5:
-            return "review_and_remove"
-        elif duplicate_percentage < 20:
-            return "investigate_cause"
-        else:
-            return "major_issue_investigate"
+        return self._RECOMMENDATION_LABELS[
+            np.searchsorted(self._RECOMMENDATION_EDGES, duplicate_percentage, side='right')
+        ]
     
     def _get_severity(self, duplicate_percentage: float) -> str:
         """
@@ -174,14 +540,9 @@ class DuplicateDetector:
         Returns:
             Severity level
         """
-        if duplicate_percentage == 0:
-            return "none"
-        elif duplicate_percentage < 1:
-            return "low"
-        elif duplicate_percentage < 5:
-            return "medium"
-        else:
-            return "high"
+        return self._SEVERITY_LABELS[
+            np.searchsorted(self._SEVERITY_EDGES, duplicate_percentage, side='right')
+        ]
     
     def get_duplicate_indices(self, df: pd.DataFrame, keep: str = 'first') -> List[int]:
         """
@@ -195,13 +556,13 @@ class DuplicateDetector:
             List of duplicate row indices
         """
         if self.check_full_row:
-            duplicates = df.duplicated(keep=keep)
+            duplicates = self._duplicate_mask(df, self.subset, keep)
         elif self.key_columns:
-            duplicates = df.duplicated(subset=self.key_columns, keep=keep)
+            duplicates = self._duplicate_mask(df, self.key_columns, keep)
         else:
             return []
         
-        return df[duplicates].index.tolist()
+        return df.index[duplicates].tolist()
     
     def remove_duplicates(self, df: pd.DataFrame, keep: str = 'first', inplace: bool = False) -> pd.DataFrame:
         """
@@ -218,23 +579,28 @@ class DuplicateDetector:
         logger.info(f"Removing duplicates (keep={keep})")
         
         if self.check_full_row:
-            result = df.drop_duplicates(keep=keep, inplace=inplace)
+            columns = self.subset
         elif self.key_columns:
-            result = df.drop_duplicates(subset=self.key_columns, keep=keep, inplace=inplace)
+            columns = self.key_columns
         else:
-            result = df
+            return df
         
-        if not inplace:
-            removed = len(df) - len(result)
-            logger.info(f"Removed {removed} duplicate rows")
-            return result
-        else:
+        if inplace:
+            # In-place edits invalidate the cached grouping, so let pandas do it
+            df.drop_duplicates(subset=columns, keep=keep, inplace=True)
             return df
+        
+        result = df[~self._duplicate_mask(df, columns, keep)]
+        
+        removed = len(df) - len(result)
+        logger.info(f"Removed {removed} duplicate rows")
+        return result
 
 
 # Convenience function
 def detect_duplicates(df: pd.DataFrame, check_full_row: bool = True, 
-                     key_columns: Optional[List[str]] = None) -> Dict:
+                     key_columns: Optional[List[str]] = None,
+                     subset: Optional[List[str]] = None) -> Dict:
     """
     Convenience function to detect duplicates
     
@@ -242,9 +608,10 @@ def detect_duplicates(df: pd.DataFrame, check_full_row: bool = True,
         df: DataFrame to analyze
         check_full_row: Check for full row duplicates
         key_columns: Specific columns to check
+        subset: Columns that identify a row for the row-level check
         
     Returns:
         Duplicate analysis results
     """
-    detector = DuplicateDetector(check_full_row, key_columns)
+    detector = DuplicateDetector(check_full_row, key_columns, subset)
     return detector.analyze(df)
\ No newline at end of file
@@ -0,0 +1,55 @@
+"""
+Frame Cache for Neural Watch
+Phase 2: Data Quality Checks
+Shares values derived from one DataFrame across quality-check calls
+"""
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, Hashable
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class FrameCache:
+    """
+    Single-slot cache of values computed from one DataFrame
+    
+    DataFrames are unhashable, so the cached frame is tracked by a weak
+    reference (plus its shape) rather than used as a dictionary key. A
+    different frame replaces the slot. In-place edits that keep the shape
+    are not detected, so callers must not mutate a frame between calls.
+    """
+    
+    def __init__(self):
+        """Initialize an empty cache"""
+        self._lock = threading.Lock()
+        self._frame_ref = None
+        self._shape = None
+        self._values = {}
+    
+    def get(self, df: pd.DataFrame, key: Hashable, compute: Callable[[pd.DataFrame], Any]) -> Any:
+        """
+        Return the cached value for (df, key), computing it on first use
+        
+        Args:
+            df: DataFrame the value is derived from
+            key: Name of the derived value
+            compute: Function computing the value from df
+            
+        Returns:
+            Cached or freshly computed value
+        """
+        # Held while computing so concurrent callers wait for one computation
+        with self._lock:
+            if self._frame_ref is None or self._frame_ref() is not df or self._shape != df.shape:
+                self._frame_ref = weakref.ref(df)
+                self._shape = df.shape
+                self._values = {}
+            
+            if key not in self._values:
+                self._values[key] = compute(df)
+            
+            return self._values[key]
@@ -5,15 +5,32 @@ Detects and analyzes missing values in datasets
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
-from pathlib import Path
-import sys
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
-sys.path.append(str(Path(__file__).resolve().parent.parent.parent.parent))
+from backend.app.core.quality._stats import skew_from_moments
+from backend.app.core.quality.frame_cache import FrameCache
 from backend.app.utils.logger import NeuralWatchLogger
 
 logger = NeuralWatchLogger.get_logger("missing_values")
 
+# dtype.kind codes treated as numeric (pandas counts booleans as numeric too)
+NUMERIC_KINDS = frozenset("iufcb")
+
+# dtype.kind codes treated as categorical text (Arrow-backed strings report 'U')
+TEXT_KINDS = frozenset("OSU")
+
+# Frames with more cells than this keep their null mask bit-packed (1 bit per
+# cell instead of 1 byte); packing needs np.bitwise_count (NumPy 2.0+)
+PACKED_MASK_CELL_THRESHOLD = 20_000_000
+PACKED_MASK_BLOCK_COLUMNS = 64  # Columns per isna() block; a multiple of 8 so blocks pack independently
+PACKED_MASK_ROW_TILE = 65_536  # Rows unpacked at a time for column counts
+
+# Recommendation codes returned by _generate_recommendations, in label order
+RECOMMENDATION_LABELS = [
+    "drop_column", "impute_mean", "impute_median", "impute_mode", "forward_fill", "investigate"
+]
+
 
 class MissingValueAnalyzer:
     """Analyze missing values in datasets"""
@@ -28,6 +45,7 @@ class MissingValueAnalyzer:
         """
         self.warn_threshold = warn_threshold
         self.error_threshold = error_threshold
+        self._frame_cache = FrameCache()  # Shares the null mask between analyses of one frame
         logger.info(f"MissingValueAnalyzer initialized | Warn: {warn_threshold}% | Error: {error_threshold}%")
     
     def analyze(self, df: pd.DataFrame) -> Dict:
@@ -43,52 +61,151 @@ class MissingValueAnalyzer:
         logger.info(f"Starting missing value analysis for {len(df)} rows, {len(df.columns)} columns")
         
         # Calculate missing values per column
-        missing_counts = df.isnull().sum()
-        missing_percentages = (missing_counts / len(df) * 100).round(2)
+        missing_counts = pd.Series(self._column_null_counts(df), index=df.columns)
+        
+        # Compute skewness for all affected numeric columns in a single
+        # reduction (instead of a dropna + skew per column)
+        return self._build_result(
+            missing_counts,
+            len(df),
+            df.dtypes,
+            lambda columns: df[columns].skew().astype(float).to_dict()
+        )
+    
+    def analyze_chunks(self, chunks: Iterable[pd.DataFrame]) -> Dict:
+        """
+        Perform missing value analysis over a stream of row chunks
+        
+        Only per-column running totals are kept, so memory is bounded by one
+        chunk (e.g. pd.read_csv(..., chunksize=N)). Chunks are expected to share
+        the first chunk's columns; the first chunk's dtypes are reported.
+        
+        Args:
+            chunks: Iterable of DataFrames holding consecutive rows
+            
+        Returns:
+            Dictionary with missing value analysis results (same shape as analyze)
+        """
+        missing_counts = None
+        dtypes = pd.Series(dtype=object)
+        total_rows = 0
+        moments = {}  # column -> (count, mean, M2, M3) of the non-null values
+        
+        for chunk in chunks:
+            if missing_counts is None:
+                missing_counts = pd.Series(0, index=chunk.columns, dtype=np.int64)
+                dtypes = chunk.dtypes
+            
+            total_rows += len(chunk)
+            missing_counts += chunk.isna().sum().reindex(missing_counts.index, fill_value=0)
+            
+            numeric_columns = [col for col in chunk.columns if chunk[col].dtype.kind in NUMERIC_KINDS]
+            if numeric_columns and len(chunk):
+                for col, chunk_moments in zip(numeric_columns, self._chunk_moments(chunk[numeric_columns])):
+                    moments[col] = self._merge_moments(moments.get(col), chunk_moments)
+        
+        if missing_counts is None:
+            missing_counts = pd.Series(dtype=np.int64)
+        
+        logger.info(f"Chunked missing value analysis over {total_rows} rows, {len(missing_counts)} columns")
+        
+        return self._build_result(
+            missing_counts,
+            total_rows,
+            dtypes,
+            lambda columns: {col: self._skew_from_moments(moments.get(col)) for col in columns}
+        )
+    
+    def _build_result(
+        self,
+        missing_counts: pd.Series,
+        total_rows: int,
+        dtypes: pd.Series,
+        compute_skew: Callable[[List[str]], Dict]
+    ) -> Dict:
+        """
+        Assemble the analysis result from per-column missing counts
+        
+        Args:
+            missing_counts: Missing count per column
+            total_rows: Number of rows analyzed
+            dtypes: dtype per column
+            compute_skew: Maps a list of numeric columns to {column: skewness}
+            
+        Returns:
+            Dictionary with missing value analysis results
+        """
+        missing_percentages = (missing_counts / total_rows * 100).round(2)
         
         # Total missing values
         total_missing = int(missing_counts.sum())
-        total_cells = len(df) * len(df.columns)
+        total_cells = total_rows * len(missing_counts)
         overall_missing_percentage = round((total_missing / total_cells * 100), 2) if total_cells > 0 else 0
         
-        # Columns with missing values
-        columns_with_missing = missing_counts[missing_counts > 0].index.tolist()
+        # Columns with missing values (kept as an Index until the result is built)
+        has_missing = missing_counts.to_numpy() > 0
+        columns_with_missing = missing_counts.index[has_missing]
+        
+        # Classify dtypes once (by kind code) and skew only the numeric columns
+        # that will get an imputation recommendation
+        kind_map = {col: dtypes[col].kind for col in columns_with_missing}
+        numeric_columns = [
+            col for col in columns_with_missing
+            if kind_map[col] in NUMERIC_KINDS
+            and missing_percentages[col] < self.error_threshold
+        ]
+        skew_map = compute_skew(numeric_columns) if numeric_columns else {}
+        
+        # Determine severity for all affected columns at once
+        affected_counts = missing_counts.to_numpy()[has_missing].tolist()
+        affected_percentages = missing_percentages.to_numpy()[has_missing]
+        severities = np.select(
+            [affected_percentages >= self.error_threshold, affected_percentages >= self.warn_threshold],
+            ["high", "medium"],
+            default="low"
+        ).tolist()
+        
+        # Order by percentage (descending, ties keep column order) before
+        # building any per-column dicts
+        order = np.argsort(-affected_percentages, kind='stable')
+        affected_columns = columns_with_missing[order].tolist()
+        affected_counts = [affected_counts[i] for i in order]
+        severities = [severities[i] for i in order]
+        affected_percentages = affected_percentages[order]
+        
+        # Classify every affected column in one vectorised pass (no skewness
+        # when the column is entirely missing)
+        has_skew = np.array(
+            [column in skew_map and count < total_rows for column, count in zip(affected_columns, affected_counts)],
+            dtype=bool
+        )
+        recommendations = self._generate_recommendations(
+            np.array([kind_map[column] for column in affected_columns], dtype='U1'),
+            affected_percentages,
+            np.array([skew_map.get(column, np.nan) for column in affected_columns], dtype=np.float64),
+            has_skew
+        )
         
         # Detailed analysis per column
         details = []
-        for column in columns_with_missing:
-            count = int(missing_counts[column])
-            percentage = float(missing_percentages[column])
-            
-            # Determine severity
-            if percentage >= self.error_threshold:
-                severity = "high"
-            elif percentage >= self.warn_threshold:
-                severity = "medium"
-            else:
-                severity = "low"
-            
-            # Generate recommendation
-            recommendation = self._generate_recommendation(df, column, percentage)
-            
+        for column, count, percentage, severity, recommendation in zip(
+            affected_columns, affected_counts, affected_percentages.tolist(), severities, recommendations
+        ):
             details.append({
                 "column": column,
                 "missing_count": count,
                 "missing_percentage": percentage,
                 "severity": severity,
-                "data_type": str(df[column].dtype),
+                "data_type": str(dtypes[column]),
                 "recommendation": recommendation
             })
         
-        # Sort by percentage (descending)
-        details.sort(key=lambda x: x['missing_percentage'], reverse=True)
-        
         result = {
             "total_missing": total_missing,
             "total_cells": total_cells,
             "overall_missing_percentage": overall_missing_percentage,
             "columns_affected": len(columns_with_missing),
-            "columns_with_missing": columns_with_missing,
+            "columns_with_missing": columns_with_missing.tolist(),
             "details": details,
             "summary": self._generate_summary(details)
         }
@@ -96,49 +213,210 @@ class MissingValueAnalyzer:
         logger.info(f"Missing value analysis complete: {total_missing} missing ({overall_missing_percentage}%)")
         return result
     
-    def _generate_recommendation(self, df: pd.DataFrame, column: str, percentage: float) -> str:
+    @staticmethod
+    def _chunk_moments(numeric: pd.DataFrame) -> List[Tuple[int, float, float, float]]:
+        """
+        Compute count, mean and central moment sums of each column's non-null values
+        
+        Args:
+            numeric: Numeric columns of one chunk
+            
+        Returns:
+            List of (count, mean, M2, M3), one per column
+        """
+        values = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+        counts = np.count_nonzero(~np.isnan(values), axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.nansum(values, axis=0) / counts
+            adjusted = values - means
+            m2 = np.nansum(adjusted ** 2, axis=0)
+            m3 = np.nansum(adjusted ** 3, axis=0)
+        return list(zip(counts.tolist(), means.tolist(), m2.tolist(), m3.tolist()))
+    
+    @staticmethod
+    def _merge_moments(
+        left: Optional[Tuple[int, float, float, float]],
+        right: Tuple[int, float, float, float]
+    ) -> Tuple[int, float, float, float]:
         """
-        Generate recommendation for handling missing values
+        Combine two (count, mean, M2, M3) summaries (Chan et al. pairwise update)
+        
+        Args:
+            left: Running summary (None before the first chunk)
+            right: Summary of the next chunk
+            
+        Returns:
+            Combined summary
+        """
+        if left is None or left[0] == 0:
+            return right
+        if right[0] == 0:
+            return left
+        
+        n_a, mean_a, m2_a, m3_a = left
+        n_b, mean_b, m2_b, m3_b = right
+        n = n_a + n_b
+        delta = mean_b - mean_a
+        
+        mean = mean_a + delta * n_b / n
+        m2 = m2_a + m2_b + delta ** 2 * n_a * n_b / n
+        m3 = (
+            m3_a + m3_b
+            + delta ** 3 * n_a * n_b * (n_a - n_b) / n ** 2
+            + 3 * delta * (n_a * m2_b - n_b * m2_a) / n
+        )
+        return n, mean, m2, m3
+    
+    @staticmethod
+    def _skew_from_moments(summary: Optional[Tuple[int, float, float, float]]) -> float:
+        """
+        Unbiased skewness from a moment summary, as computed by Series.skew
+        
+        Args:
+            summary: (count, mean, M2, M3), or None if no values were seen
+            
+        Returns:
+            Skewness (NaN for fewer than 3 values)
+        """
+        if summary is None:
+            return float('nan')
+        
+        n, _, m2, m3 = summary
+        return float(skew_from_moments(n, m2, m3))
+    
+    def _null_mask(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Get the 2-D null mask used by the row and column reductions
+        
+        The mask is built once per frame and shared by analyze() and
+        get_missing_patterns().
+        
+        Args:
+            df: DataFrame
+            
+        Returns:
+            Boolean array (True = missing), shape (rows, columns), or for
+            large frames a uint8 array of bits packed along the columns
+        """
+        return self._frame_cache.get(df, "null_mask", self._build_null_mask)
+    
+    def _column_null_counts(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Count missing values per column
         
         Args:
             df: DataFrame
-            column: Column name
-            percentage: Missing percentage
             
         Returns:
-            Recommendation string
+            Missing count per column
+        """
+        mask = self._null_mask(df)
+        if mask.dtype == bool:
+            return np.count_nonzero(mask, axis=0)
+        
+        # Unpack in row tiles so only a slice of the dense mask exists at once
+        n_columns = len(df.columns)
+        counts = np.zeros(n_columns, dtype=np.int64)
+        for start in range(0, len(mask), PACKED_MASK_ROW_TILE):
+            tile = np.unpackbits(mask[start:start + PACKED_MASK_ROW_TILE], axis=1, count=n_columns)
+            counts += tile.sum(axis=0, dtype=np.int64)
+        return counts
+    
+    def _row_null_counts(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Count missing values per row
+        
+        Args:
+            df: DataFrame
+            
+        Returns:
+            Missing count per row
+        """
+        mask = self._null_mask(df)
+        if mask.dtype == bool:
+            return mask.sum(axis=1, dtype=np.int32)
+        
+        # Popcount each packed byte; the zero padding bits add nothing
+        return np.bitwise_count(mask).sum(axis=1, dtype=np.int32)
+    
+    def _build_null_mask(self, df: pd.DataFrame) -> np.ndarray:
         """
-        dtype = df[column].dtype
+        Build the 2-D null mask
         
-        # High missing percentage - consider dropping
-        if percentage >= self.error_threshold:
-            return "drop_column"
+        NumPy reduces C- and F-ordered arrays in memory order, so only a
+        strided (non-contiguous) mask is copied before reducing.
         
-        # Numeric columns
-        if pd.api.types.is_numeric_dtype(dtype):
-            # Check skewness
-            non_null_values = df[column].dropna()
-            if len(non_null_values) > 0:
-                skewness = non_null_values.skew()
-                if abs(skewness) > 1:
-                    return "impute_median"
-                else:
-                    return "impute_mean"
-            return "impute_median"
+        Args:
+            df: DataFrame
+            
+        Returns:
+            Boolean array (True = missing), shape (rows, columns)
+        """
+        if df.size > PACKED_MASK_CELL_THRESHOLD and hasattr(np, "bitwise_count"):
+            return self._build_packed_null_mask(df)
         
-        # Categorical columns
-        elif pd.api.types.is_object_dtype(dtype) or pd.api.types.is_categorical_dtype(dtype):
-            return "impute_mode"
+        mask = df.isna().to_numpy()
+        if not (mask.flags.c_contiguous or mask.flags.f_contiguous):
+            logger.debug(f"Null mask for {df.shape} frame is not contiguous; copying once")
+            mask = np.ascontiguousarray(mask)
+        return mask
+    
+    def _build_packed_null_mask(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Build the null mask bit-packed along the columns
+        
+        Column blocks are checked and packed one at a time, so the dense
+        boolean mask of the whole frame is never materialised.
         
-        # Boolean columns
-        elif pd.api.types.is_bool_dtype(dtype):
-            return "impute_mode"
+        Args:
+            df: DataFrame
+            
+        Returns:
+            uint8 array, shape (rows, ceil(columns / 8))
+        """
+        logger.debug(f"Packing null mask for {df.shape} frame")
+        blocks = [
+            np.packbits(df.iloc[:, start:start + PACKED_MASK_BLOCK_COLUMNS].isna().to_numpy(), axis=1)
+            for start in range(0, len(df.columns), PACKED_MASK_BLOCK_COLUMNS)
+        ]
+        return np.hstack(blocks)
+    
+    def _generate_recommendations(
+        self,
+        kinds: np.ndarray,
+        percentages: np.ndarray,
+        skews: np.ndarray,
+        has_skew: np.ndarray
+    ) -> List[str]:
+        """
+        Generate recommendations for handling missing values, one per column
         
-        # Datetime columns
-        elif pd.api.types.is_datetime64_any_dtype(dtype):
-            return "forward_fill"
+        Args:
+            kinds: Column dtype kind codes (dtype.kind)
+            percentages: Missing percentages
+            skews: Skewness of the non-null values (ignored where has_skew is False)
+            has_skew: Whether a skewness was computed (numeric columns, not all missing)
+            
+        Returns:
+            Recommendation strings
+        """
+        numeric = np.isin(kinds, list(NUMERIC_KINDS))
+        # NaN skewness (too few values) compares False, so it imputes the mean
+        with np.errstate(invalid='ignore'):
+            symmetric = has_skew & ~(np.abs(skews) > 1)
         
-        return "investigate"
+        codes = np.select(
+            [
+                percentages >= self.error_threshold,  # High missing percentage - consider dropping
+                numeric & symmetric,
+                numeric,                              # Skewed, or no skewness available
+                np.isin(kinds, list(TEXT_KINDS)),     # Categorical (object, string and category dtypes)
+                kinds == 'M'                          # Datetime
+            ],
+            [0, 1, 2, 3, 4],
+            default=5
+        )
+        return [RECOMMENDATION_LABELS[code] for code in codes.tolist()]
     
     def _generate_summary(self, details: List[Dict]) -> Dict:
         """
@@ -159,9 +437,10 @@ class MissingValueAnalyzer:
                 "worst_percentage": 0
             }
         
-        high_count = sum(1 for d in details if d['severity'] == 'high')
-        medium_count = sum(1 for d in details if d['severity'] == 'medium')
-        low_count = sum(1 for d in details if d['severity'] == 'low')
+        severity_counts = Counter(d['severity'] for d in details)
+        high_count = severity_counts['high']
+        medium_count = severity_counts['medium']
+        low_count = severity_counts['low']
         
         worst = details[0]  # Already sorted by percentage
         
@@ -183,26 +462,38 @@ class MissingValueAnalyzer:
         Returns:
             Dictionary with pattern analysis
         """
-        # Count missing values per row
-        missing_per_row = df.isnull().sum(axis=1)
+        # Nothing to count on an empty frame (and max/mean would be NaN)
+        if len(df) == 0:
+            return {
+                "rows_with_missing": 0,
+                "rows_with_missing_percentage": 0,
+                "rows_with_multiple_missing": 0,
+                "completely_empty_rows": 0,
+                "max_missing_per_row": 0,
+                "avg_missing_per_row": 0
+            }
+        
+        # Count missing values per row (one reduction over the cached mask)
+        missing_per_row = self._row_null_counts(df)
         
         # Rows with at least one missing value
-        rows_with_missing = (missing_per_row > 0).sum()
+        rows_with_missing = int(np.count_nonzero(missing_per_row))
         rows_with_missing_pct = round((rows_with_missing / len(df) * 100), 2)
         
         # Rows with multiple missing values
-        rows_with_multiple = (missing_per_row > 1).sum()
+        rows_with_multiple = int(np.count_nonzero(missing_per_row > 1))
         
         # Completely empty rows
-        completely_empty = (missing_per_row == len(df.columns)).sum()
+        completely_empty = int(np.count_nonzero(missing_per_row == len(df.columns)))
         
         return {
-            "rows_with_missing": int(rows_with_missing),
+            "rows_with_missing": rows_with_missing,
             "rows_with_missing_percentage": rows_with_missing_pct,
-            "rows_with_multiple_missing": int(rows_with_multiple),
-            "completely_empty_rows": int(completely_empty),
+            "rows_with_multiple_missing": rows_with_multiple,
+            "completely_empty_rows": completely_empty,
             "max_missing_per_row": int(missing_per_row.max()),
-            "avg_missing_per_row": round(missing_per_row.mean(), 2)
+            # np.float64's round (not Python's), as before the row counts were an array
+            "avg_missing_per_row": float(round(missing_per_row.mean(), 2))
         }
     
     def visualize_heatmap_data(self, df: pd.DataFrame, sample_size: int = 100) -> Dict:
@@ -216,19 +507,28 @@ class MissingValueAnalyzer:
         Returns:
             Dictionary with heatmap data
         """
-        # Sample data if too large
+        if len(df) == 0:
+            return {
+                "rows": 0,
+                "columns": df.columns.tolist(),
+                "matrix": [],
+                "row_indices": []
+            }
+        
+        # Sample row positions if too large (avoids copying the whole frame)
         if len(df) > sample_size:
-            df_sample = df.sample(n=sample_size, random_state=42)
+            rng = np.random.default_rng(42)
+            df_sample = df.iloc[rng.choice(len(df), size=sample_size, replace=False)]
         else:
             df_sample = df
         
         # Create binary missing matrix (1 = missing, 0 = present)
-        missing_matrix = df_sample.isnull().astype(int)
+        missing_matrix = df_sample.isna().to_numpy().astype(np.uint8)
         
         return {
             "rows": len(df_sample),
             "columns": df_sample.columns.tolist(),
-            "matrix": missing_matrix.values.tolist(),
+            "matrix": missing_matrix.tolist(),
             "row_indices": df_sample.index.tolist()
         }
 
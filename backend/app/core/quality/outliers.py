@@ -3,17 +3,70 @@ Outlier Detector for Neural Watch
 Phase 2: Data Quality Checks
 Detects outliers using IQR, Z-Score, and Isolation Forest methods
 """
+import os
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Tuple
-from pathlib import Path
-import sys
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import Dict, List, Optional, Tuple, Union
 
-sys.path.append(str(Path(__file__).resolve().parent.parent.parent.parent))
+from backend.app.core.quality._outlier_kernels import NUMBA_AVAILABLE, count_outliers
+from backend.app.core.quality._stats import skew_from_moments
+from backend.app.core.quality.frame_cache import FrameCache
 from backend.app.utils.logger import NeuralWatchLogger
 
 logger = NeuralWatchLogger.get_logger("outliers")
 
+# Isolation Forest pre-screen: frames with at least this many clean rows only
+# score the rows farthest from their k nearest neighbours (needs hnswlib)
+ISOLATION_FOREST_PRESCREEN_ROWS = 200_000
+ISOLATION_FOREST_PRESCREEN_FRACTION = 0.3  # Share of rows kept as candidates
+ISOLATION_FOREST_PRESCREEN_K = 10
+
+# Isolation Forest frames larger than this are fitted on a row sample
+ISOLATION_FOREST_FIT_ROWS = 100_000
+
+# Per-column analysis runs in a thread pool once there is enough work to
+# outweigh the pool start-up
+PARALLEL_COLUMN_THRESHOLD = 2
+PARALLEL_ROW_THRESHOLD = 50_000
+
+
+def _partition_quantiles(values: np.ndarray, quantiles: List[float]) -> List[float]:
+    """
+    Linear-interpolated quantiles of a 1-D array via one np.partition call
+    
+    Only the order statistics around each quantile are placed (O(n)); the
+    result matches np.quantile's default 'linear' method exactly.
+    
+    Args:
+        values: Non-null values
+        quantiles: Quantiles in [0, 1]
+        
+    Returns:
+        One value per quantile (NaN if values is empty)
+    """
+    n = len(values)
+    if n == 0:
+        return [float('nan')] * len(quantiles)
+    
+    positions = [(n - 1) * q for q in quantiles]
+    lows = [int(np.floor(pos)) for pos in positions]
+    highs = [min(low + 1, n - 1) for low in lows]
+    part = np.partition(values, np.unique(lows + highs))
+    
+    result = []
+    for pos, low, high in zip(positions, lows, highs):
+        below, above = part[low], part[high]
+        gamma = pos - low
+        diff = above - below
+        # NumPy's lerp: interpolate from the nearer end for stability
+        result.append(float(above - diff * (1 - gamma) if gamma >= 0.5 else below + diff * gamma))
+    return result
+
 
 class OutlierDetector:
     """Detect outliers in numerical columns using multiple methods"""
@@ -33,15 +86,19 @@ class OutlierDetector:
         self.iqr_multiplier = iqr_multiplier
         self.z_score_threshold = z_score_threshold
         self.use_isolation_forest = use_isolation_forest
+        self._frame_cache = FrameCache()  # Numeric column list of the last analyzed frame
         
         logger.info(f"OutlierDetector initialized | Method: {method} | IQR: {iqr_multiplier} | Z: {z_score_threshold}")
     
-    def analyze(self, df: pd.DataFrame) -> Dict:
+    def analyze(self, df: Union[pd.DataFrame, pa.Table], dtype=np.float64) -> Dict:
         """
         Perform comprehensive outlier analysis
         
         Args:
-            df: DataFrame to analyze
+            df: DataFrame to analyze (or a pyarrow Table, read column by column
+                without converting the whole table to pandas)
+            dtype: Float dtype of the scan (np.float32 halves the memory moved;
+                falls back to float64 if a column does not fit float32)
             
         Returns:
             Dictionary with outlier analysis results
@@ -49,7 +106,15 @@ class OutlierDetector:
         logger.info(f"Starting outlier analysis for {len(df)} rows")
         
         # Get numerical columns only
-        numeric_columns = df.select_dtypes(include=[np.number]).columns.tolist()
+        if isinstance(df, pa.Table):
+            numeric_columns = [
+                field.name for field in df.schema
+                if pa.types.is_integer(field.type) or pa.types.is_floating(field.type)
+            ]
+        else:
+            numeric_columns = self._frame_cache.get(
+                df, "numeric_columns", lambda frame: frame.select_dtypes(include=[np.number]).columns.tolist()
+            )
         
         if not numeric_columns:
             logger.warning("No numerical columns found for outlier detection")
@@ -63,14 +128,60 @@ class OutlierDetector:
         
         logger.info(f"Analyzing {len(numeric_columns)} numerical columns")
         
-        details = []
-        total_outliers = 0
-        
-        for column in numeric_columns:
-            column_analysis = self._analyze_column(df, column)
-            if column_analysis:
-                details.append(column_analysis)
-                total_outliers += column_analysis['outlier_count']
+        # Compute every column's summary statistics in a few vectorised passes
+        # over one float matrix instead of separate pandas reductions per column
+        if isinstance(df, pa.Table):
+            values = self._arrow_numeric_matrix(df, numeric_columns, dtype)
+        else:
+            values = self._numeric_matrix(df[numeric_columns], dtype)
+        missing = np.isnan(values)
+        column_stats = self._column_statistics(values, missing)
+        column_skews = column_stats.pop('skew')  # Feeds recommendations, not the reported statistics
+        value_counts = column_stats.pop('count')  # Non-null values per column
+        
+        # With Numba, count outliers for all columns in parallel first so
+        # clean columns skip building masks altogether
+        compiled_counts = self._count_outliers_compiled(values, column_stats) if NUMBA_AVAILABLE else None
+        
+        # Z-score test for the whole matrix in one broadcast pass
+        zscore_masks = None
+        if self.method in ['z_score', 'both']:
+            zscore_masks = self._zscore_mask_matrix(values, column_stats['mean'], column_stats['std'])
+        
+        def detect_column(j: int) -> Tuple[int, np.ndarray]:
+            if value_counts[j] == 0 or (compiled_counts is not None and compiled_counts[j] == 0):
+                # Nothing to mask or sample
+                return 0, np.empty(0)
+            return self._detect_column_outliers(
+                values[~missing[:, j], j],
+                column_stats['q1'][j],
+                column_stats['q3'][j],
+                column_stats['mean'][j],
+                column_stats['std'][j],
+                zscore_mask=zscore_masks[~missing[:, j], j] if zscore_masks is not None else None
+            )
+        
+        # Columns are independent and the masking/sampling kernels are NumPy
+        # calls that release the GIL, so columns are analyzed in worker threads
+        # (map keeps the results in column order)
+        column_indices = range(len(numeric_columns))
+        if len(numeric_columns) >= PARALLEL_COLUMN_THRESHOLD and len(df) >= PARALLEL_ROW_THRESHOLD:
+            with ThreadPoolExecutor(max_workers=min(len(numeric_columns), os.cpu_count() or 1)) as executor:
+                detections = list(executor.map(detect_column, column_indices))
+        else:
+            detections = [detect_column(j) for j in column_indices]
+        
+        # Per-column results stay parallel arrays; dicts are only built for the response
+        outlier_counts = np.array([count for count, _ in detections], dtype=np.int64)
+        details = self._build_details(
+            numeric_columns,
+            value_counts,
+            outlier_counts,
+            [sample for _, sample in detections],
+            column_stats,
+            column_skews
+        )
+        total_outliers = int(outlier_counts.sum())
         
         # Calculate overall statistics
         total_values = len(df) * len(numeric_columns)
@@ -90,150 +201,387 @@ class OutlierDetector:
         
         # Multivariate outlier detection (optional)
         if self.use_isolation_forest and len(numeric_columns) > 1:
-            result['multivariate'] = self._isolation_forest_detection(df[numeric_columns])
+            df_numeric = (
+                pd.DataFrame(values, columns=numeric_columns) if isinstance(df, pa.Table) else df[numeric_columns]
+            )
+            result['multivariate'] = self._isolation_forest_detection(df_numeric)
         
         logger.info(f"Outlier analysis complete: {total_outliers} outliers ({outlier_percentage}%)")
         return result
     
-    def _analyze_column(self, df: pd.DataFrame, column: str) -> Optional[Dict]:
+    @staticmethod
+    def _numeric_matrix(df_numeric: pd.DataFrame, dtype) -> np.ndarray:
         """
-        Analyze outliers in a single column
+        Convert the numeric columns to one float matrix (NaN = missing)
         
         Args:
-            df: DataFrame
-            column: Column name
+            df_numeric: DataFrame with only numerical columns
+            dtype: Requested float dtype (np.float64 or np.float32)
             
         Returns:
-            Column outlier analysis or None if no data
+            Float matrix, one column per numeric column
         """
-        data = df[column].dropna()
+        if np.dtype(dtype) == np.float32:
+            # float32 overflows past ~3.4e38 and stores integers exactly only up to 2**24
+            extremes = df_numeric.abs().max().astype(np.float64)
+            integer_columns = [kind in 'iu' for kind in df_numeric.dtypes.map(lambda d: d.kind)]
+            too_large = np.isfinite(extremes) & (extremes > np.finfo(np.float32).max)
+            inexact = np.array(integer_columns) & (extremes > 2 ** 24)
+            if too_large.any() or inexact.any():
+                logger.info("Numeric values do not fit float32; scanning outliers in float64")
+                dtype = np.float64
+        
+        return df_numeric.to_numpy(dtype=dtype, na_value=np.nan)
+    
+    @staticmethod
+    def _arrow_numeric_matrix(table: pa.Table, numeric_columns: List[str], dtype) -> np.ndarray:
+        """
+        Copy the numeric columns of an Arrow table into one float matrix (NaN = null)
         
-        if len(data) == 0:
-            return None
+        Args:
+            table: pyarrow Table
+            numeric_columns: Integer and floating-point column names
+            dtype: Requested float dtype (np.float64 or np.float32)
+            
+        Returns:
+            Float matrix, one column per numeric column
+        """
+        if np.dtype(dtype) == np.float32:
+            # Same float32 guard as _numeric_matrix, from Arrow's min/max kernel
+            for column in numeric_columns:
+                bounds = pc.min_max(table[column])
+                extreme = max(abs(bounds['min'].as_py() or 0), abs(bounds['max'].as_py() or 0))
+                limit = 2 ** 24 if pa.types.is_integer(table.schema.field(column).type) else np.finfo(np.float32).max
+                if np.isfinite(extreme) and extreme > limit:
+                    logger.info("Numeric values do not fit float32; scanning outliers in float64")
+                    dtype = np.float64
+                    break
+        
+        arrow_type = pa.float32() if np.dtype(dtype) == np.float32 else pa.float64()
+        values = np.empty((table.num_rows, len(numeric_columns)), dtype=dtype, order='F')
+        for j, column in enumerate(numeric_columns):
+            values[:, j] = pc.cast(table[column], arrow_type).to_numpy(zero_copy_only=False)
+        return values
+    
+    @staticmethod
+    def _column_statistics(values: np.ndarray, missing: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Compute per-column summary statistics of a float matrix, ignoring NaN
+        
+        The NaN mask and the mean are computed once and reused by the std
+        and quantile steps (np.nanmean/np.nanstd would each rebuild both).
+        
+        Args:
+            values: Float matrix, one column per numeric column (NaN = missing)
+            missing: np.isnan(values)
+            
+        Returns:
+            Dictionary of statistic name -> array with one value per column
+            (NaN where a column has no values, fewer than 2 for std, or
+            fewer than 3 for skew)
+        """
+        n_rows, n_columns = values.shape
+        if n_rows == 0:
+            # Header-only frame: np.quantile and np.nanmin reject empty axes
+            empty = np.full(n_columns, np.nan)
+            return {
+                'count': np.zeros(n_columns, dtype=np.int64),
+                **{name: empty.copy() for name in ['skew', 'mean', 'median', 'std', 'min', 'max', 'q1', 'q3']}
+            }
+        
+        with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+            # All-NaN columns and single-value std are expected to yield NaN
+            warnings.simplefilter('ignore', RuntimeWarning)
+            
+            # Without NaNs the plain quantile partitions all columns at once;
+            # otherwise each column's non-null values get one partition pass
+            if missing.any():
+                q1, median, q3 = np.array([
+                    _partition_quantiles(column[~column_missing], [0.25, 0.5, 0.75])
+                    for column, column_missing in zip(values.T, missing.T)
+                ]).reshape(-1, 3).T
+            else:
+                q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75], axis=0)
+            
+            # Same steps as np.nanmean / np.nanstd(ddof=1), sharing the zero-filled copy
+            counts = values.shape[0] - np.count_nonzero(missing, axis=0)
+            deviations = np.where(missing, 0.0, values)
+            mean = deviations.sum(axis=0) / counts
+            np.subtract(deviations, mean, out=deviations)
+            deviations[missing] = 0.0
+            squared = deviations * deviations
+            m2 = squared.sum(axis=0)
+            std = np.sqrt(m2 / (counts - 1))
+            std[counts < 2] = np.nan
+            
+            # Third moment from the same deviations, for the skewness check
+            m3 = np.multiply(squared, deviations, out=deviations).sum(axis=0)
+            
+            return {
+                'count': counts,
+                'skew': skew_from_moments(counts, m2, m3),
+                'mean': mean,
+                'median': median,
+                'std': std,
+                'min': np.nanmin(values, axis=0),
+                'max': np.nanmax(values, axis=0),
+                'q1': q1,
+                'q3': q3
+            }
+    
+    def _zscore_mask_matrix(self, values: np.ndarray, mean: np.ndarray, std: np.ndarray) -> np.ndarray:
+        """
+        Flag z-score outliers in every column of a float matrix at once
+        
+        Args:
+            values: Float matrix, one column per numeric column (NaN = missing)
+            mean: Mean per column
+            std: Sample standard deviation per column
+            
+        Returns:
+            Boolean matrix (NaN and zero-std columns are never flagged)
+        """
+        zero_std = std == 0
+        with np.errstate(invalid='ignore'):
+            z_scores = values - mean
+            np.divide(z_scores, np.where(zero_std, 1.0, std), out=z_scores)
+            np.abs(z_scores, out=z_scores)
+            outlier_mask = z_scores > self.z_score_threshold
+        outlier_mask[:, zero_std] = False
+        return outlier_mask
+    
+    def _count_outliers_compiled(self, values: np.ndarray, column_stats: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Count outliers of every column with the compiled kernel
+        
+        Args:
+            values: Float matrix, one column per numeric column (NaN = missing)
+            column_stats: Result of _column_statistics
+            
+        Returns:
+            Outlier count per column (same rule as _detect_column_outliers)
+        """
+        lower, upper = self._iqr_bounds(column_stats['q1'], column_stats['q3'])
+        counts = np.zeros(values.shape[1], dtype=np.int64)
+        count_outliers(
+            values, lower, upper, column_stats['mean'], column_stats['std'],
+            self.z_score_threshold, self.method in ['iqr', 'both'], self.method in ['z_score', 'both'],
+            counts
+        )
+        return counts
+    
+    def _build_details(
+        self,
+        columns: List[str],
+        value_counts: np.ndarray,
+        outlier_counts: np.ndarray,
+        samples: List[np.ndarray],
+        column_stats: Dict[str, np.ndarray],
+        skews: np.ndarray
+    ) -> List[Dict]:
+        """
+        Build the per-column detail dicts from the per-column result arrays
+        
+        Percentages, bounds, severities and recommendations are computed for
+        all columns at once; columns without values are left out.
+        
+        Args:
+            columns: Numeric column names
+            value_counts: Non-null values per column
+            outlier_counts: Outliers per column
+            samples: Sample outlier values per column
+            column_stats: Reported statistics, one array per statistic
+            skews: Skewness per column
+            
+        Returns:
+            List of column outlier analyses, in column order
+        """
+        # Python's round (correctly rounded decimal) per element: np.round scales
+        # by 100 first and can land on the other side of a .5 tie
+        with np.errstate(invalid='ignore', divide='ignore'):
+            percentages = np.array([round(p, 2) for p in (outlier_counts / value_counts * 100).tolist()])
+        
+        if self.method in ['iqr', 'both']:
+            lower_bounds, upper_bounds = self._iqr_bounds(column_stats['q1'], column_stats['q3'])
+            lower_bounds, upper_bounds = lower_bounds.tolist(), upper_bounds.tolist()
+        else:
+            lower_bounds = upper_bounds = [None] * len(columns)
         
+        recommendations = self._generate_recommendations(percentages, skews)
+        severities = self._get_severities(percentages)
+        
+        # Box each array once instead of once per element
+        value_counts = value_counts.tolist()
+        outlier_counts = outlier_counts.tolist()
+        percentages = percentages.tolist()
+        stats = {name: stat.tolist() for name, stat in column_stats.items()}
+        
+        details = []
+        for j, column in enumerate(columns):
+            if value_counts[j] == 0:
+                continue
+            details.append({
+                "column": column,
+                "method": self.method,
+                "outlier_count": outlier_counts[j],
+                "total_values": value_counts[j],
+                "outlier_percentage": percentages[j],
+                "lower_bound": lower_bounds[j],
+                "upper_bound": upper_bounds[j],
+                "sample_outliers": samples[j].tolist(),  # The only per-column boxing: at most 10 floats
+                "statistics": {name: stat[j] for name, stat in stats.items()},
+                "recommendation": recommendations[j],
+                "severity": severities[j]
+            })
+        return details
+    
+    def _detect_column_outliers(
+        self,
+        data: np.ndarray,
+        Q1: float,
+        Q3: float,
+        mean: float,
+        std: float,
+        zscore_mask: Optional[np.ndarray] = None
+    ) -> Tuple[int, np.ndarray]:
+        """
+        Apply the configured method(s) to one column
+        
+        Args:
+            data: Non-null values of the column
+            Q1: First quartile of data
+            Q3: Third quartile of data
+            mean: Mean of data
+            std: Sample standard deviation of data
+            zscore_mask: Precomputed z-score outlier mask over data (optional)
+            
+        Returns:
+            Tuple of (outlier count, sample outliers)
+        """
         # IQR Method
         iqr_outliers = None
         if self.method in ['iqr', 'both']:
-            iqr_outliers = self._detect_iqr_outliers(data)
+            iqr_outliers = self._detect_iqr_outliers(data, Q1, Q3)
         
         # Z-Score Method
         zscore_outliers = None
         if self.method in ['z_score', 'both']:
-            zscore_outliers = self._detect_zscore_outliers(data)
+            if zscore_mask is not None:
+                zscore_outliers = {'mask': zscore_mask, 'count': np.count_nonzero(zscore_mask)}
+            else:
+                zscore_outliers = self._detect_zscore_outliers(data, mean, std)
         
         # Combine results based on method
         if self.method == 'both':
-            # Union of both methods
-            outlier_mask = iqr_outliers['mask'] | zscore_outliers['mask']
-            outlier_count = outlier_mask.sum()
-            outlier_values = data[outlier_mask].tolist()
-            lower_bound = iqr_outliers['lower_bound']
-            upper_bound = iqr_outliers['upper_bound']
+            if zscore_outliers['count']:
+                # Union of both methods (in place on the IQR mask)
+                outlier_mask = np.logical_or(iqr_outliers['mask'], zscore_outliers['mask'], out=iqr_outliers['mask'])
+                outlier_count = np.count_nonzero(outlier_mask)
+            else:
+                # No z-score outliers (e.g. zero std): the IQR result stands as is
+                outlier_mask = iqr_outliers['mask']
+                outlier_count = iqr_outliers['count']
         elif self.method == 'iqr':
             outlier_mask = iqr_outliers['mask']
             outlier_count = iqr_outliers['count']
-            outlier_values = iqr_outliers['values']
-            lower_bound = iqr_outliers['lower_bound']
-            upper_bound = iqr_outliers['upper_bound']
         else:  # z_score
             outlier_mask = zscore_outliers['mask']
             outlier_count = zscore_outliers['count']
-            outlier_values = zscore_outliers['values']
-            lower_bound = None
-            upper_bound = None
-        
-        outlier_percentage = round((outlier_count / len(data) * 100), 2)
-        
-        # Sample outliers (max 10)
-        sample_outliers = sorted(outlier_values)[:5] + sorted(outlier_values, reverse=True)[:5]
-        sample_outliers = list(set(sample_outliers))[:10]
-        
-        # Statistics
-        stats = {
-            'mean': float(data.mean()),
-            'median': float(data.median()),
-            'std': float(data.std()),
-            'min': float(data.min()),
-            'max': float(data.max()),
-            'q1': float(data.quantile(0.25)),
-            'q3': float(data.quantile(0.75))
-        }
         
-        # Generate recommendation
-        recommendation = self._generate_recommendation(outlier_percentage, data)
+        # Sample outliers (max 10), gathered from the outlier values only once
+        sample_outliers = self._sample_outliers(data[outlier_mask]) if outlier_count else np.empty(0)
         
-        return {
-            "column": column,
-            "method": self.method,
-            "outlier_count": int(outlier_count),
-            "total_values": len(data),
-            "outlier_percentage": outlier_percentage,
-            "lower_bound": float(lower_bound) if lower_bound is not None else None,
-            "upper_bound": float(upper_bound) if upper_bound is not None else None,
-            "sample_outliers": [float(x) for x in sample_outliers],
-            "statistics": stats,
-            "recommendation": recommendation,
-            "severity": self._get_severity(outlier_percentage)
-        }
+        return outlier_count, sample_outliers
     
-    def _detect_iqr_outliers(self, data: pd.Series) -> Dict:
+    def _iqr_bounds(self, Q1, Q3) -> Tuple:
         """
-        Detect outliers using IQR method
+        Compute the IQR fences (works on scalars or per-column arrays)
         
         Args:
-            data: Series of numerical data
+            Q1: First quartile(s)
+            Q3: Third quartile(s)
             
         Returns:
-            Dictionary with IQR outlier results
+            Tuple of (lower_bound, upper_bound)
         """
-        Q1 = data.quantile(0.25)
-        Q3 = data.quantile(0.75)
         IQR = Q3 - Q1
+        return Q1 - self.iqr_multiplier * IQR, Q3 + self.iqr_multiplier * IQR
+    
+    def _detect_iqr_outliers(self, data: np.ndarray, Q1: float, Q3: float) -> Dict:
+        """
+        Detect outliers using IQR method
         
-        lower_bound = Q1 - self.iqr_multiplier * IQR
-        upper_bound = Q3 + self.iqr_multiplier * IQR
+        Args:
+            data: Non-null numerical values
+            Q1: First quartile of data
+            Q3: Third quartile of data
+            
+        Returns:
+            Dictionary with IQR outlier results
+        """
+        lower_bound, upper_bound = self._iqr_bounds(Q1, Q3)
         
-        outlier_mask = (data < lower_bound) | (data > upper_bound)
-        outliers = data[outlier_mask]
+        outlier_mask = data < lower_bound
+        np.logical_or(outlier_mask, data > upper_bound, out=outlier_mask)
         
         return {
             'mask': outlier_mask,
-            'count': len(outliers),
-            'values': outliers.tolist(),
+            'count': np.count_nonzero(outlier_mask),
             'lower_bound': lower_bound,
             'upper_bound': upper_bound
         }
     
-    def _detect_zscore_outliers(self, data: pd.Series) -> Dict:
+    def _detect_zscore_outliers(self, data: np.ndarray, mean: float, std: float) -> Dict:
         """
         Detect outliers using Z-Score method
         
         Args:
-            data: Series of numerical data
+            data: Non-null numerical values
+            mean: Mean of data
+            std: Sample standard deviation of data
             
         Returns:
             Dictionary with Z-score outlier results
         """
-        mean = data.mean()
-        std = data.std()
-        
         if std == 0:
             return {
-                'mask': pd.Series([False] * len(data), index=data.index),
-                'count': 0,
-                'values': []
+                'mask': np.zeros(len(data), dtype=bool),
+                'count': 0
             }
         
-        z_scores = np.abs((data - mean) / std)
+        # |x - mean| / std, reusing one scratch array
+        z_scores = data - mean
+        np.divide(z_scores, std, out=z_scores)
+        np.abs(z_scores, out=z_scores)
         outlier_mask = z_scores > self.z_score_threshold
-        outliers = data[outlier_mask]
         
         return {
             'mask': outlier_mask,
-            'count': len(outliers),
-            'values': outliers.tolist()
+            'count': np.count_nonzero(outlier_mask)
         }
     
+    @staticmethod
+    def _sample_outliers(outliers: np.ndarray, per_side: int = 5) -> np.ndarray:
+        """
+        Pick the distinct smallest and largest outlier values
+        
+        One np.partition pass places both ends; the outlier set is never sorted.
+        
+        Args:
+            outliers: Outlier values
+            per_side: Number of values to take from each end
+            
+        Returns:
+            Up to 2 * per_side distinct values, ascending
+        """
+        if len(outliers) > 2 * per_side:
+            part = np.partition(outliers, [per_side - 1, len(outliers) - per_side])
+            extremes = np.concatenate([part[:per_side], part[-per_side:]])
+        else:
+            extremes = outliers
+        
+        return np.unique(extremes)
+    
     def _isolation_forest_detection(self, df_numeric: pd.DataFrame) -> Dict:
         """
         Detect multivariate outliers using Isolation Forest
@@ -245,81 +593,170 @@ class OutlierDetector:
             Isolation Forest results
         """
         try:
-            from sklearn.ensemble import IsolationForest
-            
             # Remove rows with any NaN
             df_clean = df_numeric.dropna()
             
             if len(df_clean) < 10:
                 return {"error": "Insufficient data for Isolation Forest"}
             
-            # Fit Isolation Forest
-            iso_forest = IsolationForest(contamination=0.1, random_state=42)
-            predictions = iso_forest.fit_predict(df_clean)
+            outlier_mask, engine = self._isolation_forest_outliers(df_clean, contamination=0.1)
             
-            # -1 indicates outlier, 1 indicates inlier
-            outlier_count = (predictions == -1).sum()
+            outlier_count = np.count_nonzero(outlier_mask)
             outlier_percentage = round((outlier_count / len(df_clean) * 100), 2)
             
             return {
                 "method": "isolation_forest",
+                "engine": engine,
                 "outlier_count": int(outlier_count),
                 "total_rows": len(df_clean),
                 "outlier_percentage": outlier_percentage,
-                "outlier_indices": df_clean[predictions == -1].index.tolist()[:10]  # Sample
+                "outlier_indices": df_clean.index[outlier_mask][:10].tolist()  # Sample
             }
             
         except ImportError:
-            logger.warning("scikit-learn not installed, skipping Isolation Forest")
+            logger.warning("Neither coniferest nor scikit-learn installed, skipping Isolation Forest")
             return {"error": "scikit-learn not installed"}
         except Exception as e:
             logger.error(f"Isolation Forest error: {str(e)}")
             return {"error": str(e)}
     
-    def _generate_recommendation(self, outlier_percentage: float, data: pd.Series) -> str:
+    def _isolation_forest_outliers(self, df_clean: pd.DataFrame, contamination: float) -> Tuple[np.ndarray, str]:
         """
-        Generate recommendation for handling outliers
+        Fit an Isolation Forest and flag the lowest-scoring rows
+        
+        Uses coniferest (vectorised scoring) when installed, otherwise
+        scikit-learn with tree fitting spread over all cores. On large frames
+        an approximate k-NN pre-screen (hnswlib, if installed) limits scoring
+        to the rows farthest from their neighbours; the rest count as inliers.
         
         Args:
-            outlier_percentage: Percentage of outliers
-            data: Original data series
+            df_clean: Numerical rows without NaN
+            contamination: Expected share of outliers
             
         Returns:
-            Recommendation string
-        """
-        if outlier_percentage == 0:
-            return "no_action"
-        elif outlier_percentage < 1:
-            return "investigate"
-        elif outlier_percentage < 5:
-            # Check if data is highly skewed
-            if abs(data.skew()) > 1:
-                return "transform_log"
-            else:
-                return "winsorize"
-        elif outlier_percentage < 10:
-            return "clip_bounds"
+            Tuple of (boolean outlier mask, engine name)
+            
+        Raises:
+            ImportError: If neither coniferest nor scikit-learn is installed
+        """
+        try:
+            from coniferest.isoforest import IsolationForest as ConiferestIsolationForest
+        except ImportError:
+            ConiferestIsolationForest = None
+        
+        if ConiferestIsolationForest is not None:
+            values = df_clean.to_numpy(dtype=np.float32)
+            iso_forest = ConiferestIsolationForest(random_seed=42)
+            engine = "coniferest"
         else:
-            return "investigate_data_quality"
+            from sklearn.ensemble import IsolationForest
+            
+            values = df_clean.to_numpy(dtype=np.float64)
+            # Trees do not depend on contamination; the cut-off is applied below
+            iso_forest = IsolationForest(random_state=42, n_jobs=-1)
+            engine = "sklearn"
+        
+        # Each tree only sees a small subsample (256 rows by default), so on
+        # large frames fit on a fixed-seed row sample instead of validating and
+        # copying the whole matrix; every row is still scored below
+        if len(values) > ISOLATION_FOREST_FIT_ROWS:
+            fit_rows = np.random.default_rng(42).choice(len(values), ISOLATION_FOREST_FIT_ROWS, replace=False)
+            iso_forest.fit(values[np.sort(fit_rows)])
+        else:
+            iso_forest.fit(values)
+        
+        candidates = None
+        if len(values) >= ISOLATION_FOREST_PRESCREEN_ROWS:
+            candidates = self._knn_prescreen(values, ISOLATION_FOREST_PRESCREEN_FRACTION)
+        
+        if candidates is None:
+            scores = iso_forest.score_samples(values)
+            # Same rule as sklearn's contamination offset: lower score = more abnormal
+            return scores < np.percentile(scores, 100 * contamination), engine
+        
+        # Flag the expected number of outliers among the candidates only
+        scores = iso_forest.score_samples(values[candidates])
+        n_outliers = min(int(contamination * len(values)), len(candidates))
+        outlier_mask = np.zeros(len(values), dtype=bool)
+        outlier_mask[candidates[np.argsort(scores, kind='stable')[:n_outliers]]] = True
+        return outlier_mask, f"{engine}+knn_prescreen"
     
-    def _get_severity(self, outlier_percentage: float) -> str:
+    @staticmethod
+    def _knn_prescreen(values: np.ndarray, keep_fraction: float) -> Optional[np.ndarray]:
         """
-        Determine severity level
+        Pick the rows whose k-th nearest neighbour is farthest away
         
         Args:
-            outlier_percentage: Percentage of outliers
+            values: Numerical rows without NaN
+            keep_fraction: Share of rows to keep as outlier candidates
             
         Returns:
-            Severity level
-        """
-        if outlier_percentage == 0:
-            return "none"
-        elif outlier_percentage < 1:
-            return "low"
-        elif outlier_percentage < 5:
-            return "medium"
-        else:
-            return "high"
+            Sorted candidate row positions, or None if hnswlib is not installed
+        """
+        try:
+            import hnswlib
+        except ImportError:
+            return None
+        
+        # Standardise so no single column dominates the distances
+        scale = values.std(axis=0)
+        scale[scale == 0] = 1
+        points = ((values - values.mean(axis=0)) / scale).astype(np.float32)
+        
+        index = hnswlib.Index(space='l2', dim=points.shape[1])
+        index.init_index(max_elements=len(points), ef_construction=100, M=16, random_seed=42)
+        index.add_items(points, num_threads=-1)
+        index.set_ef(max(ISOLATION_FOREST_PRESCREEN_K + 1, 50))
+        
+        # k + 1 because each point finds itself first
+        _, distances = index.knn_query(points, k=ISOLATION_FOREST_PRESCREEN_K + 1, num_threads=-1)
+        kth_distance = distances[:, -1]
+        
+        cutoff = np.percentile(kth_distance, 100 * (1 - keep_fraction))
+        return np.flatnonzero(kth_distance >= cutoff)
+    
+    def _generate_recommendations(self, percentages: np.ndarray, skews: np.ndarray) -> List[str]:
+        """
+        Generate recommendations for handling outliers, one per column
+        
+        Args:
+            percentages: Outlier percentages
+            skews: Skewness per column (NaN if undefined)
+            
+        Returns:
+            Recommendation strings
+        """
+        # NaN skewness compares False, so it is treated as not skewed
+        with np.errstate(invalid='ignore'):
+            skewed = np.abs(skews) > 1
+        
+        return np.select(
+            [
+                percentages == 0,
+                percentages < 1,
+                (percentages < 5) & skewed,  # Highly skewed data
+                percentages < 5,
+                percentages < 10
+            ],
+            ["no_action", "investigate", "transform_log", "winsorize", "clip_bounds"],
+            default="investigate_data_quality"
+        ).tolist()
+    
+    def _get_severities(self, percentages: np.ndarray) -> List[str]:
+        """
+        Determine severity levels, one per column
+        
+        Args:
+            percentages: Outlier percentages
+            
+        Returns:
+            Severity levels
+        """
+        return np.select(
+            [percentages == 0, percentages < 1, percentages < 5],
+            ["none", "low", "medium"],
+            default="high"
+        ).tolist()
     
     def get_outlier_bounds(self, df: pd.DataFrame, column: str) -> Tuple[float, float]:
         """
@@ -332,21 +769,21 @@ class OutlierDetector:
         Returns:
             Tuple of (lower_bound, upper_bound)
         """
-        data = df[column].dropna()
+        # Plain float buffer of the non-null values (no re-indexed Series);
+        # the NaN filter is skipped for columns without missing values
+        data = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        if df[column].hasnans:
+            data = data[~np.isnan(data)]
         
         if self.method == 'iqr' or self.method == 'both':
-            Q1 = data.quantile(0.25)
-            Q3 = data.quantile(0.75)
-            IQR = Q3 - Q1
-            
-            lower_bound = Q1 - self.iqr_multiplier * IQR
-            upper_bound = Q3 + self.iqr_multiplier * IQR
+            Q1, Q3 = _partition_quantiles(data, [0.25, 0.75])
+            lower_bound, upper_bound = self._iqr_bounds(Q1, Q3)
             
             return float(lower_bound), float(upper_bound)
         else:
             # For z-score, use mean ± threshold * std
-            mean = data.mean()
-            std = data.std()
+            mean = data.mean() if len(data) > 0 else np.nan
+            std = data.std(ddof=1) if len(data) > 1 else np.nan
             
             lower_bound = mean - self.z_score_threshold * std
             upper_bound = mean + self.z_score_threshold * std
@@ -391,8 +828,10 @@ class OutlierDetector:
             df[column] = df[column].clip(lower=lower_bound, upper=upper_bound)
             return df
         else:
-            result = df.copy()
-            result[column] = result[column].clip(lower=lower_bound, upper=upper_bound)
+            # Shallow copy + column replacement (what DataFrame.assign does, but
+            # also for non-string column names): only the clipped column is new
+            result = df.copy(deep=False)
+            result[column] = df[column].clip(lower=lower_bound, upper=upper_bound)
             return result
 
 
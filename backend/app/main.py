@@ -4,7 +4,6 @@ Phase 1: Data Ingestion & Quality Setup
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from pathlib import Path
 import sys
 
@@ -13,8 +12,11 @@ from config.settings import (
     API_TITLE, API_DESCRIPTION, API_VERSION, API_DOCS_URL, 
     API_REDOC_URL, CORS_ORIGINS, BACKEND_PORT, DEBUG_MODE
 )
+from backend.app.api.responses import ORJSONResponse
 from backend.app.api.routes import data_upload, quality_check
 from backend.app.utils.logger import NeuralWatchLogger
+from backend.app.utils.file_handler import FileHandler
+from backend.app.utils.versioning import VersioningManager
 
 # Initialize logger
 logger = NeuralWatchLogger.get_logger("main")
@@ -25,7 +27,8 @@ app = FastAPI(
     description=API_DESCRIPTION,
     version=API_VERSION,
     docs_url=API_DOCS_URL,
-    redoc_url=API_REDOC_URL
+    redoc_url=API_REDOC_URL,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -52,6 +55,11 @@ async def startup_event():
     logger.info(f"API Docs: http://localhost:{BACKEND_PORT}{API_DOCS_URL}")
     logger.info(f"CORS Origins: {', '.join(CORS_ORIGINS)}")
     logger.info("="*60)
+    
+    # Shared service instances (reused by every request via dependencies)
+    app.state.file_handler = FileHandler()
+    app.state.versioning_manager = VersioningManager()
+    app.state.file_index = app.state.file_handler.build_file_index()
 
 # Shutdown event
 @app.on_event("shutdown")
@@ -70,7 +78,7 @@ async def health_check():
     Returns:
         JSON response with system status
     """
-    return JSONResponse(content={
+    return ORJSONResponse(content={
         "status": "healthy",
         "service": API_TITLE,
         "version": API_VERSION,
@@ -86,7 +94,7 @@ async def root():
     Returns:
         JSON response with API details
     """
-    return JSONResponse(content={
+    return ORJSONResponse(content={
         "message": f"Welcome to {API_TITLE}",
         "version": API_VERSION,
         "description": API_DESCRIPTION,
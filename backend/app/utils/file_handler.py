@@ -3,26 +3,370 @@ File Handler Module for Neural Watch
 Phase 1: Data Ingestion & Quality Setup
 Handles CSV, JSON, and Parquet file operations with validation
 """
+from __future__ import annotations
+
 import os
+import asyncio
+import glob
 import hashlib
+import mmap
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Tuple, Optional, List
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, Tuple, Optional, List
 from datetime import datetime
-import pandas as pd
+import orjson
 import json
 
-import sys
-sys.path.append(str(Path(__file__).resolve().parent.parent.parent.parent))
+# NumPy, pandas and pyarrow are imported inside the functions that use them,
+# so importing this module (and starting the API) does not load them
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
 from config.settings import (
-    DATA_RAW_PATH, DATA_BASELINE_PATH, ALLOWED_FORMATS,
-    MAX_FILE_SIZE_BYTES, FILE_TIMESTAMP_FORMAT, ValidationThresholds
+    DATA_RAW_PATH, DATA_BASELINE_PATH, DATA_PROCESSED_PATH, ALLOWED_FORMATS,
+    MAX_FILE_SIZE_BYTES, FILE_TIMESTAMP_FORMAT, UPLOAD_CHUNK_SIZE_BYTES,
+    FAST_IO, ValidationThresholds
 )
+from backend.app.core.quality.frame_cache import FrameCache
 from backend.app.utils.logger import (
     NeuralWatchLogger, log_validation, log_error, log_metadata
 )
 
 logger = NeuralWatchLogger.get_logger("file_handler")
 
+# Content hash used for duplicate detection. The digest is only compared
+# against our own uploads, so a fast non-cryptographic hash is sufficient.
+try:
+    import xxhash
+    new_file_hasher = xxhash.xxh3_64
+except ImportError:
+    new_file_hasher = hashlib.sha256
+
+# Rows per chunk when streaming a file (read_file_chunked)
+READ_CHUNK_ROWS = 200_000
+
+# Object columns of larger frames are sized from a row sample (deep sizing
+# walks every Python object)
+MEMORY_SAMPLE_ROWS = 10_000
+
+# Block size of the opt-in Arrow CSV reader (one block per parser thread)
+FAST_CSV_BLOCK_SIZE = 8 << 20
+
+# Threads hashing duplicate-check candidates that are not in the hash index
+DUPLICATE_HASH_WORKERS = min(8, os.cpu_count() or 1)
+
+# Same-size duplicate candidates larger than this are first compared by a
+# hash of their leading bytes; only matching ones are hashed in full
+FINGERPRINT_HEAD_BYTES = 1 << 20
+
+# Above this many rows, duplicate rows are counted from 64-bit row hashes
+# (reported with "estimated": True) instead of DataFrame.duplicated()
+DUPLICATE_EXACT_MAX_ROWS = 1_000_000
+
+# Statistics in numeric_summary, which is stored column-wise:
+# {"columns": [names], "mean": [values], ...}, one list entry per column
+NUMERIC_SUMMARY_STATS = ("mean", "std", "min", "max")
+
+# Persistent digest cache for files in the raw directory (kept next to the
+# upload metadata, outside the raw directory so it is never taken for an upload)
+HASH_INDEX_FILENAME = "hash_index.json"
+
+# pandas' default NA tokens, so Arrow CSV parsing yields the same missing values
+CSV_NULL_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+]
+
+
+# DataFrame writers by file extension (save_file)
+_WRITERS: MappingProxyType = MappingProxyType({
+    'csv': lambda df, path: df.to_csv(path, index=False),
+    'json': lambda df, path: df.to_json(path, orient='records', indent=2),
+    'parquet': lambda df, path: df.to_parquet(path, index=False),
+})
+
+
+def _memory_usage_bytes(df: pd.DataFrame) -> int:
+    """
+    Memory used by a DataFrame, as memory_usage(deep=True).sum()
+    
+    Exact for frames up to MEMORY_SAMPLE_ROWS rows. Larger frames size
+    object columns from a fixed-seed row sample scaled to the full length;
+    all other columns (numeric, category, Arrow-backed) are sized exactly,
+    which costs O(columns).
+    
+    Args:
+        df: DataFrame
+        
+    Returns:
+        Size in bytes
+    """
+    object_columns = (df.dtypes == object).to_numpy()
+    if len(df) <= MEMORY_SAMPLE_ROWS or not object_columns.any():
+        return int(df.memory_usage(deep=True).sum())
+    
+    exact = df.loc[:, ~object_columns].memory_usage(deep=True).sum()  # Includes the index
+    sample = df.loc[:, object_columns].sample(n=MEMORY_SAMPLE_ROWS, random_state=0)
+    sampled = sample.memory_usage(deep=True, index=False).sum() * len(df) / MEMORY_SAMPLE_ROWS
+    return int(exact + sampled)
+
+
+def _columnar_numeric_summary(summary: Dict) -> Dict:
+    """
+    Convert a per-column numeric_summary ({col: {"mean": ..}}) to the columnar layout
+    
+    Metadata persisted before the columnar layout still uses per-column
+    dicts; summaries already in the columnar layout are returned unchanged.
+    
+    Args:
+        summary: numeric_summary in either layout
+        
+    Returns:
+        numeric_summary as {"columns": [...], "mean": [...], "std": [...], ...}
+    """
+    if "columns" in summary and isinstance(summary["columns"], list):
+        return summary
+    columns = list(summary)
+    return {
+        "columns": columns,
+        **{stat: [summary[col].get(stat) for col in columns] for stat in NUMERIC_SUMMARY_STATS}
+    }
+
+
+def _count_duplicate_rows(df: pd.DataFrame) -> int:
+    """
+    Number of duplicate rows, counted from 64-bit row hashes
+    
+    Rows are hashed READ_CHUNK_ROWS at a time into one uint64 array, so
+    memory is 8 bytes per row whatever the table width. Rows with equal
+    hashes count as equal, so a hash collision (about n^2 / 2^65 likely)
+    would be counted as a duplicate.
+    
+    Args:
+        df: DataFrame
+        
+    Returns:
+        Number of rows that repeat an earlier row
+    """
+    import numpy as np
+    import pandas as pd
+    
+    hashes = np.empty(len(df), dtype=np.uint64)
+    for start in range(0, len(df), READ_CHUNK_ROWS):
+        chunk = df.iloc[start:start + READ_CHUNK_ROWS]
+        hashes[start:start + len(chunk)] = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+    hashes.sort()
+    return int(np.count_nonzero(hashes[1:] == hashes[:-1]))
+
+
+def _categorical_summary(series: pd.Series) -> Dict:
+    """
+    Distinct-value count and top 5 values of a column, as nunique() and value_counts().head(5)
+    
+    Non-categorical columns are hashed once (factorize) and counted on the
+    integer codes, instead of hashing every value for nunique and again for
+    value_counts. Ties keep first-occurrence order, like value_counts.
+    
+    Args:
+        series: Column to summarise
+        
+    Returns:
+        Dictionary with unique_values and top_values
+    """
+    import numpy as np
+    import pandas as pd
+    
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return {
+            "unique_values": series.nunique(),
+            "top_values": series.value_counts().head(5).to_dict()
+        }
+    
+    codes, uniques = pd.factorize(series)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    top = np.argsort(-counts, kind='stable')[:5]
+    return {
+        "unique_values": len(uniques),
+        "top_values": dict(zip(uniques.take(top).tolist(), counts[top].tolist()))
+    }
+
+
+class _MetadataAccumulator:
+    """
+    Accumulate dataset metadata over a stream of row chunks
+    
+    Produces the same fields as FileHandler.compute_metadata while holding
+    only running totals: null counts, count/mean/M2/min/max per numeric
+    column (Chan et al. pairwise update), value counts per categorical column
+    and the set of distinct row hashes for the duplicate count.
+    """
+    
+    def __init__(self):
+        import numpy as np
+        
+        self.rows = 0
+        self.dtypes: Dict[str, np.dtype] = {}
+        self.memory_bytes = 0
+        self.null_counts: Optional[pd.Series] = None
+        self.numeric_columns: List[str] = []
+        self.categorical_columns: List[str] = []
+        self.moments: Optional[Tuple[np.ndarray, ...]] = None  # (count, mean, M2, min, max)
+        self.value_counts: Dict[str, pd.Series] = {}
+        self.row_hashes = np.empty(0, dtype=np.uint64)  # Distinct row hashes, sorted
+    
+    def update(self, chunk: pd.DataFrame):
+        """
+        Add one chunk of rows
+        
+        Args:
+            chunk: Next chunk (same columns as the first one)
+        """
+        import numpy as np
+        import pandas as pd
+        
+        if self.null_counts is None:
+            # Summaries cover the first 10 numeric / categorical columns, as in compute_metadata
+            self.dtypes = dict(chunk.dtypes.items())
+            self.null_counts = pd.Series(0, index=chunk.columns, dtype=np.int64)
+            self.numeric_columns = chunk.select_dtypes(include=['number']).columns.tolist()[:10]
+            self.categorical_columns = chunk.select_dtypes(include=['object', 'category']).columns.tolist()[:10]
+        else:
+            for col, dtype in chunk.dtypes.items():
+                self.dtypes[col] = self._merge_dtype(self.dtypes[col], dtype)
+        
+        self.rows += len(chunk)
+        self.memory_bytes += _memory_usage_bytes(chunk)
+        self.null_counts += chunk.isnull().sum()
+        
+        if self.numeric_columns:
+            self._update_moments(chunk[self.numeric_columns].to_numpy(dtype=np.float64, na_value=np.nan))
+        
+        for col in self.categorical_columns:
+            counts = chunk[col].value_counts()
+            previous = self.value_counts.get(col)
+            self.value_counts[col] = counts if previous is None else previous.add(counts, fill_value=0)
+        
+        # Integer/boolean columns hash as float64 so a column read as float in a
+        # later chunk (because it gained NaNs) hashes alike
+        widen = {col: "float64" for col, dtype in chunk.dtypes.items() if dtype.kind in "iub"}
+        key_frame = chunk.astype(widen) if widen else chunk
+        chunk_hashes = np.unique(pd.util.hash_pandas_object(key_frame, index=False).to_numpy())
+        self.row_hashes = np.union1d(self.row_hashes, chunk_hashes)
+    
+    def _update_moments(self, values: np.ndarray):
+        """Merge one chunk's count/mean/M2/min/max into the running totals"""
+        import numpy as np
+        
+        missing = np.isnan(values)
+        counts = (~missing).sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(missing, 0.0, values).sum(axis=0) / counts
+            deviations = np.where(missing, 0.0, values - means)
+            m2 = (deviations * deviations).sum(axis=0)
+        mins = np.where(missing, np.inf, values).min(axis=0, initial=np.inf)
+        maxs = np.where(missing, -np.inf, values).max(axis=0, initial=-np.inf)
+        
+        if self.moments is None:
+            self.moments = (counts, np.nan_to_num(means), m2, mins, maxs)
+            return
+        
+        total_counts, total_means, total_m2, total_mins, total_maxs = self.moments
+        merged = total_counts + counts
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = np.nan_to_num(means) - total_means
+            weight = np.where(merged > 0, counts / merged, 0.0)
+            self.moments = (
+                merged,
+                total_means + delta * weight,
+                total_m2 + m2 + delta * delta * total_counts * weight,
+                np.minimum(total_mins, mins),
+                np.maximum(total_maxs, maxs)
+            )
+    
+    @staticmethod
+    def _merge_dtype(left: np.dtype, right: np.dtype) -> np.dtype:
+        """dtype of a column whose chunks were read with different dtypes"""
+        import numpy as np
+        
+        if left == right:
+            return left
+        if left.kind in "iuf" and right.kind in "iuf":
+            return np.result_type(left, right)
+        return np.dtype(object)
+    
+    def finalize(self, metadata: Dict) -> Dict:
+        """
+        Add the accumulated dataset fields to the file-level metadata
+        
+        Args:
+            metadata: File-level fields (filename, path, size, hash, ...)
+            
+        Returns:
+            Metadata dictionary in the compute_metadata format
+        """
+        import numpy as np
+        import pandas as pd
+        
+        null_counts = self.null_counts if self.null_counts is not None else pd.Series(dtype=np.int64)
+        rows = self.rows
+        
+        metadata.update({
+            "rows": rows,
+            "columns": len(null_counts),
+            "column_names": null_counts.index.tolist(),
+            "dtypes": {col: str(dtype) for col, dtype in self.dtypes.items()},
+            "memory_usage_mb": round(self.memory_bytes / (1024 * 1024), 2)
+        })
+        
+        missing_counts = null_counts.to_dict()
+        metadata["missing_values"] = {
+            "counts": missing_counts,
+            "percentages": (null_counts / rows * 100).round(2).to_dict(),
+            "total_missing": int(null_counts.sum()),
+            "columns_with_missing": [col for col, count in missing_counts.items() if count > 0]
+        }
+        
+        if self.numeric_columns:
+            counts, means, m2, mins, maxs = self.moments
+            with np.errstate(invalid='ignore', divide='ignore'):
+                stds = np.sqrt(m2 / (counts - 1))
+            stds = np.where(counts > 1, stds, np.nan)
+            observed = counts > 0
+            metadata["numeric_summary"] = {
+                "columns": list(self.numeric_columns),
+                **{
+                    stat: [value if present else None for value, present in zip(values.tolist(), observed)]
+                    for stat, values in zip(NUMERIC_SUMMARY_STATS, (means, stds, mins, maxs))
+                }
+            }
+        
+        if self.categorical_columns:
+            metadata["categorical_summary"] = {
+                col: {
+                    "unique_values": int((self.value_counts[col] > 0).sum()),
+                    "top_values": {
+                        value: int(count)
+                        for value, count in self.value_counts[col].sort_values(ascending=False, kind='stable').head(5).items()
+                    }
+                }
+                for col in self.categorical_columns
+            }
+        
+        duplicate_count = rows - len(self.row_hashes)
+        metadata["duplicates"] = {
+            "count": duplicate_count,
+            "percentage": round(duplicate_count / rows * 100, 2)
+        }
+        if rows > DUPLICATE_EXACT_MAX_ROWS:
+            metadata["duplicates"]["estimated"] = True  # As in compute_metadata
+        return metadata
+
 
 class FileHandler:
     """Handle file uploads, validation, and metadata extraction"""
@@ -31,12 +375,30 @@ class FileHandler:
         """Initialize file handler and create necessary directories"""
         self.raw_path = DATA_RAW_PATH
         self.baseline_path = DATA_BASELINE_PATH
+        self.metadata_path = DATA_PROCESSED_PATH
         self.supported_formats = ALLOWED_FORMATS
         self.max_file_size = MAX_FILE_SIZE_BYTES
+        self.fast_io = FAST_IO
+        self._frame_cache = FrameCache()  # Null counts shared by validation and metadata of one frame
         
         # Ensure directories exist
         self.raw_path.mkdir(parents=True, exist_ok=True)
         self.baseline_path.mkdir(parents=True, exist_ok=True)
+        self.metadata_path.mkdir(parents=True, exist_ok=True)
+        
+        # filename -> [digest, mtime_ns, size] of raw files hashed so far
+        self.hash_index_path = self.metadata_path / HASH_INDEX_FILENAME
+        self._hash_index = self._load_hash_index()
+        
+        # Default (pandas-compatible) readers by file extension
+        self._readers: Dict[str, Callable[[Path], pd.DataFrame]] = {
+            'csv': self._read_csv,
+            'json': self._read_json,
+            'parquet': self._read_parquet,
+        }
+        
+        # str(path) -> (mtime_ns, size, footer) of Parquet files opened so far
+        self._parquet_metadata: Dict[str, Tuple[int, int, pq.FileMetaData]] = {}
         
         logger.info(f"FileHandler initialized | Raw: {self.raw_path} | Baseline: {self.baseline_path}")
     
@@ -80,24 +442,165 @@ class FileHandler:
         log_validation(file_path.name, True, f"File size OK: {size_mb:.2f}MB")
         return True, f"File size: {size_mb:.2f}MB"
     
-    def compute_file_hash(self, file_path: Path) -> str:
+    def compute_file_digest(self, file_path: Path) -> str:
         """
-        Compute SHA-256 hash of file for deduplication
+        Compute the full content digest of a file for deduplication (xxh3-64,
+        or SHA-256 when xxhash is not installed)
         
         Args:
             file_path: Path to the file
             
         Returns:
-            Hexadecimal hash string
+            Hexadecimal digest string
         """
-        sha256_hash = hashlib.sha256()
+        file_hasher = new_file_hasher()
         with open(file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
+            # Hash straight from the page cache via mmap: one update() call hands
+            # the whole file to the C hasher (SHA-NI capable OpenSSL for SHA-256)
+            # without read copies, and the pages stay warm for the DataFrame read
+            if os.fstat(f.fileno()).st_size > 0:  # empty files cannot be mapped
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    file_hasher.update(mm)
         
-        file_hash = sha256_hash.hexdigest()[:16]  # First 16 chars
-        logger.debug(f"Computed hash for {file_path.name}: {file_hash}")
-        return file_hash
+        file_digest = file_hasher.hexdigest()
+        logger.debug(f"Computed digest for {file_path.name}: {file_digest[:16]}")
+        return file_digest
+    
+    def compute_file_hash(self, file_path: Path) -> str:
+        """
+        Compute the short content hash of a file, for display
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            First 16 hex characters of compute_file_digest
+        """
+        return self.compute_file_digest(file_path)[:16]
+    
+    def _cached_file_digest(self, file_path: Path, stat: Optional[os.stat_result] = None) -> Tuple[str, bool]:
+        """
+        Look up a file's digest in the hash index, hashing it only if it is
+        new or changed since it was indexed
+        
+        Args:
+            file_path: Path to a file in the raw directory
+            stat: Result of file_path.stat(), if already known
+            
+        Returns:
+            Tuple of (digest, whether the index was updated)
+        """
+        if stat is None:
+            stat = file_path.stat()
+        file_digest = self._indexed_digest(file_path, stat)
+        if file_digest is not None:
+            return file_digest, False
+        
+        file_digest = self.compute_file_digest(file_path)
+        self._hash_index[file_path.name] = [file_digest, stat.st_mtime_ns, stat.st_size]
+        return file_digest, True
+    
+    def _indexed_digest(self, file_path: Path, stat: os.stat_result) -> Optional[str]:
+        """
+        Digest recorded in the hash index, if the file is unchanged since then
+        
+        Args:
+            file_path: Path to a file in the raw directory
+            stat: Result of file_path.stat()
+            
+        Returns:
+            Digest, or None if the file is not indexed or has changed
+        """
+        entry = self._hash_index.get(file_path.name)
+        if entry is not None and entry[1] == stat.st_mtime_ns and entry[2] == stat.st_size:
+            return entry[0]
+        return None
+    
+    def _try_file_digest(self, file_path: Path) -> Optional[str]:
+        """compute_file_digest, or None if the file cannot be read (e.g. deleted meanwhile)"""
+        try:
+            return self.compute_file_digest(file_path)
+        except OSError:
+            return None
+    
+    def _head_fingerprint(self, file_path: Path) -> Optional[str]:
+        """
+        Digest of the first FINGERPRINT_HEAD_BYTES bytes of a file
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            Hexadecimal digest string, or None if the file cannot be read
+        """
+        try:
+            with open(file_path, "rb") as f:
+                return new_file_hasher(f.read(FINGERPRINT_HEAD_BYTES)).hexdigest()
+        except OSError:
+            return None
+    
+    def _load_hash_index(self) -> Dict[str, list]:
+        """
+        Load the hash index persisted by _save_hash_index
+        
+        Returns:
+            Hash index, empty if missing or unreadable
+        """
+        try:
+            return orjson.loads(self.hash_index_path.read_bytes())
+        except FileNotFoundError:
+            return {}
+        except orjson.JSONDecodeError as e:
+            log_error(f"Corrupt hash index {self.hash_index_path.name}, rebuilding", exception=e)
+            return {}
+    
+    def _save_hash_index(self):
+        """Persist the hash index atomically (write a temp file, then rename over)"""
+        temp_path = None
+        try:
+            # Unique temp name so concurrent writers never share (and truncate) one file
+            fd, temp_path = tempfile.mkstemp(
+                dir=self.hash_index_path.parent, prefix=f".{self.hash_index_path.name}.", suffix='.tmp'
+            )
+            with os.fdopen(fd, 'wb') as f:
+                f.write(orjson.dumps(self._hash_index))
+            os.replace(temp_path, self.hash_index_path)
+        except OSError as e:
+            log_error(f"Error saving hash index {self.hash_index_path.name}", exception=e)
+            if temp_path is not None:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+    
+    async def save_upload(self, upload, destination: Path) -> str:
+        """
+        Stream an uploaded file to disk, hashing it in the same pass
+        
+        Chunks are written from a worker thread so large uploads don't
+        block the event loop while other requests are in flight.
+        
+        Args:
+            upload: FastAPI UploadFile to read from
+            destination: Path to write the file to
+            
+        Returns:
+            Hexadecimal digest string (same format as compute_file_digest)
+        """
+        file_hasher = new_file_hasher()
+        with open(destination, "wb") as buffer:
+            while chunk := await upload.read(UPLOAD_CHUNK_SIZE_BYTES):
+                await asyncio.to_thread(self._write_chunk, buffer, file_hasher, chunk)
+        
+        file_digest = file_hasher.hexdigest()
+        logger.debug(f"Saved upload to {destination.name}: {file_digest[:16]}")
+        return file_digest
+    
+    @staticmethod
+    def _write_chunk(buffer, file_hasher, chunk: bytes) -> None:
+        """Write one upload chunk and feed it to the running hash"""
+        buffer.write(chunk)
+        file_hasher.update(chunk)
     
     def read_file(self, file_path: Path) -> Tuple[Optional[pd.DataFrame], str]:
         """
@@ -114,17 +617,17 @@ class FileHandler:
             
             logger.info(f"Reading file: {file_path.name} (format: {extension})")
             
-            if extension == 'csv':
-                df = pd.read_csv(file_path)
-            elif extension == 'json':
-                df = pd.read_json(file_path)
-            elif extension == 'parquet':
-                df = pd.read_parquet(file_path)
-            else:
+            reader = self._readers.get(extension)
+            if reader is None:
                 error_msg = f"Unsupported file format: {extension}"
                 log_error(error_msg)
                 return None, error_msg
             
+            if self.fast_io:
+                df = self._read_fast(file_path, extension)
+            else:
+                df = reader(file_path)
+            
             logger.info(f"Successfully read {file_path.name}: {len(df)} rows, {len(df.columns)} columns")
             return df, ""
             
@@ -133,12 +636,367 @@ class FileHandler:
             log_error(error_msg, exception=e)
             return None, error_msg
     
+    def _read_fast(self, file_path: Path, extension: str) -> pd.DataFrame:
+        """
+        Read a file with Arrow's multithreaded readers into Arrow-backed columns
+        
+        Opt-in (NEURAL_WATCH_FAST_IO=1): columns keep Arrow types (pd.ArrowDtype),
+        so strings are never converted to Python objects, but dtypes differ
+        from the default pandas-compatible read (e.g. date-like text is parsed
+        as timestamps, integers with missing values stay integers).
+        
+        Args:
+            file_path: Path to the file
+            extension: File format ('csv', 'json' or 'parquet')
+            
+        Returns:
+            DataFrame with pd.ArrowDtype columns
+        """
+        import pandas as pd
+        import pyarrow.csv as pa_csv
+        import pyarrow.json as pa_json
+        import pyarrow.parquet as pq
+        
+        if extension == 'csv':
+            table = pa_csv.read_csv(
+                file_path,
+                read_options=pa_csv.ReadOptions(block_size=FAST_CSV_BLOCK_SIZE, use_threads=True),
+                convert_options=pa_csv.ConvertOptions(null_values=CSV_NULL_VALUES, strings_can_be_null=True)
+            )
+        elif extension == 'parquet':
+            table = pq.read_table(file_path, use_threads=True, pre_buffer=True)
+        else:
+            if self._is_json_array(file_path):
+                # Arrow only reads newline-delimited JSON; arrays go through pandas
+                return pd.read_json(file_path, dtype_backend='pyarrow')
+            table = pa_json.read_json(file_path)
+        
+        return table.to_pandas(types_mapper=pd.ArrowDtype, self_destruct=True)
+    
+    @staticmethod
+    def _is_json_array(file_path: Path) -> bool:
+        """Whether a JSON file holds one array (rather than one record per line)"""
+        with open(file_path, "rb") as f:
+            return f.read(64).lstrip().startswith(b'[')
+    
+    def read_file_chunked(self, file_path: Path, chunk_rows: int = READ_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+        """
+        Read a file as a stream of DataFrames holding consecutive rows
+        
+        Peak memory is one chunk rather than the whole file. A JSON array
+        cannot be parsed incrementally and is yielded as a single chunk.
+        
+        Args:
+            file_path: Path to the file
+            chunk_rows: Rows per chunk
+            
+        Yields:
+            DataFrame chunks
+            
+        Raises:
+            ValueError: If the file format is not supported
+        """
+        import pandas as pd
+        import pyarrow.parquet as pq
+        
+        extension = file_path.suffix.lower().replace('.', '')
+        logger.info(f"Reading file in chunks: {file_path.name} (format: {extension}, {chunk_rows} rows/chunk)")
+        
+        if extension == 'csv':
+            # round_trip parses floats exactly, like the Arrow reader used by read_file
+            with pd.read_csv(file_path, chunksize=chunk_rows, float_precision='round_trip') as reader:
+                yield from reader
+        elif extension == 'parquet':
+            parquet_file = pq.ParquetFile(file_path, metadata=self.parquet_metadata(file_path))
+            for batch in parquet_file.iter_batches(batch_size=chunk_rows):
+                yield batch.to_pandas()
+        elif extension == 'json':
+            if self._is_json_array(file_path):
+                yield pd.read_json(file_path)
+            else:
+                with pd.read_json(file_path, lines=True, chunksize=chunk_rows) as reader:
+                    yield from reader
+        else:
+            raise ValueError(f"Unsupported file format: {extension}")
+    
+    def parquet_metadata(self, file_path: Path) -> pq.FileMetaData:
+        """
+        Footer of a Parquet file (row count, schema, row groups), cached until the file changes
+        
+        Args:
+            file_path: Path to a Parquet file
+            
+        Returns:
+            pyarrow FileMetaData
+        """
+        import pyarrow.parquet as pq
+        
+        stat = file_path.stat()
+        cached = self._parquet_metadata.get(str(file_path))
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        
+        metadata = pq.read_metadata(file_path)
+        self._parquet_metadata[str(file_path)] = (stat.st_mtime_ns, stat.st_size, metadata)
+        return metadata
+    
+    def read_rows(self, file_path: Path, indices: List[int]) -> Tuple[Optional[pd.DataFrame], int, str]:
+        """
+        Read selected rows of a file
+        
+        For Parquet the row count comes from the footer and only the row
+        groups holding the requested rows are decoded; other formats are read
+        in full. Nothing is read if an index is out of range.
+        
+        Args:
+            file_path: Path to the file
+            indices: Zero-based row positions
+            
+        Returns:
+            Tuple of (DataFrame of the rows in the requested order or None,
+            total row count, error_message)
+        """
+        import numpy as np
+        import pandas as pd
+        import pyarrow.parquet as pq
+        
+        if file_path.suffix.lower() != '.parquet':
+            df, read_error = self.read_file(file_path)
+            if df is None:
+                return None, 0, read_error
+            if not all(0 <= i < len(df) for i in indices):
+                return None, len(df), ""
+            return df.iloc[indices], len(df), ""
+        
+        try:
+            metadata = self.parquet_metadata(file_path)
+            total_rows = metadata.num_rows
+            if not all(0 <= i < total_rows for i in indices):
+                return None, total_rows, ""
+            
+            # Row group holding each requested row, and the rows to take from
+            # the concatenation of the row groups that are read
+            group_rows = np.array([metadata.row_group(g).num_rows for g in range(metadata.num_row_groups)])
+            group_starts = np.concatenate(([0], np.cumsum(group_rows)[:-1]))
+            positions = np.asarray(indices, dtype=np.int64)
+            groups = np.searchsorted(group_starts, positions, side='right') - 1
+            needed = np.unique(groups)
+            read_starts = np.concatenate(([0], np.cumsum(group_rows[needed])[:-1]))
+            local = positions - group_starts[groups] + read_starts[np.searchsorted(needed, groups)]
+            
+            table = pq.ParquetFile(file_path, metadata=metadata).read_row_groups(needed.tolist())
+            table = table.take(local)
+            if self.fast_io:
+                return table.to_pandas(types_mapper=pd.ArrowDtype), total_rows, ""
+            return table.to_pandas(), total_rows, ""
+            
+        except Exception as e:
+            error_msg = f"Error reading file {file_path.name}: {str(e)}"
+            log_error(error_msg, exception=e)
+            return None, 0, error_msg
+    
+    @staticmethod
+    def _read_json(file_path: Path) -> pd.DataFrame:
+        """Read JSON with pandas' default parsing"""
+        import pandas as pd
+        return pd.read_json(file_path)
+    
+    @staticmethod
+    def _read_parquet(file_path: Path) -> pd.DataFrame:
+        """Read Parquet via Arrow, releasing each column's Arrow buffer once converted"""
+        import pyarrow.parquet as pq
+        return pq.read_table(file_path).to_pandas(self_destruct=True)
+    
+    def _read_csv(self, file_path: Path) -> pd.DataFrame:
+        """
+        Read CSV with Arrow's multithreaded parser, matching pandas' default parsing
+        
+        Args:
+            file_path: Path to the CSV file
+            
+        Returns:
+            DataFrame
+        """
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+        
+        convert_options = pa_csv.ConvertOptions(
+            null_values=CSV_NULL_VALUES, strings_can_be_null=True
+        )
+        
+        try:
+            # Type inference runs on the first block only, so this sniff is cheap
+            schema = pa_csv.open_csv(file_path, convert_options=convert_options).schema
+        except pa.ArrowInvalid:
+            return pd.read_csv(file_path)
+        
+        # pandas mangles blank/duplicate headers ("Unnamed: 0", "a.1"); leave those to its parser
+        if '' in schema.names or len(set(schema.names)) != len(schema.names):
+            return pd.read_csv(file_path)
+        
+        # pandas keeps date-like text as strings and reads all-empty columns as float
+        column_types = {}
+        for field in schema:
+            if pa.types.is_temporal(field.type):
+                column_types[field.name] = pa.string()
+            elif pa.types.is_null(field.type):
+                column_types[field.name] = pa.float64()
+        convert_options.column_types = column_types
+        
+        try:
+            table = pa_csv.read_csv(file_path, convert_options=convert_options)
+        except pa.ArrowInvalid:
+            # Later blocks disagree with the inferred types; the C parser widens them
+            return pd.read_csv(file_path)
+        
+        # Header-only files: pandas reads the columns as object, not float
+        if table.num_rows == 0 or self._arrow_csv_diverges(file_path, table):
+            return pd.read_csv(file_path)
+        
+        return table.to_pandas(self_destruct=True)
+    
+    @staticmethod
+    def _arrow_csv_diverges(file_path: Path, table: pa.Table) -> bool:
+        """
+        Check for numeric text that Arrow and pandas' C parser type differently
+        
+        Arrow reads hex text ("0x10") as integers, where pandas keeps strings,
+        and reads integer text it cannot hold in int64 ("+5", values beyond
+        int64) as float64, where pandas gives int64/uint64/object. A byte scan
+        of the file rules most cases out; only the remaining suspect columns
+        are re-read as text.
+        
+        Args:
+            file_path: Path to the CSV file
+            table: Table Arrow parsed from it
+            
+        Returns:
+            True if the file must go through pandas' parser instead
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.csv as pa_csv
+        
+        def file_contains(*needles: bytes) -> bool:
+            with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return any(mm.find(needle) != -1 for needle in needles)
+        
+        # Integer columns may hold hex text only if "0x" occurs anywhere
+        suspects = [field.name for field in table.schema if pa.types.is_integer(field.type)]
+        if suspects and not file_contains(b'0x', b'0X'):
+            suspects = []
+        
+        # Complete, integral float columns may be integer text beyond int64 or with a '+' sign
+        signed = None
+        for field in table.schema:
+            if not pa.types.is_floating(field.type):
+                continue
+            column = table[field.name]
+            if column.null_count or pc.any(pc.not_equal(pc.floor(column), column)).as_py():
+                continue
+            bounds = pc.min_max(column)
+            if max(abs(bounds['min'].as_py()), abs(bounds['max'].as_py())) < 2 ** 63:
+                if signed is None:
+                    signed = file_contains(b'+')
+                if not signed:
+                    continue
+            suspects.append(field.name)
+        if not suspects:
+            return False
+        
+        text = pa_csv.read_csv(file_path, convert_options=pa_csv.ConvertOptions(
+            include_columns=suspects,
+            column_types={name: pa.string() for name in suspects},
+            null_values=CSV_NULL_VALUES, strings_can_be_null=True
+        ))
+        for name in suspects:
+            if pa.types.is_integer(table.schema.field(name).type):
+                if pc.any(pc.match_substring_regex(text[name], r'^\s*[+-]?0[xX]')).as_py():
+                    return True
+            elif pc.all(pc.match_substring_regex(text[name], r'^\s*[+-]?\d+\s*$')).as_py():
+                return True
+        return False
+    
+    def _null_counts(self, df: pd.DataFrame, file_path: Optional[Path] = None) -> pd.Series:
+        """
+        Count nulls per column with one isna() pass, shared between
+        validate_dataframe and compute_metadata for the same frame
+        
+        For a frame read from a Parquet file, non-float columns take their
+        counts from the footer statistics instead. Float columns are always
+        scanned: a NaN stored as a value (not a null) is missing to pandas
+        but not counted by Parquet.
+        
+        Args:
+            df: DataFrame
+            file_path: File the frame was read from (optional)
+            
+        Returns:
+            Null count per column
+        """
+        import pandas as pd
+        
+        def count(frame: pd.DataFrame) -> pd.Series:
+            footer_counts = None
+            if file_path is not None and file_path.suffix.lower() == '.parquet':
+                footer_counts = self.parquet_null_counts(file_path, expected_rows=len(frame))
+            if not footer_counts:
+                return frame.isna().sum()
+            
+            scanned = [
+                col for col, dtype in frame.dtypes.items()
+                if dtype.kind in 'fc' or col not in footer_counts
+            ]
+            counts = frame[scanned].isna().sum() if scanned else {}
+            return pd.Series(
+                [counts[col] if col in counts else footer_counts[col] for col in frame.columns],
+                index=frame.columns, dtype='int64'
+            )
+        
+        return self._frame_cache.get(df, "null_counts", count)
+    
+    def parquet_null_counts(self, file_path: Path, expected_rows: Optional[int] = None) -> Optional[Dict[str, int]]:
+        """
+        Null count per top-level column from Parquet row-group statistics
+        
+        Args:
+            file_path: Path to a Parquet file
+            expected_rows: Only use the footer if it records this many rows
+            
+        Returns:
+            Dictionary of column name to null count (nested columns omitted),
+            or None if the footer cannot be used (missing statistics, other
+            row count, unreadable file)
+        """
+        try:
+            metadata = self.parquet_metadata(file_path)
+        except Exception:
+            return None
+        if expected_rows is not None and metadata.num_rows != expected_rows:
+            return None
+        
+        totals: Dict[str, int] = {}
+        for group in range(metadata.num_row_groups):
+            row_group = metadata.row_group(group)
+            for j in range(row_group.num_columns):
+                column = row_group.column(j)
+                statistics = column.statistics
+                if statistics is None or not statistics.has_null_count:
+                    return None
+                totals[column.path_in_schema] = totals.get(column.path_in_schema, 0) + statistics.null_count
+        
+        # Leaves of nested columns have dotted paths ("a.list.element"), which
+        # never match a top-level column of the frame
+        return totals
+    
     def validate_dataframe(
         self, 
         df: pd.DataFrame, 
         filename: str,
         expected_columns: Optional[List[str]] = None,
-        expected_dtypes: Optional[Dict[str, str]] = None
+        expected_dtypes: Optional[Dict[str, str]] = None,
+        file_path: Optional[Path] = None
     ) -> Tuple[bool, str, Dict]:
         """
         Validate DataFrame structure and content
@@ -148,6 +1006,7 @@ class FileHandler:
             filename: Original filename for logging
             expected_columns: List of expected column names (optional)
             expected_dtypes: Dict of column:dtype pairs (optional)
+            file_path: File the frame was read from; Parquet footers supply null counts (optional)
             
         Returns:
             Tuple of (is_valid, message, validation_report)
@@ -185,20 +1044,21 @@ class FileHandler:
         else:
             validation_report["checks_passed"].append("DataFrame is not empty")
         
+        # Checks 4 and 5 share one null count per column
+        null_counts = self._null_counts(df, file_path)
+        
         # Check 4: All-null columns
-        null_columns = df.columns[df.isnull().all()].tolist()
+        null_columns = null_counts.index[null_counts.to_numpy() == len(df)].tolist()
         if null_columns:
             validation_report["warnings"].append(
                 f"Columns with all null values: {', '.join(null_columns)}"
             )
         
-        # Check 5: High missing percentage
-        missing_pct = (df.isnull().sum() / len(df) * 100).to_dict()
-        high_missing_cols = [
-            col for col, pct in missing_pct.items() 
-            if pct > ValidationThresholds.WARN_MISSING_PERCENTAGE
-        ]
-        if high_missing_cols:
+        # Check 5: High missing percentage (columns are only listed if any is above)
+        missing_pct = null_counts / len(df) * 100
+        high_missing = missing_pct.to_numpy() > ValidationThresholds.WARN_MISSING_PERCENTAGE
+        if high_missing.any():
+            high_missing_cols = missing_pct.index[high_missing].tolist()
             validation_report["warnings"].append(
                 f"Columns with >{ValidationThresholds.WARN_MISSING_PERCENTAGE}% missing: {', '.join(high_missing_cols)}"
             )
@@ -244,7 +1104,9 @@ class FileHandler:
         
         return validation_report["is_valid"], message, validation_report
     
-    def compute_metadata(self, df: pd.DataFrame, filename: str, file_path: Path) -> Dict:
+    def compute_metadata(
+        self, df: pd.DataFrame, filename: str, file_path: Path, file_hash: Optional[str] = None
+    ) -> Dict:
         """
         Compute comprehensive metadata for the dataset
         
@@ -252,10 +1114,15 @@ class FileHandler:
             df: DataFrame to analyze
             filename: Original filename
             file_path: Path to the file
+            file_hash: Digest of the file if already known (e.g. from
+                save_upload); otherwise the file is hashed (optional)
             
         Returns:
             Dictionary containing metadata
         """
+        import numpy as np
+        import pandas as pd
+        
         try:
             # Basic metadata
             metadata = {
@@ -264,57 +1131,69 @@ class FileHandler:
                 "timestamp": datetime.now().isoformat(),
                 "file_size_bytes": file_path.stat().st_size,
                 "file_size_mb": round(file_path.stat().st_size / (1024 * 1024), 2),
-                "file_hash": self.compute_file_hash(file_path),
+                "file_hash": file_hash if file_hash is not None else self.compute_file_digest(file_path),
                 "rows": len(df),
                 "columns": len(df.columns),
                 "column_names": df.columns.tolist(),
-                "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
-                "memory_usage_mb": round(df.memory_usage(deep=True).sum() / (1024 * 1024), 2)
+                "dtypes": df.dtypes.astype(str).to_dict(),
+                "memory_usage_mb": round(_memory_usage_bytes(df) / (1024 * 1024), 2)
             }
             
-            # Missing value analysis
-            missing_counts = df.isnull().sum().to_dict()
-            missing_percentages = (df.isnull().sum() / len(df) * 100).round(2).to_dict()
+            # Missing value analysis (null counts reused from validate_dataframe)
+            null_counts = self._null_counts(df, file_path)
+            missing_counts = null_counts.to_dict()
+            missing_percentages = (null_counts / len(df) * 100).round(2).to_dict()
             
             metadata["missing_values"] = {
                 "counts": missing_counts,
                 "percentages": missing_percentages,
-                "total_missing": int(df.isnull().sum().sum()),
+                "total_missing": int(null_counts.sum()),
                 "columns_with_missing": [
                     col for col, count in missing_counts.items() if count > 0
                 ]
             }
             
-            # Numeric column statistics
-            numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+            # Numeric column statistics (first 10 numeric columns): one frame-wide,
+            # block-wise reduction per statistic, stored as one list per statistic
+            numeric_cols = df.select_dtypes(include=['number']).columns.tolist()[:10]
             if numeric_cols:
+                numeric = df[numeric_cols]
+                stats = {
+                    "mean": numeric.mean(),
+                    "std": numeric.std(),
+                    "min": numeric.min(),
+                    "max": numeric.max()
+                }
+                all_null = (null_counts[numeric_cols] == len(df)).tolist()
                 metadata["numeric_summary"] = {
-                    col: {
-                        "mean": float(df[col].mean()) if not df[col].isnull().all() else None,
-                        "std": float(df[col].std()) if not df[col].isnull().all() else None,
-                        "min": float(df[col].min()) if not df[col].isnull().all() else None,
-                        "max": float(df[col].max()) if not df[col].isnull().all() else None,
+                    "columns": numeric_cols,
+                    **{
+                        stat: [None if is_all_null else value for value, is_all_null in zip(
+                            stats[stat].to_numpy(dtype=np.float64, na_value=np.nan).tolist(), all_null
+                        )]
+                        for stat in NUMERIC_SUMMARY_STATS
                     }
-                    for col in numeric_cols[:10]  # Limit to first 10 numeric columns
                 }
             
-            # Categorical column info
-            categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+            # Categorical column info (first 10 categorical columns)
+            categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()[:10]
             if categorical_cols:
                 metadata["categorical_summary"] = {
-                    col: {
-                        "unique_values": int(df[col].nunique()),
-                        "top_values": df[col].value_counts().head(5).to_dict()
-                    }
-                    for col in categorical_cols[:10]  # Limit to first 10 categorical columns
+                    col: _categorical_summary(df[col]) for col in categorical_cols
                 }
             
-            # Duplicate rows
-            duplicate_count = df.duplicated().sum()
+            # Duplicate rows (hash-based on large frames, which skips duplicated()'s
+            # per-column factorization)
+            if len(df) > DUPLICATE_EXACT_MAX_ROWS:
+                duplicate_count = _count_duplicate_rows(df)
+            else:
+                duplicate_count = df.duplicated().sum()
             metadata["duplicates"] = {
                 "count": int(duplicate_count),
                 "percentage": round(duplicate_count / len(df) * 100, 2)
             }
+            if len(df) > DUPLICATE_EXACT_MAX_ROWS:
+                metadata["duplicates"]["estimated"] = True
             
             log_metadata(file_path.name, metadata)
             return metadata
@@ -323,6 +1202,114 @@ class FileHandler:
             log_error(f"Error computing metadata for {filename}", exception=e)
             return {"error": str(e)}
     
+    def compute_metadata_chunked(
+        self, file_path: Path, filename: str, chunk_rows: int = READ_CHUNK_ROWS
+    ) -> Dict:
+        """
+        Compute the metadata of compute_metadata while streaming the file in chunks
+        
+        Memory is bounded by one chunk plus the running summaries (8 bytes per
+        distinct row for the duplicate count, value counts of the summarised
+        categorical columns).
+        
+        Args:
+            file_path: Path to the file
+            filename: Original filename
+            chunk_rows: Rows per chunk
+            
+        Returns:
+            Dictionary containing metadata
+        """
+        try:
+            accumulator = _MetadataAccumulator()
+            for chunk in self.read_file_chunked(file_path, chunk_rows):
+                accumulator.update(chunk)
+            
+            file_size = file_path.stat().st_size
+            metadata = accumulator.finalize({
+                "filename": filename,
+                "file_path": str(file_path),
+                "timestamp": datetime.now().isoformat(),
+                "file_size_bytes": file_size,
+                "file_size_mb": round(file_size / (1024 * 1024), 2),
+                "file_hash": self.compute_file_digest(file_path)
+            })
+            
+            log_metadata(file_path.name, metadata)
+            return metadata
+            
+        except Exception as e:
+            log_error(f"Error computing metadata for {filename}", exception=e)
+            return {"error": str(e)}
+    
+    def save_metadata(self, file_path: Path, metadata: Dict) -> Optional[Path]:
+        """
+        Persist metadata for a saved upload so it can be served without re-reading the file
+        
+        Args:
+            file_path: Path to the saved upload
+            metadata: Metadata computed for the upload
+            
+        Returns:
+            Path to the metadata file, or None on failure
+        """
+        try:
+            # File-level fields describe the saved file, not the temporary upload;
+            # hashing it here also adds it to the hash index for duplicate checks
+            file_size = file_path.stat().st_size
+            file_digest, index_updated = self._cached_file_digest(file_path)
+            if index_updated:
+                self._save_hash_index()
+            metadata = {
+                **metadata,
+                "filename": file_path.name,
+                "file_path": str(file_path),
+                "file_size_bytes": file_size,
+                "file_size_mb": round(file_size / (1024 * 1024), 2),
+                "file_hash": file_digest
+            }
+            
+            metadata_file = self.metadata_path / f"{file_path.stem}.meta.json"
+            metadata_file.write_bytes(orjson.dumps(
+                metadata, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            ))
+            return metadata_file
+            
+        except Exception as e:
+            log_error(f"Error saving metadata for {file_path.name}", exception=e)
+            return None
+    
+    def load_metadata(self, file_id: str) -> Optional[Dict]:
+        """
+        Load metadata persisted by save_metadata
+        
+        Args:
+            file_id: File identifier (stem of filename)
+            
+        Returns:
+            Metadata dictionary, or None if not available
+        """
+        metadata_file = self.metadata_path / f"{file_id}.meta.json"
+        try:
+            metadata = orjson.loads(metadata_file.read_bytes())
+            if "numeric_summary" in metadata:
+                metadata["numeric_summary"] = _columnar_numeric_summary(metadata["numeric_summary"])
+            return metadata
+        except FileNotFoundError:
+            return None
+        except orjson.JSONDecodeError as e:
+            log_error(f"Corrupt metadata file {metadata_file.name}", exception=e)
+            return None
+    
+    def delete_metadata(self, file_id: str):
+        """
+        Remove metadata persisted for an upload
+        
+        Args:
+            file_id: File identifier (stem of filename)
+        """
+        (self.metadata_path / f"{file_id}.meta.json").unlink(missing_ok=True)
+    
     def save_file(self, df: pd.DataFrame, destination: Path, filename: str) -> Tuple[bool, str, Path]:
         """
         Save DataFrame to specified destination
@@ -346,14 +1333,10 @@ class FileHandler:
             
             # Save based on extension
             extension = ext.lower().replace('.', '')
-            if extension == 'csv':
-                df.to_csv(save_path, index=False)
-            elif extension == 'json':
-                df.to_json(save_path, orient='records', indent=2)
-            elif extension == 'parquet':
-                df.to_parquet(save_path, index=False)
-            else:
+            writer = _WRITERS.get(extension)
+            if writer is None:
                 return False, f"Unsupported format for saving: {extension}", save_path
+            writer(df, save_path)
             
             logger.info(f"File saved successfully: {save_path}")
             return True, f"File saved as {new_filename}", save_path
@@ -363,33 +1346,165 @@ class FileHandler:
             log_error(error_msg, exception=e)
             return False, error_msg, Path()
     
-    def check_duplicate_file(self, file_hash: str, exclude_path: Optional[Path] = None) -> Tuple[bool, Optional[str]]:
+    def store_file(self, source: Path, destination: Path, filename: str,
+                   file_digest: Optional[str] = None) -> Tuple[bool, str, Path]:
+        """
+        Move an uploaded file into place as-is, without re-serialising it
+        
+        Uses the same timestamped naming as save_file, but keeps the original
+        bytes (and format) so large uploads are not parsed and written twice.
+        
+        Args:
+            source: Path of the uploaded (temporary) file
+            destination: Target directory
+            filename: Original filename
+            file_digest: Digest of the upload, if already known (recorded in the hash index)
+            
+        Returns:
+            Tuple of (success, message, saved_path)
+        """
+        try:
+            destination.mkdir(parents=True, exist_ok=True)
+            
+            # Generate timestamped filename
+            timestamp = datetime.now().strftime(FILE_TIMESTAMP_FORMAT)
+            name, ext = os.path.splitext(filename)
+            new_filename = f"{name}_{timestamp}{ext}"
+            save_path = destination / new_filename
+            
+            # A rename when source and destination share a filesystem, a copy otherwise
+            shutil.move(str(source), str(save_path))
+            
+            if file_digest is not None and destination == self.raw_path:
+                stat = save_path.stat()
+                self._hash_index[save_path.name] = [file_digest, stat.st_mtime_ns, stat.st_size]
+                self._save_hash_index()
+            
+            logger.info(f"File stored successfully: {save_path}")
+            return True, f"File saved as {new_filename}", save_path
+            
+        except Exception as e:
+            error_msg = f"Error saving file: {str(e)}"
+            log_error(error_msg, exception=e)
+            return False, error_msg, Path()
+    
+    def build_file_index(self) -> Dict[str, Path]:
+        """
+        Scan the raw data directory once and index uploaded files by ID
+        
+        Returns:
+            Dictionary mapping file_id (filename stem) to file path
+        """
+        file_index = {}
+        for file_path in self.raw_path.glob('*'):
+            if file_path.is_file() and not file_path.name.startswith('temp_'):
+                file_index[file_path.stem] = file_path
+        
+        logger.info(f"Indexed {len(file_index)} uploaded file(s) in {self.raw_path}")
+        return file_index
+    
+    def find_file(self, file_id: str, file_index: Dict[str, Path]) -> Optional[Path]:
+        """
+        Resolve a file ID to its path in the raw data directory
+        
+        Args:
+            file_id: File identifier (filename stem)
+            file_index: In-memory file index, updated on a directory hit
+            
+        Returns:
+            Path to the file, or None if not found
+        """
+        file_path = file_index.get(file_id)
+        if file_path is None:
+            # Files placed in the raw directory after startup are not indexed yet
+            file_path = next(self.raw_path.glob(f"{glob.escape(file_id)}.*"), None)
+            if file_path is not None:
+                file_index[file_id] = file_path
+        
+        return file_path
+    
+    def check_duplicate_file(
+        self, file_hash: str, file_size: Optional[int] = None, exclude_path: Optional[Path] = None,
+        source_path: Optional[Path] = None
+    ) -> Tuple[bool, Optional[str]]:
         """
         Check if file with same hash already exists
         
         Args:
-            file_hash: Hash of the file to check
+            file_hash: Full digest of the file to check (see compute_file_digest)
+            file_size: Size of the file to check in bytes; files of another
+                size are skipped without hashing (optional)
             exclude_path: Path to exclude from search (e.g., temp file)
+            source_path: The file being checked; together with file_size, lets
+                large unindexed candidates be ruled out from their first
+                FINGERPRINT_HEAD_BYTES bytes before a full hash (optional)
             
         Returns:
             Tuple of (is_duplicate, existing_file_path)
         """
-        # Search in raw data directory
+        # Search in raw data directory; files of a different size cannot match,
+        # and files already in the hash index are only re-hashed if their size
+        # or modification time changed
+        present = set()
+        unhashed = []  # (path, stat) of same-size files missing from the hash index
+        duplicate = None
         for existing_file in self.raw_path.glob('*'):
             if existing_file.is_file():
                 # Skip temp files and excluded paths
                 if existing_file.name.startswith('temp_'):
                     continue
+                present.add(existing_file.name)
                 if exclude_path and existing_file == exclude_path:
                     continue
-                    
+                
                 try:
-                    existing_hash = self.compute_file_hash(existing_file)
-                    if existing_hash == file_hash:
-                        logger.warning(f"Duplicate file detected: {existing_file.name}")
-                        return True, str(existing_file)
-                except Exception:
+                    stat = existing_file.stat()
+                except OSError:
                     continue
+                if file_size is not None and stat.st_size != file_size:
+                    continue
+                
+                existing_digest = self._indexed_digest(existing_file, stat)
+                if existing_digest is None:
+                    unhashed.append((existing_file, stat))
+                elif existing_digest == file_hash and duplicate is None:
+                    duplicate = existing_file
+        
+        index_updated = False
+        if duplicate is None and unhashed:
+            # Hash the remaining candidates concurrently (the hashers release the
+            # GIL), stopping at the first match
+            with ThreadPoolExecutor(max_workers=min(DUPLICATE_HASH_WORKERS, len(unhashed))) as executor:
+                if source_path is not None and file_size is not None and file_size > FINGERPRINT_HEAD_BYTES:
+                    # Candidates whose leading bytes differ cannot match; they stay
+                    # unindexed, as re-reading their head next time is cheap
+                    source_head = self._head_fingerprint(source_path)
+                    if source_head is not None:
+                        heads = executor.map(self._head_fingerprint, [path for path, _ in unhashed])
+                        unhashed = [candidate for candidate, head in zip(unhashed, heads) if head == source_head]
+                
+                digests = executor.map(self._try_file_digest, [path for path, _ in unhashed])
+                for (path, stat), existing_digest in zip(unhashed, digests):
+                    if existing_digest is None:
+                        continue
+                    self._hash_index[path.name] = [existing_digest, stat.st_mtime_ns, stat.st_size]
+                    index_updated = True
+                    if existing_digest == file_hash:
+                        duplicate = path
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        break
+        
+        # Forget files that are gone from the raw directory
+        for name in self._hash_index.keys() - present:
+            del self._hash_index[name]
+            index_updated = True
+        
+        if index_updated:
+            self._save_hash_index()
+        
+        if duplicate is not None:
+            logger.warning(f"Duplicate file detected: {duplicate.name}")
+            return True, str(duplicate)
         
         return False, None
 
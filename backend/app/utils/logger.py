@@ -5,56 +5,62 @@ Phase 1: Data Ingestion & Quality Setup
 import logging
 import sys
 import io
-from pathlib import Path
+import atexit
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 from typing import Optional
 import traceback
 
+import orjson
+
 # Import settings
-import sys
-sys.path.append(str(Path(__file__).resolve().parent.parent.parent.parent))
 from config.settings import LOG_LEVEL, LOG_FILE, LOG_DIR
 
 
+def _utf8_console_stream():
+    """
+    UTF-8 text stream over stdout (avoids Windows cp1252 encode errors)
+    
+    Wraps the underlying buffer so emojis and other non-cp1252 characters
+    are always written as UTF-8; falls back to sys.stdout if it has no
+    buffer (e.g. when replaced by a test runner).
+    """
+    try:
+        return io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', write_through=True)
+    except Exception:
+        return sys.stdout
+
+
+# Built once per process and kept referenced for its lifetime: a discarded
+# TextIOWrapper would close sys.stdout's buffer when garbage-collected
+_CONSOLE_STREAM = _utf8_console_stream()
+
+
 class NeuralWatchLogger:
     """Custom logger for Neural Watch with structured logging"""
     
     _loggers = {}
+    _queue_handler: Optional[QueueHandler] = None
+    _queue_listener: Optional[QueueListener] = None
+    _banner_printed = False  # Startup banner already logged in this process
     
     @classmethod
-    def get_logger(cls, name: str = "neural_watch") -> logging.Logger:
+    def _get_queue_handler(cls) -> QueueHandler:
         """
-        Get or create a logger instance
+        Get the shared queue handler, starting the listener thread on first use
+        
+        Loggers only enqueue records; a single QueueListener thread formats them
+        and writes to the console and log file, keeping I/O off request paths.
         
-        Args:
-            name: Logger name (typically module name)
-            
         Returns:
-            Configured logger instance
+            QueueHandler shared by all Neural Watch loggers
         """
-        if name in cls._loggers:
-            return cls._loggers[name]
-        
-        logger = logging.getLogger(name)
-        logger.setLevel(getattr(logging, LOG_LEVEL.upper()))
-        
-        # Prevent duplicate handlers
-        if logger.handlers:
-            return logger
+        if cls._queue_handler is not None:
+            return cls._queue_handler
         
-        # Console handler (wrap stdout buffer with UTF-8 to avoid Windows cp1252 errors)
-        try:
-            # Create a UTF-8 text wrapper around the underlying buffer to ensure
-            # we always write UTF-8 bytes to stdout, avoiding encode errors when
-            # logging emojis or other non-cp1252 characters on Windows.
-            console_stream = io.TextIOWrapper(
-                sys.stdout.buffer, encoding='utf-8', write_through=True
-            )
-        except Exception:
-            # Fallback: use sys.stdout directly if buffering/wrapper isn't available
-            console_stream = sys.stdout
-
-        console_handler = logging.StreamHandler(stream=console_stream)
+        # Console and file handlers are created here once and shared by every logger
+        console_handler = logging.StreamHandler(stream=_CONSOLE_STREAM)
         console_handler.setLevel(logging.INFO)
         console_formatter = logging.Formatter(
             '%(asctime)s | %(levelname)-8s | %(name)s | %(message)s',
@@ -71,8 +77,39 @@ class NeuralWatchLogger:
         )
         file_handler.setFormatter(file_formatter)
         
-        logger.addHandler(console_handler)
-        logger.addHandler(file_handler)
+        log_queue = queue.SimpleQueue()
+        cls._queue_listener = QueueListener(
+            log_queue, console_handler, file_handler, respect_handler_level=True
+        )
+        cls._queue_listener.start()
+        # Drain pending records on interpreter exit
+        atexit.register(cls._queue_listener.stop)
+        
+        cls._queue_handler = QueueHandler(log_queue)
+        return cls._queue_handler
+    
+    @classmethod
+    def get_logger(cls, name: str = "neural_watch") -> logging.Logger:
+        """
+        Get or create a logger instance
+        
+        Args:
+            name: Logger name (typically module name)
+            
+        Returns:
+            Configured logger instance
+        """
+        if name in cls._loggers:
+            return cls._loggers[name]
+        
+        logger = logging.getLogger(name)
+        logger.setLevel(getattr(logging, LOG_LEVEL.upper()))
+        
+        # Prevent duplicate handlers
+        if logger.handlers:
+            return logger
+        
+        logger.addHandler(cls._get_queue_handler())
         
         cls._loggers[name] = logger
         return logger
@@ -82,27 +119,26 @@ class NeuralWatchLogger:
 def log_upload(filename: str, status: str, details: Optional[dict] = None):
     """Log file upload events"""
     logger = NeuralWatchLogger.get_logger("upload")
-    message = f"File upload: {filename} - Status: {status}"
+    # Arguments are formatted lazily, only for records that pass the level filter
+    message = "File upload: %s - Status: %s"
+    args = (filename, status)
     if details:
-        message += f" | Details: {details}"
+        message += " | Details: %s"
+        args += (details,)
     
     if status.lower() in ["success", "completed"]:
-        logger.info(message)
+        logger.info(message, *args)
     elif status.lower() in ["warning", "partial"]:
-        logger.warning(message)
+        logger.warning(message, *args)
     else:
-        logger.error(message)
+        logger.error(message, *args)
 
 
 def log_validation(filename: str, is_valid: bool, message: str):
     """Log validation results"""
     logger = NeuralWatchLogger.get_logger("validation")
-    log_message = f"Validation: {filename} - Valid: {is_valid} - {message}"
-    
-    if is_valid:
-        logger.info(log_message)
-    else:
-        logger.warning(log_message)
+    level = logging.INFO if is_valid else logging.WARNING
+    logger.log(level, "Validation: %s - Valid: %s - %s", filename, is_valid, message)
 
 
 def log_error(error_message: str, exception: Optional[Exception] = None, 
@@ -110,57 +146,68 @@ def log_error(error_message: str, exception: Optional[Exception] = None,
     """Log errors with full traceback"""
     logger = NeuralWatchLogger.get_logger("error")
     
-    log_msg = f"ERROR: {error_message}"
     if context:
-        log_msg += f" | Context: {context}"
-    
-    logger.error(log_msg)
+        logger.error("ERROR: %s | Context: %s", error_message, context)
+    else:
+        logger.error("ERROR: %s", error_message)
     
     if exception:
-        logger.error(f"Exception: {str(exception)}")
-        logger.error(f"Traceback:\n{traceback.format_exc()}")
+        logger.error("Exception: %s", exception)
+        logger.error("Traceback:\n%s", traceback.format_exc())
 
 
 def log_api_request(endpoint: str, method: str, status_code: int, 
                    response_time: Optional[float] = None):
     """Log API requests"""
     logger = NeuralWatchLogger.get_logger("api")
-    message = f"API {method} {endpoint} - Status: {status_code}"
+    message = "API %s %s - Status: %s"
+    args = (method, endpoint, status_code)
     if response_time:
-        message += f" - Time: {response_time:.3f}s"
+        message += " - Time: %.3fs"
+        args += (response_time,)
     
     if 200 <= status_code < 300:
-        logger.info(message)
+        logger.info(message, *args)
     elif 400 <= status_code < 500:
-        logger.warning(message)
+        logger.warning(message, *args)
     else:
-        logger.error(message)
+        logger.error(message, *args)
+
+
+class _JsonArg:
+    """Log argument rendered as JSON (via orjson) only when the record is formatted"""
+    
+    __slots__ = ("value",)
+    
+    def __init__(self, value):
+        self.value = value
+    
+    def __str__(self) -> str:
+        return orjson.dumps(
+            self.value,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+            default=str
+        ).decode()
 
 
 def log_metadata(file_id: str, metadata: dict):
     """Log metadata extraction"""
     logger = NeuralWatchLogger.get_logger("metadata")
-    logger.info(f"Metadata extracted for {file_id}: {metadata}")
+    logger.info("Metadata extracted for %s: %s", file_id, _JsonArg(metadata))
 
 
 def log_baseline_creation(version_id: str, filename: str):
     """Log baseline creation"""
     logger = NeuralWatchLogger.get_logger("baseline")
-    logger.info(f"Baseline created: {version_id} from {filename}")
+    logger.info("Baseline created: %s from %s", version_id, filename)
 
 
-# Initialize default logger on module import
-default_logger = NeuralWatchLogger.get_logger()
-default_logger.info("="*60)
-# Emoji/logging can sometimes raise encoding errors on Windows consoles using
-# legacy encodings (cp1252). Wrap in try/except to ensure import-time logging
-# doesn't raise and break module imports.
+# Initialize default logger on module import; the banner is logged once per process
 default_logger = NeuralWatchLogger.get_logger()
-default_logger.info("="*60)
-default_logger.info("Neural Watch Logging System Initialized")  # Removed emoji
-default_logger.info(f"Log Level: {LOG_LEVEL}")
-default_logger.info(f"Log File: {LOG_FILE}")
-default_logger.info("="*60)
-default_logger.info(f"Log Level: {LOG_LEVEL}")
-default_logger.info(f"Log File: {LOG_FILE}")
-default_logger.info("="*60)
\ No newline at end of file
+if not NeuralWatchLogger._banner_printed:
+    default_logger.info("="*60)
+    default_logger.info("Neural Watch Logging System Initialized")
+    default_logger.info("Log Level: %s", LOG_LEVEL)
+    default_logger.info("Log File: %s", LOG_FILE)
+    default_logger.info("="*60)
+    NeuralWatchLogger._banner_printed = True
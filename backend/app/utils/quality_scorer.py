@@ -3,15 +3,19 @@ Quality Scorer for Neural Watch
 Phase 2: Data Quality Checks
 Calculate overall quality score and grade
 """
+from bisect import bisect_right
 from typing import Dict
-from pathlib import Path
-import sys
 
-sys.path.append(str(Path(__file__).resolve().parent.parent.parent.parent))
 from backend.app.utils.logger import NeuralWatchLogger
 
 logger = NeuralWatchLogger.get_logger("quality_scorer")
 
+# Lower score bounds of each grade above "Critical", ascending; a score equal
+# to a bound earns the higher grade
+_THRESHOLDS = (50, 60, 70, 80, 90)
+_GRADES = ("Critical", "Poor", "Fair", "Good", "Very Good", "Excellent")
+_EMOJIS = ("🔴", "🔴", "🟠", "🟡", "🟢", "🟢")
+
 
 class QualityScorer:
     """Calculate overall data quality score"""
@@ -77,44 +81,33 @@ class QualityScorer:
         else:
             schema_score = 100.0
         
-        # Calculate weighted overall score
-        overall_score = (
-            (missing_score * self.missing_weight / 100) +
-            (duplicate_score * self.duplicate_weight / 100) +
-            (outlier_score * self.outlier_weight / 100) +
-            (schema_score * self.schema_weight / 100)
+        # Weighted contribution of each component, computed once for both the
+        # overall score and the breakdown
+        components = (
+            ("missing_values", missing_score, self.missing_weight),
+            ("duplicates", duplicate_score, self.duplicate_weight),
+            ("outliers", outlier_score, self.outlier_weight),
+            ("schema_consistency", schema_score, self.schema_weight)
         )
+        contributions = [score * weight / 100 for _, score, weight in components]
         
-        overall_score = round(overall_score, 2)
+        overall_score = round(sum(contributions), 2)
         
         # Determine grade
-        grade = self._get_grade(overall_score)
+        rank = bisect_right(_THRESHOLDS, overall_score)
+        grade = _GRADES[rank]
         
         result = {
             "overall_score": overall_score,
             "grade": grade,
-            "grade_emoji": self._get_grade_emoji(grade),
+            "grade_emoji": _EMOJIS[rank],
             "breakdown": {
-                "missing_values": {
-                    "score": round(missing_score, 2),
-                    "weight": self.missing_weight,
-                    "contribution": round(missing_score * self.missing_weight / 100, 2)
-                },
-                "duplicates": {
-                    "score": round(duplicate_score, 2),
-                    "weight": self.duplicate_weight,
-                    "contribution": round(duplicate_score * self.duplicate_weight / 100, 2)
-                },
-                "outliers": {
-                    "score": round(outlier_score, 2),
-                    "weight": self.outlier_weight,
-                    "contribution": round(outlier_score * self.outlier_weight / 100, 2)
-                },
-                "schema_consistency": {
-                    "score": round(schema_score, 2),
-                    "weight": self.schema_weight,
-                    "contribution": round(schema_score * self.schema_weight / 100, 2)
+                name: {
+                    "score": round(score, 2),
+                    "weight": weight,
+                    "contribution": round(contribution, 2)
                 }
+                for (name, score, weight), contribution in zip(components, contributions)
             }
         }
         
@@ -152,38 +145,7 @@ class QualityScorer:
         Returns:
             Letter grade
         """
-        if score >= 90:
-            return "Excellent"
-        elif score >= 80:
-            return "Very Good"
-        elif score >= 70:
-            return "Good"
-        elif score >= 60:
-            return "Fair"
-        elif score >= 50:
-            return "Poor"
-        else:
-            return "Critical"
-    
-    def _get_grade_emoji(self, grade: str) -> str:
-        """
-        Get emoji for grade
-        
-        Args:
-            grade: Letter grade
-            
-        Returns:
-            Emoji string
-        """
-        emoji_map = {
-            "Excellent": "🟢",
-            "Very Good": "🟢",
-            "Good": "🟡",
-            "Fair": "🟠",
-            "Poor": "🔴",
-            "Critical": "🔴"
-        }
-        return emoji_map.get(grade, "⚪")
+        return _GRADES[bisect_right(_THRESHOLDS, score)]
     
     def get_recommendations(self, missing_analysis: Dict, duplicate_analysis: Dict,
                           outlier_analysis: Dict) -> list:
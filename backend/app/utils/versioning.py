@@ -3,15 +3,18 @@ Versioning Manager for Neural Watch
 Phase 1: Data Ingestion & Quality Setup
 Handles baseline versioning and metadata tracking
 """
+from __future__ import annotations
+
 import json
+import os
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 from datetime import datetime
 import shutil
-import pandas as pd
 
-import sys
-sys.path.append(str(Path(__file__).resolve().parent.parent.parent.parent))
+if TYPE_CHECKING:
+    import pandas as pd  # Imported in load_baseline_dataframe, keeping module import cheap
+
 from config.settings import (
     DATA_BASELINE_PATH, BASELINE_VERSION_PREFIX, FILE_TIMESTAMP_FORMAT
 )
@@ -21,6 +24,11 @@ from backend.app.utils.logger import (
 
 logger = NeuralWatchLogger.get_logger("versioning")
 
+# All baseline metadata, as {version_id: baseline_info}, in the baseline directory.
+# Replaces the per-baseline <version_id>_metadata.json files, which are
+# migrated into it the first time it is missing.
+MANIFEST_FILENAME = "manifest.json"
+
 
 class VersioningManager:
     """Manage baseline versions and dataset metadata"""
@@ -29,6 +37,16 @@ class VersioningManager:
         """Initialize versioning manager"""
         self.baseline_path = DATA_BASELINE_PATH
         self.baseline_path.mkdir(parents=True, exist_ok=True)
+        
+        self.manifest_path = self.baseline_path / MANIFEST_FILENAME
+        
+        # Parsed baselines (newest first), indexed by version_id, plus the
+        # highest-numbered one; valid while the manifest's mtime is unchanged
+        self._cache: Optional[List[Dict]] = None
+        self._cache_mtime: Optional[int] = None
+        self._index: Dict[str, Dict] = {}
+        self._latest_id: Optional[str] = None
+        
         logger.info(f"VersioningManager initialized | Path: {self.baseline_path}")
     
     def get_next_version_number(self) -> int:
@@ -82,9 +100,15 @@ class VersioningManager:
             baseline_filename = f"{version_id}{extension}"
             baseline_path = self.baseline_path / baseline_filename
             
-            # Copy file to baseline directory
-            shutil.copy2(source_file_path, baseline_path)
-            logger.info(f"Baseline file copied: {baseline_path}")
+            # Hard-link the file into the baseline directory (no data is copied;
+            # uploads are never modified in place and deleting the upload keeps
+            # the baseline's link). Copy across filesystems or where links fail.
+            try:
+                os.link(source_file_path, baseline_path)
+                logger.info(f"Baseline file linked: {baseline_path}")
+            except OSError:
+                shutil.copy2(source_file_path, baseline_path)
+                logger.info(f"Baseline file copied: {baseline_path}")
             
             # Create baseline metadata
             baseline_info = {
@@ -98,14 +122,13 @@ class VersioningManager:
                 "source_metadata": metadata
             }
             
-            # Save metadata JSON
-            metadata_filename = f"{version_id}_metadata.json"
-            metadata_path = self.baseline_path / metadata_filename
-            
-            with open(metadata_path, 'w') as f:
-                json.dump(baseline_info, f, indent=2)
+            # Add to the manifest (re-read, so entries written meanwhile are kept)
+            manifest = self._load_manifest()
+            manifest[version_id] = baseline_info
+            self._save_manifest(manifest)
+            self._remember(baseline_info)
             
-            logger.info(f"Baseline metadata saved: {metadata_path}")
+            logger.info(f"Baseline metadata saved: {self.manifest_path}")
             log_baseline_creation(version_id, source_file_path.name)
             
             return True, f"Baseline {version_id} created successfully", baseline_info
@@ -122,19 +145,12 @@ class VersioningManager:
         Returns:
             Baseline info dictionary or None if no baselines exist
         """
-        versions = self.list_baseline_versions()
-        if not versions:
+        self._refresh_cache()
+        if self._latest_id is None:
             logger.warning("No baseline versions found")
             return None
         
-        # Sort by version number (descending)
-        sorted_versions = sorted(
-            versions, 
-            key=lambda x: x.get('version_number', 0), 
-            reverse=True
-        )
-        
-        latest = sorted_versions[0]
+        latest = self._index[self._latest_id]
         logger.info(f"Latest baseline: {latest['version_id']}")
         return latest
     
@@ -148,22 +164,15 @@ class VersioningManager:
         Returns:
             Baseline info dictionary or None if not found
         """
-        metadata_path = self.baseline_path / f"{version_id}_metadata.json"
+        self._refresh_cache()
+        baseline_info = self._index.get(version_id)
         
-        if not metadata_path.exists():
+        if baseline_info is None:
             logger.warning(f"Baseline version not found: {version_id}")
             return None
         
-        try:
-            with open(metadata_path, 'r') as f:
-                baseline_info = json.load(f)
-            
-            logger.info(f"Loaded baseline: {version_id}")
-            return baseline_info
-            
-        except Exception as e:
-            log_error(f"Error loading baseline {version_id}", exception=e)
-            return None
+        logger.info(f"Loaded baseline: {version_id}")
+        return baseline_info
     
     def list_baseline_versions(self) -> List[Dict]:
         """
@@ -172,30 +181,127 @@ class VersioningManager:
         Returns:
             List of baseline info dictionaries
         """
-        baselines = []
+        self._refresh_cache()
+        logger.info(f"Found {len(self._cache)} baseline version(s)")
+        return list(self._cache)
+    
+    def _manifest_mtime(self) -> Optional[int]:
+        """st_mtime_ns of the manifest, or None if there is none yet"""
+        try:
+            return self.manifest_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+    
+    def _refresh_cache(self):
+        """Re-read the manifest if it changed since it was last read"""
+        # The manifest is replaced on every write, which updates its mtime;
+        # our own writes update the cache directly (see _remember/_forget)
+        manifest_mtime = self._manifest_mtime()
+        if self._cache is not None and manifest_mtime is not None and self._cache_mtime == manifest_mtime:
+            return
+        
+        baselines = list(self._load_manifest().values())
+        
+        # Sort by creation date (newest first)
+        baselines.sort(key=lambda x: x.get('created_at', ''), reverse=True)
+        
+        self._cache = baselines
+        self._cache_mtime = self._manifest_mtime()
+        self._index = {info['version_id']: info for info in baselines if 'version_id' in info}
+        self._latest_id = self._highest_version_id()
+    
+    def _highest_version_id(self) -> Optional[str]:
+        """version_id with the highest version number (ties: newest first)"""
+        if not self._index:
+            return None
+        return max(self._index.values(), key=lambda x: x.get('version_number', 0))['version_id']
+    
+    def _remember(self, baseline_info: Dict):
+        """Add a newly written baseline to the cache"""
+        if self._cache is None:
+            return
+        self._cache.insert(0, baseline_info)  # Newest created_at
+        self._index = {baseline_info['version_id']: baseline_info, **self._index}
+        # The new baseline is the newest created, so it also wins a tie
+        latest = self._index.get(self._latest_id)
+        if latest is None or baseline_info['version_number'] >= latest.get('version_number', 0):
+            self._latest_id = baseline_info['version_id']
+        self._cache_mtime = self._manifest_mtime()
+    
+    def _forget(self, version_id: str):
+        """Drop a deleted baseline from the cache"""
+        if self._cache is None:
+            return
+        self._cache = [info for info in self._cache if info.get('version_id') != version_id]
+        self._index.pop(version_id, None)
+        if self._latest_id == version_id:
+            self._latest_id = self._highest_version_id()
+        self._cache_mtime = self._manifest_mtime()
+    
+    def _load_manifest(self) -> Dict[str, Dict]:
+        """
+        Load the baseline manifest, building it from per-baseline metadata
+        files if it does not exist yet
+        
+        Returns:
+            Dictionary of version_id to baseline info
+        """
+        try:
+            with open(self.manifest_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return self._migrate_metadata_files()
+        except json.JSONDecodeError as e:
+            log_error(f"Corrupt baseline manifest {self.manifest_path.name}, rebuilding from metadata files", exception=e)
+            return self._migrate_metadata_files()
+    
+    def _migrate_metadata_files(self) -> Dict[str, Dict]:
+        """
+        Build the manifest from <version_id>_metadata.json files (the
+        layout used before the manifest) and save it if any were found
         
-        # Find all metadata JSON files
+        Returns:
+            Dictionary of version_id to baseline info
+        """
+        manifest = {}
         for metadata_file in self.baseline_path.glob("*_metadata.json"):
             try:
                 with open(metadata_file, 'r') as f:
                     baseline_info = json.load(f)
-                    baselines.append(baseline_info)
+                manifest[baseline_info['version_id']] = baseline_info
             except Exception as e:
                 logger.warning(f"Error reading metadata file {metadata_file}: {str(e)}")
                 continue
         
-        # Sort by creation date (newest first)
-        baselines.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-        
-        logger.info(f"Found {len(baselines)} baseline version(s)")
-        return baselines
+        if manifest:
+            self._save_manifest(manifest)
+            logger.info(f"Migrated {len(manifest)} baseline metadata file(s) to {self.manifest_path.name}")
+        return manifest
+    
+    def _save_manifest(self, manifest: Dict[str, Dict]):
+        """Persist the manifest atomically (write a temp file, then rename over)"""
+        temp_path = self.manifest_path.with_suffix('.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_path, self.manifest_path)
     
-    def load_baseline_dataframe(self, version_id: str) -> Tuple[Optional[pd.DataFrame], str]:
+    def load_baseline_dataframe(
+        self,
+        version_id: str,
+        columns: Optional[List[str]] = None,
+        nrows: Optional[int] = None
+    ) -> Tuple[Optional[pd.DataFrame], str]:
         """
         Load baseline dataset as DataFrame
         
+        CSV and Parquet only read the requested columns and rows; JSON is
+        parsed in full and then trimmed. (Schema-only callers need no read at
+        all: column names and dtypes are in the baseline's source_metadata.)
+        
         Args:
             version_id: Version identifier
+            columns: Columns to load (optional, default all)
+            nrows: Number of leading rows to load (optional, default all)
             
         Returns:
             Tuple of (DataFrame or None, error_message)
@@ -213,15 +319,26 @@ class VersioningManager:
             return None, error_msg
         
         try:
+            import pandas as pd
+            
             # Read based on file extension
             extension = baseline_path.suffix.lower().replace('.', '')
             
             if extension == 'csv':
-                df = pd.read_csv(baseline_path)
+                # Default parser, so dtypes match those recorded at upload
+                df = pd.read_csv(baseline_path, usecols=columns, nrows=nrows)
             elif extension == 'json':
                 df = pd.read_json(baseline_path)
+                if columns is not None:
+                    df = df[[col for col in df.columns if col in set(columns)]]
+                if nrows is not None:
+                    df = df.head(nrows)
             elif extension == 'parquet':
-                df = pd.read_parquet(baseline_path)
+                if nrows is None:
+                    df = pd.read_parquet(baseline_path, engine='pyarrow', columns=columns)
+                else:
+                    import pyarrow.dataset as ds
+                    df = ds.dataset(baseline_path, format='parquet').head(nrows, columns=columns).to_pandas()
             else:
                 return None, f"Unsupported baseline format: {extension}"
             
@@ -255,11 +372,17 @@ class VersioningManager:
                 baseline_path.unlink()
                 logger.info(f"Deleted baseline file: {baseline_path}")
             
-            # Delete metadata file
+            # Remove from the manifest (and any pre-manifest metadata file,
+            # so it is not migrated back)
+            manifest = self._load_manifest()
+            manifest.pop(version_id, None)
+            self._save_manifest(manifest)
+            
             metadata_path = self.baseline_path / f"{version_id}_metadata.json"
             if metadata_path.exists():
                 metadata_path.unlink()
                 logger.info(f"Deleted metadata file: {metadata_path}")
+            self._forget(version_id)
             
             return True, f"Baseline {version_id} deleted successfully"
             
@@ -345,14 +468,21 @@ class VersioningManager:
         current_dtypes = current_metadata.get('dtypes', {})
         baseline_dtypes = baseline_metadata.get('dtypes', {})
         
-        dtype_changes = []
-        for col in current_col_names & baseline_col_names:
-            if current_dtypes.get(col) != baseline_dtypes.get(col):
-                dtype_changes.append({
-                    "column": col,
-                    "baseline_dtype": baseline_dtypes.get(col),
-                    "current_dtype": current_dtypes.get(col)
-                })
+        # Columns whose (name, dtype) pair appears on one side only, via one set XOR
+        changed_cols = {
+            col for col, _ in frozenset(current_dtypes.items()) ^ frozenset(baseline_dtypes.items())
+        }
+        changed_cols &= current_col_names & baseline_col_names
+        
+        dtype_changes = [
+            {
+                "column": col,
+                "baseline_dtype": baseline_dtypes.get(col),
+                "current_dtype": current_dtypes.get(col)
+            }
+            for col in dict.fromkeys(current_metadata.get('column_names', []))
+            if col in changed_cols
+        ]
         
         if dtype_changes:
             comparison["differences"].append({
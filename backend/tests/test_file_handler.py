@@ -6,11 +6,10 @@ Run with: pytest backend/tests/test_file_handler.py -v
 import pytest
 import pandas as pd
 from pathlib import Path
-import sys
 import tempfile
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 
-sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
 from backend.app.utils.file_handler import FileHandler
 
 
@@ -109,6 +108,58 @@ class TestFileReading:
         assert error == ""
         assert len(df) == 5
     
+    def test_read_fast_io(self, file_handler, temp_dir, sample_dataframe):
+        """Test the opt-in Arrow readers (CSV, JSON array and JSON lines)"""
+        file_handler.fast_io = True
+        sample_dataframe.to_csv(temp_dir / "test.csv", index=False)
+        sample_dataframe.to_json(temp_dir / "test.json", orient='records')
+        sample_dataframe.to_json(temp_dir / "lines.json", orient='records', lines=True)
+        
+        for filename in ["test.csv", "test.json", "lines.json"]:
+            df, error = file_handler.read_file(temp_dir / filename)
+            
+            assert error == ""
+            assert list(df.columns) == ['id', 'name', 'age', 'salary']
+            assert len(df) == 5
+            assert all(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes)
+    
+    def test_read_csv_large_integers_match_pandas(self, file_handler, temp_dir):
+        """Test that integers beyond int64 are not read as lossy floats"""
+        csv_path = temp_dir / "ids.csv"
+        csv_path.write_text("id,signed\n18446744073709551615,+5\n1,-3\n")
+        
+        df, error = file_handler.read_file(csv_path)
+        
+        assert error == ""
+        pd.testing.assert_frame_equal(df, pd.read_csv(csv_path))
+        assert df['id'].tolist() == [18446744073709551615, 1]
+    
+    def test_read_csv_hex_text_match_pandas(self, file_handler, temp_dir):
+        """Test that hex text stays a string column, as with pandas"""
+        csv_path = temp_dir / "hex.csv"
+        csv_path.write_text("code,n\n0x10,1\n5,2\n")
+        
+        df, error = file_handler.read_file(csv_path)
+        
+        assert error == ""
+        pd.testing.assert_frame_equal(df, pd.read_csv(csv_path))
+        assert df['code'].tolist() == ['0x10', '5']
+    
+    def test_read_rows_parquet(self, file_handler, temp_dir, sample_dataframe):
+        """Test reading selected rows across Parquet row groups"""
+        parquet_path = temp_dir / "test.parquet"
+        sample_dataframe.to_parquet(parquet_path, index=False, row_group_size=2)
+        
+        rows, total_rows, error = file_handler.read_rows(parquet_path, [4, 0, 3, 3])
+        
+        assert error == ""
+        assert total_rows == 5
+        assert rows['id'].tolist() == [5, 1, 4, 4]
+        
+        rows, total_rows, error = file_handler.read_rows(parquet_path, [5])
+        assert rows is None
+        assert total_rows == 5
+    
     def test_read_nonexistent_file(self, file_handler, temp_dir):
         """Test reading non-existent file"""
         df, error = file_handler.read_file(temp_dir / "nonexistent.csv")
@@ -117,6 +168,55 @@ class TestFileReading:
         assert error != ""
 
 
+class TestGetRowsRoute:
+    """Tests for the /get_rows endpoint"""
+    
+    def test_get_rows_with_datetime_column(self, file_handler, temp_dir):
+        """Test that timestamps (and NaT) are serialized in the row payload"""
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from backend.app.api.routes import data_upload
+        
+        parquet_path = temp_dir / "events.parquet"
+        pd.DataFrame({
+            'id': [1, 2, 3],
+            'seen_at': pd.to_datetime(['2024-01-01 10:00', None, '2024-03-05 00:00'])
+        }).to_parquet(parquet_path, index=False)
+        
+        app = FastAPI()
+        app.include_router(data_upload.router)
+        app.state.file_handler = file_handler
+        app.state.file_index = {"events": parquet_path}
+        
+        response = TestClient(app).get("/api/v1/get_rows/events", params={"indices": [2, 1]})
+        
+        assert response.status_code == 200
+        assert response.json()['rows'] == {
+            'id': [3, 2],
+            'seen_at': ["2024-03-05T00:00:00", None]
+        }
+
+
+class TestAppStartup:
+    """Tests for application import cost"""
+    
+    def test_app_import_does_not_load_pandas(self):
+        """Test that importing the app leaves pandas, NumPy and pyarrow unloaded"""
+        import subprocess
+        import sys
+        
+        code = (
+            "import sys, backend.app.main; "
+            "print(sorted(m for m in ('pandas', 'numpy', 'pyarrow') if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True,
+            cwd=Path(__file__).resolve().parents[2], check=True
+        )
+        
+        assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
 class TestDataFrameValidation:
     """Tests for DataFrame validation"""
     
@@ -199,6 +299,20 @@ class TestMetadataComputation:
         assert 'dtypes' in metadata
         assert 'missing_values' in metadata
     
+    def test_metadata_reuses_known_hash(self, file_handler, temp_dir, sample_dataframe, monkeypatch):
+        """Test that a digest passed in is used instead of re-reading the file"""
+        csv_path = temp_dir / "test.csv"
+        sample_dataframe.to_csv(csv_path, index=False)
+        file_hash = file_handler.compute_file_digest(csv_path)
+        
+        def fail(file_path):
+            raise AssertionError("file was re-hashed")
+        monkeypatch.setattr(file_handler, "compute_file_digest", fail)
+        
+        metadata = file_handler.compute_metadata(sample_dataframe, "test.csv", csv_path, file_hash)
+        
+        assert metadata['file_hash'] == file_hash
+    
     def test_missing_values_metadata(self, file_handler, temp_dir, sample_dataframe):
         """Test missing values in metadata"""
         csv_path = temp_dir / "test.csv"
@@ -226,6 +340,31 @@ class TestMetadataComputation:
         
         assert metadata['duplicates']['count'] == 1
         assert metadata['duplicates']['percentage'] == 25.0
+    
+    def test_parquet_null_counts_from_footer(self, file_handler, temp_dir, sample_dataframe):
+        """Test that Parquet footer null counts agree with a full scan"""
+        parquet_path = temp_dir / "test.parquet"
+        sample_dataframe.to_parquet(parquet_path, index=False, row_group_size=2)
+        df, _ = file_handler.read_file(parquet_path)
+        
+        assert file_handler.parquet_null_counts(parquet_path)['name'] == 1
+        assert file_handler._null_counts(df, parquet_path).to_dict() == df.isna().sum().to_dict()
+    
+    def test_chunked_metadata_matches(self, file_handler, temp_dir, sample_dataframe):
+        """Test that streaming metadata in chunks gives the in-memory result"""
+        csv_path = temp_dir / "test.csv"
+        pd.concat([sample_dataframe, sample_dataframe.iloc[:2]]).to_csv(csv_path, index=False)
+        df, _ = file_handler.read_file(csv_path)
+        
+        expected = file_handler.compute_metadata(df, "test.csv", csv_path)
+        metadata = file_handler.compute_metadata_chunked(csv_path, "test.csv", chunk_rows=2)
+        
+        for key in ['rows', 'columns', 'column_names', 'dtypes', 'missing_values',
+                    'categorical_summary', 'duplicates']:
+            assert metadata[key] == expected[key]
+        assert metadata['numeric_summary']['columns'] == expected['numeric_summary']['columns']
+        for stat in ['mean', 'std', 'min', 'max']:
+            assert metadata['numeric_summary'][stat] == pytest.approx(expected['numeric_summary'][stat])
 
 
 class TestFileSaving:
@@ -271,6 +410,21 @@ class TestFileSaving:
         # Filename should contain timestamp
         assert "data_" in saved_path.name
         assert saved_path.name != "data.csv"
+    
+    def test_store_file_keeps_bytes(self, file_handler, temp_dir, sample_dataframe):
+        """Test that stored uploads are moved unchanged"""
+        temp_path = temp_dir / "temp_upload.parquet"
+        sample_dataframe.to_parquet(temp_path, index=False)
+        original = temp_path.read_bytes()
+        
+        success, message, saved_path = file_handler.store_file(
+            temp_path, temp_dir / "stored", "upload.parquet"
+        )
+        
+        assert success is True
+        assert not temp_path.exists()
+        assert saved_path.name.startswith("upload_")
+        assert saved_path.read_bytes() == original
 
 
 class TestDuplicateDetection:
@@ -281,12 +435,98 @@ class TestDuplicateDetection:
         csv_path = temp_dir / "test.csv"
         sample_dataframe.to_csv(csv_path, index=False)
         
-        file_hash = file_handler.compute_file_hash(csv_path)
+        file_hash = file_handler.compute_file_digest(csv_path)
         is_duplicate, existing = file_handler.check_duplicate_file(file_hash)
         
         # Should not find duplicate (file not in raw path)
         assert is_duplicate is False
     
+    def test_duplicate_check_uses_hash_index(self, file_handler, temp_dir, sample_dataframe, monkeypatch):
+        """Test that unchanged files are not re-hashed on later checks"""
+        monkeypatch.setattr(file_handler, "raw_path", temp_dir)
+        monkeypatch.setattr(file_handler, "hash_index_path", temp_dir.parent / f"{temp_dir.name}.hash_index.json")
+        monkeypatch.setattr(file_handler, "_hash_index", {})
+        csv_path = temp_dir / "test.csv"
+        sample_dataframe.to_csv(csv_path, index=False)
+        file_hash = file_handler.compute_file_digest(csv_path)
+        
+        assert file_handler.check_duplicate_file(file_hash) == (True, str(csv_path))
+        assert file_handler.hash_index_path.exists()
+        
+        def fail(file_path):
+            raise AssertionError("file was re-hashed")
+        monkeypatch.setattr(file_handler, "compute_file_digest", fail)
+        
+        assert file_handler.check_duplicate_file(file_hash) == (True, str(csv_path))
+        file_handler.hash_index_path.unlink()
+    
+    def test_hash_index_concurrent_saves(self, file_handler, temp_dir, monkeypatch):
+        """Test that concurrent index saves use their own temp files and leave none behind"""
+        index_dir = temp_dir / "index"
+        index_dir.mkdir()
+        monkeypatch.setattr(file_handler, "hash_index_path", index_dir / "hash_index.json")
+        monkeypatch.setattr(file_handler, "_hash_index", {f"file_{i}.csv": ["digest", i, 0] for i in range(1000)})
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: file_handler._save_hash_index(), range(32)))
+        
+        assert [p.name for p in index_dir.iterdir()] == ["hash_index.json"]
+        assert file_handler._load_hash_index() == file_handler._hash_index
+    
+    def test_duplicate_check_skips_other_sizes(self, file_handler, temp_dir, sample_dataframe, monkeypatch):
+        """Test that files of a different size are never hashed"""
+        monkeypatch.setattr(file_handler, "raw_path", temp_dir)
+        monkeypatch.setattr(file_handler, "_save_hash_index", lambda: None)
+        csv_path = temp_dir / "test.csv"
+        sample_dataframe.to_csv(csv_path, index=False)
+        
+        hashed = []
+        monkeypatch.setattr(file_handler, "compute_file_digest", hashed.append)
+        
+        is_duplicate, existing = file_handler.check_duplicate_file("0" * 16, csv_path.stat().st_size + 1)
+        
+        assert is_duplicate is False
+        assert hashed == []
+    
+    def test_duplicate_check_hashes_candidates_concurrently(self, file_handler, temp_dir, sample_dataframe, monkeypatch):
+        """Test that a duplicate among several unindexed files is found and indexed"""
+        monkeypatch.setattr(file_handler, "raw_path", temp_dir)
+        monkeypatch.setattr(file_handler, "_save_hash_index", lambda: None)
+        for i in range(5):
+            sample_dataframe.assign(id=sample_dataframe["id"] + i).to_csv(temp_dir / f"test_{i}.csv", index=False)
+        target = temp_dir / "test_3.csv"
+        
+        is_duplicate, existing = file_handler.check_duplicate_file(
+            file_handler.compute_file_digest(target), target.stat().st_size
+        )
+        
+        assert is_duplicate is True
+        assert existing == str(target)
+        assert file_handler._hash_index["test_3.csv"][0] == file_handler.compute_file_digest(target)
+    
+    def test_duplicate_check_prefilters_by_head(self, file_handler, temp_dir, monkeypatch):
+        """Test that only candidates with matching leading bytes are hashed in full"""
+        monkeypatch.setattr(file_handler, "raw_path", temp_dir)
+        monkeypatch.setattr(file_handler, "_save_hash_index", lambda: None)
+        monkeypatch.setattr("backend.app.utils.file_handler.FINGERPRINT_HEAD_BYTES", 4)
+        (temp_dir / "a.bin").write_bytes(b"AAAAxxxx")
+        (temp_dir / "b.bin").write_bytes(b"BBBByyyy")
+        (temp_dir / "c.bin").write_bytes(b"AAAAyyyy")
+        source = temp_dir / "temp_upload.bin"
+        source.write_bytes(b"AAAAyyyy")
+        
+        hashed = []
+        compute_file_digest = file_handler.compute_file_digest
+        monkeypatch.setattr(file_handler, "compute_file_digest", lambda path: hashed.append(path.name) or compute_file_digest(path))
+        
+        is_duplicate, existing = file_handler.check_duplicate_file(
+            compute_file_digest(source), 8, source_path=source
+        )
+        
+        assert is_duplicate is True
+        assert existing == str(temp_dir / "c.bin")
+        assert "b.bin" not in hashed
+    
     def test_compute_file_hash(self, file_handler, temp_dir, sample_dataframe):
         """Test file hash computation"""
         csv_path = temp_dir / "test.csv"
@@ -298,6 +538,43 @@ class TestDuplicateDetection:
         # Same file should produce same hash
         assert hash1 == hash2
         assert len(hash1) == 16  # Truncated to 16 chars
+    
+    def test_file_hash_is_digest_prefix(self, file_handler, temp_dir, sample_dataframe):
+        """Test that the short hash is the start of the full digest"""
+        csv_path = temp_dir / "test.csv"
+        sample_dataframe.to_csv(csv_path, index=False)
+        
+        digest = file_handler.compute_file_digest(csv_path)
+        
+        assert len(digest) >= 16
+        assert file_handler.compute_file_hash(csv_path) == digest[:16]
+    
+    def test_compute_file_hash_empty_file(self, file_handler, temp_dir):
+        """Test hashing an empty file (cannot be memory-mapped)"""
+        empty_path = temp_dir / "empty.csv"
+        empty_path.touch()
+        
+        assert len(file_handler.compute_file_hash(empty_path)) == 16
+
+
+
+class TestUploadStreaming:
+    """Tests for streaming uploads to disk"""
+    
+    @pytest.mark.asyncio
+    async def test_save_upload_hash_matches_file_hash(self, file_handler, temp_dir, sample_dataframe):
+        """Test that the in-flight hash matches hashing the written file"""
+        from fastapi import UploadFile
+        import io
+        
+        payload = sample_dataframe.to_csv(index=False).encode()
+        upload = UploadFile(file=io.BytesIO(payload), filename="upload.csv")
+        destination = temp_dir / "upload.csv"
+        
+        upload_hash = await file_handler.save_upload(upload, destination)
+        
+        assert destination.read_bytes() == payload
+        assert upload_hash == file_handler.compute_file_digest(destination)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,333 @@
+"""
+Unit Tests for Data Quality Checks
+Phase 2: Data Quality Checks
+Run with: pytest backend/tests/test_quality.py -v
+"""
+import pytest
+import pandas as pd
+import numpy as np
+
+from backend.app.core.quality.duplicates import DuplicateDetector
+from backend.app.core.quality.missing_values import MissingValueAnalyzer
+from backend.app.core.quality.outliers import OutlierDetector
+
+
+def _mixed_frame(rows: int = 60, columns: int = 3) -> pd.DataFrame:
+    """Frame with repeated rows, NaNs, an all-NaN column and mixed 1/'1' objects"""
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame({
+        f"n{i}": rng.choice([1.0, 2.0, np.nan], size=rows) for i in range(columns)
+    })
+    df['all_nan'] = np.nan
+    df['mixed'] = pd.Series(rng.choice([0, 1, 2], size=rows), dtype=object).map({0: 1, 1: '1', 2: None})
+    return df
+
+
+def _multivariate_frame(rows: int) -> pd.DataFrame:
+    """Correlated numeric frame with a few NaN rows, for Isolation Forest"""
+    rng = np.random.default_rng(11)
+    x = rng.normal(size=rows)
+    df = pd.DataFrame({'x': x, 'y': 2 * x + rng.normal(scale=0.5, size=rows), 'z': rng.exponential(size=rows)})
+    df.iloc[::17, 1] = np.nan
+    return df
+
+
+# Empty, single-row, all-NaN, mixed 1/'1' object and wide (hash-grouped) frames
+FRAMES = {
+    'empty': pd.DataFrame({'a': pd.Series([], dtype=float), 'b': pd.Series([], dtype=object)}),
+    'single_row': pd.DataFrame({'a': [1.0], 'b': ['x']}),
+    'all_nan': pd.DataFrame({'a': [np.nan] * 4, 'b': [None] * 4}),
+    'mixed_object': pd.DataFrame({'a': [1, '1', 1, '1', 2], 'b': [0, 0, 0, 0, 0]}),
+    'narrow': _mixed_frame(),
+    'wide': _mixed_frame(columns=10)
+}
+
+
+@pytest.fixture(params=list(FRAMES))
+def frame(request):
+    """Fixture yielding each edge-case frame"""
+    return FRAMES[request.param].copy()
+
+
+class TestDuplicateDetector:
+    """Tests for duplicate detection against DataFrame.duplicated"""
+    
+    @pytest.mark.parametrize("keep", ['first', 'last', False])
+    def test_duplicate_indices_match_pandas(self, frame, keep):
+        """Test that duplicate masks match DataFrame.duplicated for every keep"""
+        detector = DuplicateDetector()
+        
+        indices = detector.get_duplicate_indices(frame, keep=keep)
+        
+        assert indices == frame.index[frame.duplicated(keep=keep)].tolist()
+    
+    def test_analyze_counts_match_pandas(self, frame):
+        """Test duplicate counts and groups of analyze"""
+        result = DuplicateDetector().analyze(frame)
+        duplicated = frame.duplicated(keep=False)
+        
+        assert result['total_duplicates'] == int(duplicated.sum())
+        assert result['duplicate_groups'] == len(frame[duplicated].drop_duplicates())
+    
+    def test_hash_collision_falls_back_to_exact_grouping(self, monkeypatch):
+        """Test that rows sharing a row hash are still told apart"""
+        df = FRAMES['wide'].copy()
+        monkeypatch.setattr(
+            pd.util, "hash_pandas_object",
+            lambda frame, index=False: pd.Series(np.zeros(len(frame), dtype=np.uint64))
+        )
+        
+        indices = DuplicateDetector().get_duplicate_indices(df, keep='first')
+        
+        assert indices == df.index[df.duplicated()].tolist()
+    
+    def test_key_analysis_matches_pandas(self):
+        """Test key column combination counts (NaN keys grouped together)"""
+        df = FRAMES['narrow']
+        keys = ['n0', 'n1', 'mixed']
+        
+        key_analysis = DuplicateDetector(key_columns=keys).analyze(df)['key_analysis']
+        
+        assert key_analysis['duplicate_count'] == int(df.duplicated(subset=keys, keep=False).sum())
+        assert key_analysis['unique_combinations'] == len(df.drop_duplicates(subset=keys))
+    
+    def test_key_codes_beyond_int64_radix(self):
+        """Test key combinations whose mixed-radix code space exceeds int64"""
+        rng = np.random.default_rng(3)
+        df = pd.DataFrame({f"k{i}": rng.permutation(300) for i in range(8)})
+        df = pd.concat([df, df.iloc[:20]], ignore_index=True)
+        
+        codes = DuplicateDetector()._combine_key_codes(df, df.columns.tolist())
+        
+        assert pd.Series(codes).duplicated().tolist() == df.duplicated().tolist()
+    
+    def test_chunked_matches_in_memory(self):
+        """Test that merged chunk hash counts equal the in-memory result"""
+        df = FRAMES['narrow'].drop(columns=['mixed'])
+        detector = DuplicateDetector(key_columns=['n0', 'n1'])
+        chunks = [df.iloc[start:start + 7] for start in range(0, len(df), 7)]
+        
+        expected = detector.analyze(df)
+        result = detector.analyze_chunks(chunks)
+        
+        for key in ['total_rows', 'total_duplicates', 'duplicate_groups', 'unique_rows', 'key_analysis']:
+            assert result[key] == expected[key]
+
+
+class TestMissingValueAnalyzer:
+    """Tests for missing value analysis against DataFrame.isna"""
+    
+    def test_null_counts_match_pandas(self, frame):
+        """Test column and row null counts"""
+        analyzer = MissingValueAnalyzer()
+        mask = frame.isna()
+        
+        assert analyzer._column_null_counts(frame).tolist() == mask.sum().tolist()
+        assert analyzer._row_null_counts(frame).tolist() == mask.sum(axis=1).tolist()
+    
+    @pytest.mark.parametrize("columns", [13, 70])
+    def test_packed_null_mask_matches_pandas(self, monkeypatch, columns):
+        """Test the bit-packed mask (column counts not a multiple of 8 or of a block)"""
+        if not hasattr(np, "bitwise_count"):
+            pytest.skip("Packed null mask needs NumPy 2.0+")
+        monkeypatch.setattr("backend.app.core.quality.missing_values.PACKED_MASK_CELL_THRESHOLD", 0)
+        monkeypatch.setattr("backend.app.core.quality.missing_values.PACKED_MASK_ROW_TILE", 16)
+        df = _mixed_frame(rows=50, columns=columns)
+        analyzer = MissingValueAnalyzer()
+        mask = df.isna()
+        
+        assert analyzer._null_mask(df).dtype == np.uint8
+        assert analyzer._column_null_counts(df).tolist() == mask.sum().tolist()
+        assert analyzer._row_null_counts(df).tolist() == mask.sum(axis=1).tolist()
+    
+    def test_analyze_matches_pandas(self, frame):
+        """Test reported counts and percentages"""
+        result = MissingValueAnalyzer().analyze(frame)
+        counts = frame.isna().sum()
+        
+        assert result['total_missing'] == int(counts.sum())
+        assert result['columns_with_missing'] == counts.index[counts > 0].tolist()
+        assert {d['column']: d['missing_count'] for d in result['details']} == counts[counts > 0].to_dict()
+    
+    def test_missing_patterns_average_rounding(self):
+        """Test that the per-row average rounds as np.float64 does (0.855 -> 0.86)"""
+        df = pd.DataFrame({'a': [np.nan] * 171 + [1.0] * 29, 'b': [1.0] * 200})
+        
+        patterns = MissingValueAnalyzer().get_missing_patterns(df)
+        
+        assert patterns['avg_missing_per_row'] == round(df.isna().sum(axis=1).mean(), 2) == 0.86
+    
+    def test_chunked_matches_in_memory(self):
+        """Test that merged chunk moments reproduce the in-memory analysis"""
+        df = FRAMES['narrow'].copy()
+        df['skewed'] = np.r_[np.random.default_rng(1).exponential(size=len(df) - 5), [np.nan] * 5]
+        chunks = [df.iloc[start:start + 7] for start in range(0, len(df), 7)]
+        analyzer = MissingValueAnalyzer()
+        
+        assert analyzer.analyze_chunks(chunks) == analyzer.analyze(df)
+    
+    def test_merged_moments_skew(self):
+        """Test skewness from merged chunk moments against Series.skew"""
+        values = pd.Series(np.random.default_rng(2).lognormal(size=101))
+        summary = None
+        for start in range(0, len(values), 10):
+            chunk = values.iloc[start:start + 10].to_frame()
+            summary = MissingValueAnalyzer._merge_moments(summary, MissingValueAnalyzer._chunk_moments(chunk)[0])
+        
+        assert MissingValueAnalyzer._skew_from_moments(summary) == pytest.approx(values.skew())
+
+
+class TestOutlierDetector:
+    """Tests for outlier detection"""
+    
+    def test_header_only_frame(self):
+        """Test that a frame without rows yields an empty analysis"""
+        df = pd.DataFrame({
+            'a': pd.Series([], dtype=float),
+            'b': pd.Series([], dtype='int64'),
+            's': pd.Series([], dtype=object)
+        })
+        
+        result = OutlierDetector(method='both').analyze(df)
+        
+        assert result['total_outliers'] == 0
+        assert result['columns_analyzed'] == 2
+        assert result['details'] == []
+    
+    @pytest.mark.parametrize("name", ['single_row', 'all_nan', 'narrow'])
+    def test_column_statistics_match_pandas(self, name):
+        """Test the shared-pass statistics against pandas reductions"""
+        df = FRAMES[name].select_dtypes(include=[np.number])
+        df = df.assign(spread=np.linspace(-3, 40, len(df)) ** 2)
+        values = df.to_numpy(dtype=np.float64, na_value=np.nan)
+        
+        stats = OutlierDetector._column_statistics(values, np.isnan(values))
+        
+        expected = {
+            'count': df.count(), 'mean': df.mean(), 'std': df.std(), 'skew': df.skew(),
+            'min': df.min(), 'max': df.max(), 'median': df.median(),
+            'q1': df.quantile(0.25), 'q3': df.quantile(0.75)
+        }
+        for name, series in expected.items():
+            np.testing.assert_allclose(stats[name], series.to_numpy(dtype=float), rtol=1e-9, err_msg=name)
+    
+    @pytest.mark.parametrize("method", ['iqr', 'z_score', 'both'])
+    def test_arrow_table_matches_dataframe(self, method):
+        """Test that a pyarrow Table is analyzed like the equivalent DataFrame"""
+        import pyarrow as pa
+        
+        rng = np.random.default_rng(5)
+        df = pd.DataFrame({
+            'ints': rng.integers(0, 100, size=300),
+            'floats': np.r_[rng.normal(size=290), [25.0, -30.0], [np.nan] * 8],
+            'nullable': pd.array(np.r_[rng.integers(0, 10, size=295), [500] * 5], dtype='Int64'),
+            'text': rng.choice(['a', 'b'], size=300)
+        })
+        df.loc[:9, 'nullable'] = pd.NA
+        detector = OutlierDetector(method=method)
+        
+        assert detector.analyze(pa.Table.from_pandas(df, preserve_index=False)) == detector.analyze(df)
+    
+    def test_percentages_round_like_python(self):
+        """Test per-column percentages against round(count / total * 100, 2)"""
+        outlier_counts = np.arange(18_000, 20_000)
+        value_counts = np.full(len(outlier_counts), 120_000)
+        zeros = np.zeros(len(outlier_counts))
+        
+        details = OutlierDetector()._build_details(
+            [f"c{j}" for j in range(len(outlier_counts))],
+            value_counts,
+            outlier_counts,
+            [np.empty(0)] * len(outlier_counts),
+            {'q1': zeros, 'q3': zeros},
+            zeros
+        )
+        
+        assert [d['outlier_percentage'] for d in details] == [
+            round(count / 120_000 * 100, 2) for count in outlier_counts.tolist()
+        ]
+    
+    def test_float32_guard_keeps_results(self):
+        """Test that values float32 cannot hold exactly fall back to float64"""
+        rng = np.random.default_rng(4)
+        df = pd.DataFrame({
+            'ids': rng.integers(2 ** 25, 2 ** 40, size=200),
+            'huge': np.r_[rng.normal(size=199), [1e39]]
+        })
+        detector = OutlierDetector(method='both')
+        
+        assert detector.analyze(df, dtype=np.float32) == detector.analyze(df)
+    
+    @pytest.mark.parametrize("rows", [50, 1_000, 20_000])
+    def test_isolation_forest_matches_fit_predict(self, rows):
+        """Test the scikit-learn path against IsolationForest(contamination=0.1).fit_predict"""
+        sklearn_ensemble = pytest.importorskip("sklearn.ensemble")
+        try:
+            import coniferest  # noqa: F401
+            pytest.skip("coniferest is preferred over scikit-learn when installed")
+        except ImportError:
+            pass
+        df = _multivariate_frame(rows)
+        df_clean = df.dropna()
+        
+        result = OutlierDetector(use_isolation_forest=True).analyze(df)['multivariate']
+        
+        predictions = sklearn_ensemble.IsolationForest(contamination=0.1, random_state=42).fit_predict(df_clean)
+        assert result['engine'] == "sklearn"
+        assert result['total_rows'] == len(df_clean)
+        assert result['outlier_count'] == int((predictions == -1).sum())
+        assert result['outlier_indices'] == df_clean.index[predictions == -1][:10].tolist()
+    
+    def test_isolation_forest_fits_on_sample(self, monkeypatch):
+        """Test that frames above the fit limit are fitted on a sample and fully scored"""
+        sklearn_ensemble = pytest.importorskip("sklearn.ensemble")
+        monkeypatch.setattr("backend.app.core.quality.outliers.ISOLATION_FOREST_FIT_ROWS", 500)
+        df = _multivariate_frame(3_000).dropna()
+        
+        outlier_mask, engine = OutlierDetector()._isolation_forest_outliers(df, contamination=0.1)
+        
+        if engine != "sklearn":
+            pytest.skip("coniferest is preferred over scikit-learn when installed")
+        values = df.to_numpy()
+        fit_rows = np.sort(np.random.default_rng(42).choice(len(values), 500, replace=False))
+        scores = sklearn_ensemble.IsolationForest(random_state=42).fit(values[fit_rows]).score_samples(values)
+        assert outlier_mask.tolist() == (scores < np.percentile(scores, 10)).tolist()
+    
+    def test_isolation_forest_coniferest_engine(self):
+        """Test the coniferest engine flags the contamination share"""
+        pytest.importorskip("coniferest")
+        df = _multivariate_frame(2_000).dropna()
+        
+        result = OutlierDetector()._isolation_forest_detection(df)
+        
+        assert result['engine'] == "coniferest"
+        assert result['total_rows'] == len(df)
+        assert 0 < result['outlier_count'] <= int(np.ceil(0.1 * len(df)))
+    
+    def test_isolation_forest_knn_prescreen(self, monkeypatch):
+        """Test that the k-NN pre-screen flags exactly the contamination share"""
+        pytest.importorskip("hnswlib")
+        monkeypatch.setattr("backend.app.core.quality.outliers.ISOLATION_FOREST_PRESCREEN_ROWS", 100)
+        df = _multivariate_frame(1_000).dropna()
+        
+        result = OutlierDetector()._isolation_forest_detection(df)
+        
+        assert result['engine'].endswith("+knn_prescreen")
+        assert result['outlier_count'] == int(0.1 * len(df))
+    
+    @pytest.mark.parametrize("method", ['iqr', 'z_score', 'both'])
+    def test_compiled_counts_match_numpy_path(self, monkeypatch, method):
+        """Test the outlier kernel (plain Python without Numba) against the NumPy path"""
+        rng = np.random.default_rng(6)
+        df = pd.DataFrame({
+            'normal': np.r_[rng.normal(size=190), [8.0, -9.0], [np.nan] * 8],
+            'constant': np.full(200, 3.0),
+            'heavy': rng.standard_t(2, size=200)
+        })
+        detector = OutlierDetector(method=method)
+        
+        monkeypatch.setattr("backend.app.core.quality.outliers.NUMBA_AVAILABLE", False)
+        expected = detector.analyze(df)
+        monkeypatch.setattr("backend.app.core.quality.outliers.NUMBA_AVAILABLE", True)
+        
+        assert detector.analyze(df) == expected
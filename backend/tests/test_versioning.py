@@ -0,0 +1,119 @@
+"""
+Unit Tests for VersioningManager
+Phase 1: Data Ingestion & Quality Setup
+Run with: pytest backend/tests/test_versioning.py -v
+"""
+import json
+
+import pytest
+
+from backend.app.utils import versioning
+from backend.app.utils.versioning import MANIFEST_FILENAME, VersioningManager
+
+
+@pytest.fixture
+def baseline_dir(tmp_path, monkeypatch):
+    """Fixture pointing the baseline directory at a temporary path"""
+    path = tmp_path / "baseline"
+    monkeypatch.setattr(versioning, "DATA_BASELINE_PATH", path)
+    return path
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    """Fixture to create a small dataset file to baseline"""
+    path = tmp_path / "data.csv"
+    path.write_text("a,b\n1,x\n2,y\n")
+    return path
+
+
+def _baseline_info(version_id, version_number, created_at):
+    """Baseline info as stored in the manifest (and the legacy metadata files)"""
+    return {
+        "version_id": version_id,
+        "version_number": version_number,
+        "created_at": created_at,
+        "baseline_path": f"{version_id}.csv",
+        "source_metadata": {}
+    }
+
+
+def _version_ids(manager):
+    return [info['version_id'] for info in manager.list_baseline_versions()]
+
+
+class TestManifest:
+    """Tests for the baseline manifest"""
+    
+    def test_migrates_legacy_metadata_files(self, baseline_dir):
+        """Test that per-baseline metadata files are migrated into the manifest"""
+        baseline_dir.mkdir()
+        for number in (1, 2):
+            info = _baseline_info(f"baseline_v{number}_20250101", number, f"2025-01-0{number}T00:00:00")
+            (baseline_dir / f"{info['version_id']}_metadata.json").write_text(json.dumps(info))
+        
+        manager = VersioningManager()
+        
+        assert _version_ids(manager) == ["baseline_v2_20250101", "baseline_v1_20250101"]
+        assert manager.get_latest_baseline()['version_id'] == "baseline_v2_20250101"
+        assert manager.get_next_version_number() == 3
+        assert set(json.loads((baseline_dir / MANIFEST_FILENAME).read_text())) == {
+            "baseline_v1_20250101", "baseline_v2_20250101"
+        }
+        
+        success, _ = manager.delete_baseline_version("baseline_v2_20250101")
+        
+        assert success is True
+        assert not (baseline_dir / "baseline_v2_20250101_metadata.json").exists()
+        assert _version_ids(VersioningManager()) == ["baseline_v1_20250101"]
+    
+    def test_corrupt_manifest_is_rebuilt(self, baseline_dir):
+        """Test that an unreadable manifest is rebuilt from the metadata files"""
+        baseline_dir.mkdir()
+        info = _baseline_info("baseline_v1_20250101", 1, "2025-01-01T00:00:00")
+        (baseline_dir / "baseline_v1_20250101_metadata.json").write_text(json.dumps(info))
+        (baseline_dir / MANIFEST_FILENAME).write_text("{not json")
+        
+        manager = VersioningManager()
+        
+        assert _version_ids(manager) == ["baseline_v1_20250101"]
+        assert json.loads((baseline_dir / MANIFEST_FILENAME).read_text()) == {"baseline_v1_20250101": info}
+    
+    def test_create_and_delete_persist(self, baseline_dir, source_file):
+        """Test that a fresh manager sees the state left by create and delete"""
+        manager = VersioningManager()
+        created = []
+        for _ in range(3):
+            success, message, info = manager.create_baseline_version(source_file, {"rows": 2})
+            assert success is True, message
+            created.append(info['version_id'])
+        
+        success, _ = manager.delete_baseline_version(created[-1])
+        
+        assert success is True
+        fresh = VersioningManager()
+        assert _version_ids(fresh) == _version_ids(manager)
+        assert set(_version_ids(fresh)) == set(created[:2])
+        assert fresh.get_latest_baseline() == manager.get_latest_baseline()
+        assert manager.get_latest_baseline()['version_id'] == created[1]
+        assert manager.get_baseline_by_version(created[-1]) is None
+    
+    def test_latest_baseline_tie_prefers_newest(self, baseline_dir, source_file):
+        """Test that equal version numbers resolve to the most recently created baseline"""
+        baseline_dir.mkdir()
+        manifest = {
+            "baseline_old": _baseline_info("baseline_old", 1, "2020-01-01T00:00:00"),
+            "baseline_new": _baseline_info("baseline_new", 1, "2020-06-01T00:00:00")
+        }
+        (baseline_dir / MANIFEST_FILENAME).write_text(json.dumps(manifest))
+        manager = VersioningManager()
+        
+        assert manager.get_latest_baseline()['version_id'] == "baseline_new"
+        
+        # Neither id carries a parsable number, so the new baseline is also version 1
+        success, _, info = manager.create_baseline_version(source_file, {})
+        
+        assert success is True
+        assert info['version_number'] == 1
+        assert manager.get_latest_baseline()['version_id'] == info['version_id']
+        assert VersioningManager().get_latest_baseline()['version_id'] == info['version_id']
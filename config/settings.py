@@ -29,6 +29,8 @@ BACKEND_URL = f"http://localhost:{BACKEND_PORT}"
 MAX_FILE_SIZE_MB = int(os.getenv("MAX_FILE_SIZE_MB", 500))
 MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024
 ALLOWED_FORMATS = os.getenv("ALLOWED_FORMATS", "csv,json,parquet").split(",")
+UPLOAD_CHUNK_SIZE_BYTES = 1024 * 1024  # Read size when streaming uploads to disk
+FAST_IO = os.getenv("NEURAL_WATCH_FAST_IO", "0") == "1"  # Arrow-backed DataFrames from read_file (opt-in)
 
 # Directory Paths
 DATA_RAW_PATH = BASE_DIR / os.getenv("DATA_RAW_PATH", "data/raw")
@@ -119,13 +119,20 @@ def render_quality_report_page():
                     outlier_method=outlier_method
                 )
             
+            if not success:
+                st.error(f"❌ Quality check failed: {response.get('detail', 'Unknown error')}")
+                return
+            
+            # The check response only carries summary fields; fetch the full report
+            success, report_response = api_client.get_quality_report(response['report']['report_id'])
+            
             if success:
                 st.success("✅ Quality check completed!")
                 
                 # Store report in session state
-                st.session_state['current_quality_report'] = response.get('report')
+                st.session_state['current_quality_report'] = report_response.get('report')
             else:
-                st.error(f"❌ Quality check failed: {response.get('detail', 'Unknown error')}")
+                st.error(f"❌ Failed to load quality report: {report_response.get('detail', 'Unknown error')}")
                 return
     
     # Step 4: Display results
@@ -230,13 +237,26 @@ def render_quality_report_page():
                 samples = duplicate_analysis.get('sample_duplicates', [])
                 if samples:
                     with st.expander("View Sample Duplicate Groups"):
+                        # Samples carry row positions only; fetch all sampled rows in one
+                        # request (not possible for ad-hoc uploads, which are not kept)
+                        report_file_id = report.get('file_id', '')
+                        sample_indices = [idx for sample in samples for idx in sample.get('indices', [])]
+                        sample_rows = None
+                        if sample_indices and not report_file_id.startswith('temp_'):
+                            rows_ok, rows_response = api_client.get_rows(report_file_id, sample_indices)
+                            if rows_ok:
+                                sample_rows = pd.DataFrame(rows_response['rows'], index=sample_indices)
+                        
                         for i, sample in enumerate(samples, 1):
                             st.markdown(f"**Group {i}:** {sample['count']} duplicate rows")
-                            if sample.get('rows'):
+                            indices = sample.get('indices', [])
+                            if sample_rows is not None and indices:
                                 st.dataframe(
-                                    pd.DataFrame(sample['rows']),
+                                    sample_rows.loc[indices],
                                     use_container_width=True
                                 )
+                            elif indices:
+                                st.caption(f"Row positions: {', '.join(str(idx) for idx in indices)}")
             else:
                 st.success("✅ No duplicate rows detected!")
         
@@ -167,6 +167,28 @@ class APIClient:
         except Exception as e:
             return False, {"detail": f"Error getting metadata: {str(e)}"}
     
+    def get_rows(self, file_id: str, indices: List[int]) -> Tuple[bool, Dict]:
+        """
+        Get specific rows of an uploaded file by position
+        
+        Args:
+            file_id: File identifier
+            indices: Zero-based row positions
+            
+        Returns:
+            Tuple of (success, response_data) with rows as {column: [values]}
+        """
+        try:
+            response = requests.get(
+                f"{self.base_url}/api/v1/get_rows/{file_id}",
+                params={"indices": indices},
+                timeout=30
+            )
+            return self._handle_response(response)
+            
+        except Exception as e:
+            return False, {"detail": f"Error getting rows: {str(e)}"}
+    
     def delete_upload(self, file_id: str) -> Tuple[bool, Dict]:
         """
         Delete an uploaded file